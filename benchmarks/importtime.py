@@ -0,0 +1,113 @@
+# importtime.py
+"""
+Import-time profile of the dashboard, measured with ``python -X importtime``.
+
+Every scenario is imported in a fresh interpreter (from the dashboard folder, like
+``streamlit run app.py``), so each measurement includes all the libraries the
+scenario pulls in:
+
+- startup: the modules app.py imports before the first paint
+- one scenario per tab module, imported on top of startup, which is what opening
+  that tab for the first time costs
+- all tabs: everything app.py used to import eagerly
+
+Usage (from the repository root):
+    python benchmarks/importtime.py [--repeat 5] [--top 10] [--raw-dir DIR]
+"""
+import argparse
+import ast
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DASHBOARD_DIR = Path(__file__).resolve().parent.parent / "dashboard"
+LINE_PATTERN = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def startup_modules():
+    """Modules imported at the top level of app.py."""
+    tree = ast.parse((DASHBOARD_DIR / "app.py").read_text(encoding="utf-8"))
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return modules
+
+
+def tab_modules():
+    """Tab modules of the dashboard, in tab order."""
+    return sorted(f"tabs.{path.stem}" for path in (DASHBOARD_DIR / "tabs").glob("tab*.py"))
+
+
+def profile_imports(modules):
+    """
+    Import the modules in a fresh interpreter and parse its -X importtime report.
+
+    Parameters:
+    modules (list): Module names, imported in order
+
+    Returns:
+    tuple: (total cumulative time in ms, {top-level module: cumulative ms}, raw report)
+    """
+    code = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=DASHBOARD_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    top_level = {}
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        # Top-level imports have a single space of indentation in the report
+        if match and len(match.group(3)) == 1:
+            name = match.group(4)
+            top_level[name] = top_level.get(name, 0) + int(match.group(2)) / 1000
+    return sum(top_level.values()), top_level, result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario (the median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports listed per scenario")
+    parser.add_argument("--raw-dir", type=Path, help="Folder to save the raw -X importtime reports in")
+    args = parser.parse_args()
+
+    startup = startup_modules()
+    scenarios = {"startup": startup}
+    for module in tab_modules():
+        scenarios[module] = startup + [module]
+    scenarios["all tabs"] = startup + tab_modules()
+
+    # Warm the bytecode cache so every scenario measures imports, not compilation
+    profile_imports(scenarios["all tabs"])
+
+    if args.raw_dir:
+        args.raw_dir.mkdir(parents=True, exist_ok=True)
+
+    startup_ms = None
+    for name, modules in scenarios.items():
+        runs = [profile_imports(modules) for _ in range(args.repeat)]
+        totals = [total for total, _, _ in runs]
+        median = statistics.median(totals)
+        _, top_level, raw = runs[totals.index(min(totals, key=lambda t: abs(t - median)))]
+        if startup_ms is None:
+            startup_ms = median
+
+        extra = "" if name == "startup" else f" (+{median - startup_ms:.0f} ms over startup)"
+        print(f"{name}: {median:.0f} ms{extra}")
+        heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[: args.top]
+        for module, ms in heaviest:
+            print(f"    {module:<40} {ms:8.1f} ms")
+
+        if args.raw_dir:
+            (args.raw_dir / f"{name.replace(' ', '_')}.txt").write_text(raw, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# sessions.py
+"""
+Concurrent-session stress test of the dashboard.
+
+N simulated users open the dashboard at the same time, each in its own headless
+session (streamlit.testing.AppTest) running in its own thread, and switch between
+tabs in a random order. All sessions share one server process, so they share the
+processed dataset and every cache, exactly like the browser sessions of a deployment.
+
+The test checks that:
+- every render succeeds and shows the same metrics as a single session rendering
+  that tab alone (no session sees state left behind by another)
+- the shared dataset is unchanged afterwards (no session mutated it)
+
+and reports the memory held per session, next to the size of the dataset, so a
+session that copies the data shows up as a per-session cost of the same order.
+
+Usage (from the repository root, where data.csv is):
+    python benchmarks/sessions.py [--users 8] [--runs 6] [--seed 0]
+"""
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+DASHBOARD_DIR = Path(__file__).resolve().parent.parent / "dashboard"
+APP_FILE = DASHBOARD_DIR / "app.py"
+# Seconds a single run may take; concurrent sessions share the interpreter
+RUN_TIMEOUT = 600
+
+sys.path.insert(0, str(DASHBOARD_DIR))
+
+
+def render(app, label):
+    """Rerun a session on one tab; returns (metric values, error messages)."""
+    app.session_state["main_tabs"] = label
+    app.run()
+    # A run that renders nothing at all (not even the tab bar) never started the
+    # script; it is reported like any other failure, not retried
+    if not len(app.tabs):
+        return [], ["the script did not start"]
+    return [metric.value for metric in app.metric], [str(exception.value) for exception in app.exception]
+
+
+def new_session():
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(str(APP_FILE), default_timeout=RUN_TIMEOUT)
+
+
+def simulate_user(user, labels, runs, seed, expected, sessions, problems, timings):
+    """
+    One simulated user: a session rendering `runs` random tabs.
+
+    The session is kept in `sessions` after the last run, so its memory is still
+    held when it is measured.
+    """
+    rng = random.Random(seed + user)
+    app = new_session()
+    sessions[user] = app
+    for run in range(runs):
+        label = rng.choice(labels)
+        start = time.perf_counter()
+        try:
+            metrics, errors = render(app, label)
+        except Exception as e:
+            metrics, errors = None, [f"{type(e).__name__}: {e}"]
+        timings.append(time.perf_counter() - start)
+
+        for error in errors:
+            problems.append(f"user {user}, run {run} ({label}): {error}")
+        if not errors and metrics != expected[label]:
+            problems.append(f"user {user}, run {run} ({label}): metrics {metrics} differ from {expected[label]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8, help="Concurrent simulated users")
+    parser.add_argument("--runs", type=int, default=6, help="Tab renders per user")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the tab order of each user")
+    args = parser.parse_args()
+
+    from config import DASHBOARD_TABS
+    from data.loader import data_path
+    from data.watcher import dataset_watcher
+
+    labels = [label for label, _, _ in DASHBOARD_TABS]
+
+    # The dataset every session is served, as it was before any session ran
+    dataset = dataset_watcher(data_path()).dataset()
+    snapshot = dataset.df.copy(deep=True)
+    columns = list(dataset.df.columns)
+    dataset_bytes = dataset.df.memory_usage(deep=True).sum()
+
+    # Reference: every tab rendered by a single session (this also warms the caches)
+    print("Reference renders:")
+    expected = {}
+    app = new_session()
+    for label in labels:
+        start = time.perf_counter()
+        metrics, errors = render(app, label)
+        if errors:
+            print(f"  {label}: failed: {errors}")
+            return 1
+        expected[label] = metrics
+        print(f"  {label}: {time.perf_counter() - start:.2f} s")
+    del app
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    sessions = [None] * args.users
+    problems = []
+    timings = []
+    threads = [
+        threading.Thread(
+            target=simulate_user,
+            args=(user, labels, args.runs, args.seed, expected, sessions, problems, timings),
+            name=f"user-{user}",
+        )
+        for user in range(args.users)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if dataset_watcher(data_path()).dataset() is not dataset:
+        problems.append("the dataset was replaced during the test (data.csv changed?)")
+    if list(dataset.df.columns) != columns:
+        added = sorted(set(dataset.df.columns) - set(columns))
+        problems.append(f"the shared dataset gained or lost columns: {added or 'columns removed'}")
+    elif not dataset.df.equals(snapshot):
+        problems.append("the values of the shared dataset were modified")
+
+    renders = args.users * args.runs
+    print(f"{args.users} users x {args.runs} renders: {elapsed:.1f} s")
+    print(
+        f"Render time: median {statistics.median(timings):.2f} s, max {max(timings):.2f} s "
+        f"({renders / elapsed:.1f} renders/s, slowed down by the memory tracing)"
+    )
+    print(f"Dataset: {dataset_bytes / 1024:.0f} KiB, shared by every session")
+    print(
+        f"Memory held per session: {(held - baseline) / args.users / 1024:.0f} KiB "
+        f"(peak {(peak - baseline) / 1024:.0f} KiB for all sessions)"
+    )
+
+    if problems:
+        print(f"{len(problems)} problems:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("No errors or cross-session interference")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
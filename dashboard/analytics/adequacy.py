@@ -0,0 +1,124 @@
+# adequacy.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics.filters import apply_filters
+from data.artifacts import persistent
+
+# Minimum living area per person considered adequate (m²)
+MIN_SPACE_PER_PERSON = 15
+# Weights of the space and bedroom components of the adequacy index
+ADEQUACY_WEIGHTS = {"adequate_space": 0.5, "adequate_bedrooms": 0.5}
+
+BEDROOM_COUNTS = {"0": 0, "1": 1, "2": 2, "3": 3, "4+": 4}
+HOUSEHOLD_SIZE_ORDER = ["1", "2", "3", "4", "5", "6+"]
+
+
+def add_adequacy_columns(df):
+    """
+    Add the per-respondent housing adequacy columns with vectorized arithmetic.
+
+    Columns added:
+    household_size: dependents + non-dependents (missing counts as 0)
+    household_size_grouped: "1" to "5" or "6+" (missing for empty households)
+    space_per_person: living area / household size
+    bedrooms_numeric: bedrooms from the typology (T4+ counts as 4)
+    adequate_space: 1 if at least MIN_SPACE_PER_PERSON m² per person, 0 otherwise
+    adequate_bedrooms: 1 if there are at least n-1 bedrooms for n people (n > 1)
+    overcrowded_eu: 1 if there are fewer bedrooms than the EU overcrowding rule requires
+    adequacy_index: weighted sum of adequate_space and adequate_bedrooms, from 0 to 100
+
+    The EU rule (Eurostat) asks for one room per couple, per other adult and per pair of
+    children. The survey only gives the number of non-dependent and dependent people, so
+    the first two adults are assumed to be a couple and dependents to be children; the
+    household's common room is the living room that every typology includes.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+
+    Returns:
+    DataFrame: The data with the adequacy columns
+    """
+    adults = df["num-pessoas-nao-dependentes"].fillna(0).to_numpy(dtype=float)
+    children = df["num-pessoas-dependentes"].fillna(0).to_numpy(dtype=float)
+    household_size = adults + children
+    has_people = household_size > 0
+
+    area = pd.to_numeric(df["area_numerical"], errors="coerce").to_numpy(dtype=float)
+    bedrooms = df["bedroom_count"].map(BEDROOM_COUNTS).to_numpy(dtype=float)
+    has_bedrooms = ~np.isnan(bedrooms)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        space_per_person = np.where(has_people, area / household_size, np.nan)
+    adequate_space = np.where(np.isnan(space_per_person), np.nan, space_per_person >= MIN_SPACE_PER_PERSON)
+
+    adequate_bedrooms = np.where(
+        has_bedrooms, (household_size <= 1) | (bedrooms >= household_size - 1), np.nan
+    )
+
+    required_bedrooms = np.minimum(adults, 1) + np.maximum(adults - 2, 0) + np.ceil(children / 2)
+    required_bedrooms = np.maximum(required_bedrooms, 1)
+    overcrowded = np.where(has_bedrooms & has_people, bedrooms < required_bedrooms, np.nan)
+
+    index = 100 * (
+        ADEQUACY_WEIGHTS["adequate_space"] * adequate_space
+        + ADEQUACY_WEIGHTS["adequate_bedrooms"] * adequate_bedrooms
+    )
+
+    size_group = np.where(
+        household_size >= 6, "6+", np.maximum(household_size, 0).astype(int).astype(str)
+    )
+    return df.assign(
+        household_size=household_size,
+        household_size_grouped=pd.Series(size_group, index=df.index).where(has_people),
+        space_per_person=space_per_person,
+        bedrooms_numeric=bedrooms,
+        adequate_space=adequate_space,
+        adequate_bedrooms=adequate_bedrooms,
+        overcrowded_eu=overcrowded,
+        adequacy_index=index,
+    )
+
+
+def adequacy_by_group(df, by=None):
+    """
+    Housing adequacy statistics per group in one grouped aggregation.
+
+    The group index combines the share of adequate space and the share of adequate
+    bedrooms, each over the respondents for whom it is defined.
+
+    Parameters:
+    df (DataFrame): Data with the adequacy columns
+    by (str): Optional grouping column; None gives a single row
+
+    Returns:
+    DataFrame: count, space_per_person (mean), adequate_space, adequate_bedrooms and
+    overcrowded_eu (percentages) and adequacy_index per group
+    """
+    columns = ["space_per_person", "adequate_space", "adequate_bedrooms", "overcrowded_eu"]
+    keys = df[by] if by else pd.Series("Total", index=df.index)
+    stats = df[columns].groupby(keys, observed=True).mean()
+    stats[["adequate_space", "adequate_bedrooms", "overcrowded_eu"]] *= 100
+    stats.insert(0, "count", keys.groupby(keys, observed=True).size())
+    stats["adequacy_index"] = (
+        ADEQUACY_WEIGHTS["adequate_space"] * stats["adequate_space"]
+        + ADEQUACY_WEIGHTS["adequate_bedrooms"] * stats["adequate_bedrooms"]
+    ).clip(0, 100)
+    stats.index.name = by
+    return stats
+
+
+@st.cache_data(show_spinner=False)
+@persistent("adequacy_by_group")
+def cached_adequacy_by_group(_df, dataset_version, by=None, filters=()):
+    """
+    Cached adequacy_by_group over a filtered view of the full dataset.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    by (str): Optional grouping column
+    filters (tuple): (column, value) pairs; rows must match all of them
+    """
+    return adequacy_by_group(apply_filters(_df, filters), by)
@@ -0,0 +1,214 @@
+# affordability.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data.artifacts import persistent
+
+# Income bounds (annual, €) for each bracket of "rendimento-anual". The top bracket is
+# open-ended and is handled by the tail model; "sem-rendimento" has no defined burden.
+INCOME_BRACKET_BOUNDS = {
+    "<7001": (1.0, 7000.0),
+    "7001-12000": (7001.0, 12000.0),
+    "12001-20000": (12001.0, 20000.0),
+    "20001-35000": (20001.0, 35000.0),
+    "35001-50000": (35001.0, 50000.0),
+    "50001-80000": (50001.0, 80000.0),
+    ">80001": (80001.0, np.inf),
+}
+
+# Midpoints used by process_data for rendimento_numerical, reused where a single value is needed
+INCOME_BRACKET_MIDPOINTS = {
+    "sem-rendimento": 0,
+    "<7001": 3500,
+    "7001-12000": 9500,
+    "12001-20000": 16000,
+    "20001-35000": 27500,
+    "35001-50000": 42500,
+    "50001-80000": 65000,
+    ">80001": 100000,
+}
+
+# Tail models for the open-ended top bracket
+PARETO_ALPHA = 2.5
+UNIFORM_TAIL_UPPER = 150000.0
+
+# Rent burden categories, matching the thresholds used by process_data
+RENT_BURDEN_EDGES = [30, 50, 80]
+RENT_BURDEN_CATEGORIES = [
+    "≤30% (Affordable)",
+    "31-50% (Moderate)",
+    "51-80% (High)",
+    ">80% (Very High)",
+]
+HIGH_BURDEN_LABEL = ">50% (High + Very High)"
+
+# Upper bound on draws × respondents materialised at once
+MAX_CELLS_PER_BLOCK = 5_000_000
+
+
+def normalize_bracket(series):
+    """Normalise raw income bracket strings such as "['12001-20000']" to "12001-20000"."""
+    return series.astype(str).str.strip().str.strip("[]'\" ").str.lower()
+
+
+def _draw_incomes(u, low, high, tail, pareto_alpha):
+    """Map uniform draws to incomes inside each respondent's bracket."""
+    open_ended = ~np.isfinite(high)
+    bounded_high = np.where(open_ended, low, high)
+    incomes = low + u * (bounded_high - low)
+
+    if open_ended.any():
+        u_open = u[:, open_ended]
+        low_open = low[open_ended]
+        if tail == "pareto":
+            incomes[:, open_ended] = low_open * (1.0 - u_open) ** (-1.0 / pareto_alpha)
+        else:
+            upper = np.maximum(UNIFORM_TAIL_UPPER, low_open)
+            incomes[:, open_ended] = low_open + u_open * (upper - low_open)
+    return incomes
+
+
+def simulate_rent_burden(
+    df,
+    n_draws=2000,
+    by=None,
+    tail="pareto",
+    pareto_alpha=PARETO_ALPHA,
+    seed=42,
+    interval=0.9,
+):
+    """
+    Monte Carlo estimate of the rent burden distribution for renters.
+
+    Instead of collapsing each income bracket to its midpoint, every draw samples one
+    income per respondent inside their bracket (uniform within closed brackets, Pareto or
+    uniform for the open-ended top bracket) and recomputes the burden categories. All
+    draws for a block of respondents are evaluated as a single NumPy array operation.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    n_draws (int): Number of Monte Carlo draws
+    by (str): Optional column to break the shares down by (e.g. "distrito")
+    tail (str): "pareto" or "uniform" model for the open-ended top bracket
+    pareto_alpha (float): Shape of the Pareto tail
+    seed (int): Seed for the random generator
+    interval (float): Width of the reported uncertainty band (e.g. 0.9 for p5-p95)
+
+    Returns:
+    DataFrame: One row per (group, category) with the midpoint share, the simulated mean
+    share and the lower/upper band, all in percent of the renters in the group with a
+    known income bracket and rent (the same renters for every column)
+    """
+    renters = df[df["housing_situation"] == "Arrendamento"]
+    if renters.empty:
+        return pd.DataFrame(
+            columns=([by] if by else [])
+            + ["category", "midpoint_share", "mean_share", "lower", "upper"]
+        )
+
+    if by:
+        group_codes, group_labels = pd.factorize(renters[by], use_na_sentinel=False)
+    else:
+        group_codes = np.zeros(len(renters), dtype=np.int64)
+        group_labels = np.array([None])
+    n_groups = len(group_labels)
+
+    brackets = normalize_bracket(renters["rendimento-anual"])
+    low = brackets.map(lambda b: INCOME_BRACKET_BOUNDS.get(b, (np.nan, np.nan))[0]).to_numpy(float)
+    high = brackets.map(lambda b: INCOME_BRACKET_BOUNDS.get(b, (np.nan, np.nan))[1]).to_numpy(float)
+    rent = pd.to_numeric(renters["valor-mensal-renda"], errors="coerce").to_numpy(float)
+
+    valid = ~np.isnan(low) & ~np.isnan(rent)
+    low, high, rent = low[valid], high[valid], rent[valid]
+    valid_groups = group_codes[valid]
+    n_valid = int(valid.sum())
+    # Both the simulated and the midpoint shares are out of the renters that can be simulated
+    group_totals = np.bincount(valid_groups, minlength=n_groups).astype(float)
+
+    n_categories = len(RENT_BURDEN_CATEGORIES)
+    counts = np.zeros((n_draws, n_groups, n_categories), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+
+    if n_valid:
+        block = max(1, MAX_CELLS_PER_BLOCK // n_valid)
+        for start in range(0, n_draws, block):
+            stop = min(start + block, n_draws)
+            u = rng.random((stop - start, n_valid))
+            incomes = _draw_incomes(u, low, high, tail, pareto_alpha)
+            burden = rent * 12.0 / incomes * 100.0
+            categories = np.digitize(burden, RENT_BURDEN_EDGES, right=True)
+
+            # One bincount over (draw, group, category) codes for the whole block
+            draw_index = np.arange(stop - start)[:, None]
+            flat = (draw_index * n_groups + valid_groups[None, :]) * n_categories + categories
+            block_counts = np.bincount(
+                flat.ravel(), minlength=(stop - start) * n_groups * n_categories
+            )
+            counts[start:stop] = block_counts.reshape(stop - start, n_groups, n_categories)
+
+    shares = counts / np.maximum(group_totals, 1)[None, :, None] * 100
+    high_shares = shares[:, :, 2:].sum(axis=2, keepdims=True)
+    shares = np.concatenate([shares, high_shares], axis=2)
+    labels = RENT_BURDEN_CATEGORIES + [HIGH_BURDEN_LABEL]
+
+    tail_mass = (1 - interval) / 2 * 100
+    mean_share = shares.mean(axis=0)
+    lower, upper = np.percentile(shares, [tail_mass, 100 - tail_mass], axis=0)
+
+    # Shares with every income at its bracket midpoint, for comparison
+    midpoint_income = brackets[valid].map(INCOME_BRACKET_MIDPOINTS).to_numpy(float)
+    midpoint_categories = np.digitize(rent * 12.0 / midpoint_income * 100.0, RENT_BURDEN_EDGES, right=True)
+    midpoint_counts = np.bincount(
+        valid_groups * n_categories + midpoint_categories, minlength=n_groups * n_categories
+    ).reshape(n_groups, n_categories).astype(float)
+    midpoint_shares = midpoint_counts / np.maximum(group_totals, 1)[:, None] * 100
+    midpoint_shares = np.concatenate(
+        [midpoint_shares, midpoint_shares[:, 2:].sum(axis=1, keepdims=True)], axis=1
+    )
+
+    summary = pd.DataFrame(
+        {
+            "category": np.tile(labels, n_groups),
+            "midpoint_share": midpoint_shares.ravel(),
+            "mean_share": mean_share.ravel(),
+            "lower": lower.ravel(),
+            "upper": upper.ravel(),
+        }
+    )
+    if by:
+        summary.insert(0, by, np.repeat(group_labels, len(labels)))
+    return summary
+
+
+@st.cache_data(show_spinner=False)
+@persistent("rent_burden_simulation")
+def cached_rent_burden_simulation(
+    _df,
+    dataset_version,
+    n_draws=2000,
+    by=None,
+    tail="pareto",
+    pareto_alpha=PARETO_ALPHA,
+    seed=42,
+    interval=0.9,
+):
+    """
+    Cached wrapper around simulate_rent_burden.
+
+    The DataFrame itself is not hashed; the cache is keyed on the dataset version
+    token and the simulation parameters, so a rerun costs a dictionary lookup.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    """
+    return simulate_rent_burden(
+        _df,
+        n_draws=n_draws,
+        by=by,
+        tail=tail,
+        pareto_alpha=pareto_alpha,
+        seed=seed,
+        interval=interval,
+    )
@@ -0,0 +1,94 @@
+# box_stats.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics.filters import apply_filters
+from data.artifacts import persistent
+
+# Maximum number of outliers kept per box; the most extreme ones are kept
+BOX_MAX_OUTLIERS = 50
+WHISKER_IQR = 1.5
+
+
+def box_summary(df, value, by=None, max_outliers=BOX_MAX_OUTLIERS, whisker=WHISKER_IQR):
+    """
+    Box plot statistics per group, computed with vectorized groupbys.
+
+    Whiskers follow the Tukey rule used by Plotly (last data point within 1.5 IQR of the
+    box) and the outliers are capped at the max_outliers most extreme values per group,
+    so the figure built from this summary carries O(groups) values instead of O(rows).
+
+    Parameters:
+    df (DataFrame): Data to summarise
+    value (str): Numeric column
+    by (str): Optional grouping column; None gives a single box
+    max_outliers (int): Maximum number of outliers kept per group
+    whisker (float): Whisker length in IQRs
+
+    Returns:
+    DataFrame: One row per group with count, q1, median, q3, mean, lowerfence,
+    upperfence, notchspan and the list of sampled outliers
+    """
+    values = pd.to_numeric(df[value], errors="coerce")
+    if by is None:
+        groups = pd.Series("", index=df.index, name="group")
+    else:
+        groups = df[by].rename("group")
+    data = pd.DataFrame({"group": groups, "value": values}).dropna()
+
+    columns = ["count", "q1", "median", "q3", "mean", "lowerfence", "upperfence", "notchspan", "outliers"]
+    if data.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name=by))
+
+    grouped = data.groupby("group", observed=True, sort=True)["value"]
+    summary = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    summary.columns = ["q1", "median", "q3"]
+    summary["count"] = grouped.size()
+    summary["mean"] = grouped.mean()
+
+    iqr = summary["q3"] - summary["q1"]
+    low_limit = (summary["q1"] - whisker * iqr).reindex(data["group"]).to_numpy()
+    high_limit = (summary["q3"] + whisker * iqr).reindex(data["group"]).to_numpy()
+    inside = (data["value"].to_numpy() >= low_limit) & (data["value"].to_numpy() <= high_limit)
+
+    within = data[inside].groupby("group", observed=True)["value"]
+    summary["lowerfence"] = within.min()
+    summary["upperfence"] = within.max()
+    # Groups where every point is an outlier fall back to the box edges
+    summary["lowerfence"] = summary["lowerfence"].fillna(summary["q1"])
+    summary["upperfence"] = summary["upperfence"].fillna(summary["q3"])
+    summary["notchspan"] = 1.57 * iqr / np.sqrt(summary["count"])
+
+    outliers = data[~inside].copy()
+    if not outliers.empty:
+        median_by_row = summary["median"].reindex(outliers["group"]).to_numpy()
+        outliers["distance"] = np.abs(outliers["value"].to_numpy() - median_by_row)
+        outliers = (
+            outliers.sort_values("distance", ascending=False)
+            .groupby("group", observed=True)
+            .head(max_outliers)
+        )
+        summary["outliers"] = outliers.groupby("group", observed=True)["value"].agg(list)
+    else:
+        summary["outliers"] = np.nan
+    summary["outliers"] = summary["outliers"].apply(lambda x: x if isinstance(x, list) else [])
+
+    summary.index.name = by
+    return summary[columns]
+
+
+@st.cache_data(show_spinner=False)
+@persistent("box_summary")
+def cached_box_summary(_df, dataset_version, value, by=None, filters=()):
+    """
+    Cached box_summary over a filtered view of the full dataset.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    value (str): Numeric column
+    by (str): Optional grouping column
+    filters (tuple): (column, value) pairs; rows must match all of them
+    """
+    return box_summary(apply_filters(_df, filters), value, by)
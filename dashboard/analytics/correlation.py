@@ -0,0 +1,123 @@
+# correlation.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics.filters import apply_filters
+from data.artifacts import persistent
+
+
+class CorrelationStats:
+    """
+    Pairwise sufficient statistics for Pearson correlations between numeric columns.
+
+    For every pair of columns it keeps the number of rows where both are present and
+    the sums, sums of squares and cross-products over those rows, all obtained from a
+    few masked matrix products. Any correlation submatrix is then assembled in O(k²)
+    from these arrays, with the same pairwise-complete handling of missing values as
+    DataFrame.corr().
+
+    Parameters:
+    df (DataFrame): Data to summarise
+    columns (list): Numeric columns
+    method (str): "pearson", or "spearman" to correlate the column ranks instead
+    """
+
+    def __init__(self, df, columns, method="pearson"):
+        self.columns = list(columns)
+        self.method = method
+        self._index = {col: i for i, col in enumerate(self.columns)}
+
+        values = df[self.columns].apply(pd.to_numeric, errors="coerce")
+        if method == "spearman":
+            # Ranks per column over its non-missing values. DataFrame.corr re-ranks each
+            # pair on the rows where both are present, so pairs with different missing
+            # patterns can differ slightly from pandas.
+            values = values.rank()
+        x = values.to_numpy(dtype=float)
+
+        present = ~np.isnan(x)
+        m = present.astype(float)
+        # Centre each column on its mean to keep the sums well conditioned
+        x = np.where(present, x, 0.0)
+        means = x.sum(axis=0) / np.maximum(m.sum(axis=0), 1)
+        x = np.where(present, x - means, 0.0)
+
+        self.n = m.T @ m  # rows where both columns are present
+        self.sum_x = x.T @ m  # sum of column i over rows where j is present
+        self.sum_xx = (x * x).T @ m  # sum of squares of column i over rows where j is present
+        self.sum_xy = x.T @ x  # cross-products (zeros stand in for missing values)
+
+    def matrix(self, columns):
+        """
+        Correlation submatrix for the requested columns.
+
+        Parameters:
+        columns (list): Columns, all among those the statistics were built for
+
+        Returns:
+        DataFrame: Correlation matrix
+        """
+        idx = np.array([self._index[col] for col in columns], dtype=int)
+        grid = np.ix_(idx, idx)
+        n = self.n[grid]
+        sx = self.sum_x[grid]
+        sy = sx.T
+        sxx = self.sum_xx[grid]
+        syy = sxx.T
+        sxy = self.sum_xy[grid]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * sxy - sx * sy
+            var_x = n * sxx - sx**2
+            var_y = n * syy - sy**2
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[(n < 2) | (var_x <= 0) | (var_y <= 0)] = np.nan
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(np.diag(n) >= 2, 1.0, np.nan))
+        return pd.DataFrame(corr, index=list(columns), columns=list(columns))
+
+
+def top_pairs(corr_matrix, k=5):
+    """
+    Strongest correlations (by absolute value) in the upper triangle of a matrix.
+
+    Parameters:
+    corr_matrix (DataFrame): Square correlation matrix
+    k (int): Number of pairs to return
+
+    Returns:
+    list: (column 1, column 2, correlation) tuples, strongest first
+    """
+    rows, cols = np.triu_indices(len(corr_matrix), k=1)
+    values = corr_matrix.to_numpy()[rows, cols]
+    valid = ~np.isnan(values)
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+    if not len(values):
+        return []
+
+    k = min(k, len(values))
+    strength = np.abs(values)
+    best = np.argpartition(-strength, k - 1)[:k]
+    best = best[np.argsort(-strength[best], kind="stable")]
+    names = corr_matrix.columns
+    return [(names[rows[i]], names[cols[i]], values[i]) for i in best]
+
+
+@st.cache_data(show_spinner=False)
+@persistent("correlation_stats")
+def cached_correlation_stats(_df, dataset_version, columns, filters=(), method="pearson"):
+    """
+    Correlation statistics for all candidate columns, per filter state and method.
+
+    Built once for the full list of numeric columns, so selecting more columns in the
+    UI only assembles a larger submatrix.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    columns (tuple): Candidate numeric columns
+    filters (tuple): (column, value) pairs; rows must match all of them
+    method (str): "pearson" or "spearman"
+    """
+    return CorrelationStats(apply_filters(_df, filters), columns, method)
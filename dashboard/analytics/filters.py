@@ -0,0 +1,21 @@
+# filters.py
+import pandas as pd
+
+
+def apply_filters(df, filters=()):
+    """
+    Keep the rows matching every (column, value) pair.
+
+    Cached analytics take filters as a tuple of pairs, which is hashable and therefore
+    usable as part of the cache key.
+
+    Parameters:
+    df (DataFrame): Data to filter
+    filters (tuple): (column, value) pairs
+    """
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, selected in filters:
+        mask &= df[column] == selected
+    return df[mask]
@@ -0,0 +1,144 @@
+# income.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data.artifacts import persistent
+
+# Answer options of "rendimento-anual", from lowest to highest
+INCOME_BRACKETS = [
+    "sem-rendimento",
+    "<7001",
+    "7001-12000",
+    "12001-20000",
+    "20001-35000",
+    "35001-50000",
+    "50001-80000",
+    ">80001",
+]
+
+INCOME_BRACKET_LABELS = {
+    "sem-rendimento": "Sem Rendimento",
+    "<7001": "Até €7.000",
+    "7001-12000": "€7.001-€12.000",
+    "12001-20000": "€12.001-€20.000",
+    "20001-35000": "€20.001-€35.000",
+    "35001-50000": "€35.001-€50.000",
+    "50001-80000": "€50.001-€80.000",
+    ">80001": "Mais de €80.000",
+}
+
+# Income groups of the detailed income analysis (annual income in €, right-closed)
+INCOME_GROUP_EDGES = [0, 7000, 12000, 20000, 35000, 50000, 80000, np.inf]
+INCOME_GROUP_LABELS = [
+    "Sem/Baixo Rendimento",
+    "€7K-€12K",
+    "€12K-€20K",
+    "€20K-€35K",
+    "€35K-€50K",
+    "€50K-€80K",
+    "Mais de €80K",
+]
+
+# Coarse income bands (annual income in €, left-closed)
+INCOME_BAND_EDGES = [-np.inf, 12000, 35000, 80000, np.inf]
+INCOME_BAND_LABELS = [
+    "Baixo Rendimento",
+    "Rendimento Médio",
+    "Rendimento Alto",
+    "Rendimento Muito Alto",
+]
+
+# Numeric scale of the cleaned satisfaction levels
+SATISFACTION_LEVEL_SCORES = {
+    "Very Satisfied": 5,
+    "Satisfied": 4,
+    "Neutral": 3,
+    "Dissatisfied": 2,
+    "Very Dissatisfied": 1,
+}
+
+
+def add_income_columns(df):
+    """
+    Add the income grouping columns as ordered categoricals, plus the satisfaction score.
+
+    Columns added:
+    income_category: answer of "rendimento-anual" ("Unknown" when missing)
+    income_group: one of INCOME_GROUP_LABELS, from rendimento_numerical
+    income_band: one of INCOME_BAND_LABELS, from rendimento_numerical
+    satisfaction_score: satisfaction level on a 1 to 5 scale
+
+    Parameters:
+    df (DataFrame): The processed housing data
+
+    Returns:
+    DataFrame: The data with the income columns
+    """
+    income = df["rendimento_numerical"]
+    return df.assign(
+        income_category=pd.Categorical(
+            df["rendimento-anual"].fillna("Unknown"),
+            categories=INCOME_BRACKETS + ["Unknown"],
+            ordered=True,
+        ),
+        income_group=pd.cut(income, bins=INCOME_GROUP_EDGES, labels=INCOME_GROUP_LABELS),
+        income_band=pd.cut(income, bins=INCOME_BAND_EDGES, labels=INCOME_BAND_LABELS, right=False),
+        satisfaction_score=df["satisfaction_level"].map(SATISFACTION_LEVEL_SCORES),
+    )
+
+
+class IncomeSatisfactionStats:
+    """
+    Income × housing situation × satisfaction statistics from one grouped aggregation.
+
+    The respondents are counted once per (income_category, income_band,
+    housing_situation, satisfaction_level) cell; every distribution and mean below is
+    then derived from that small table, so its cost does not depend on the number of
+    respondents, bands or sections that use it.
+
+    Parameters:
+    df (DataFrame): Respondents to summarise (with the add_income_columns columns)
+    """
+
+    KEYS = ["income_category", "income_band", "housing_situation", "satisfaction_level"]
+
+    def __init__(self, df):
+        cells = df.groupby(self.KEYS, observed=True, dropna=False).size().rename("count").reset_index()
+        cells = cells[cells["satisfaction_level"].notna()]
+        cells["score"] = cells["satisfaction_level"].map(SATISFACTION_LEVEL_SCORES)
+        cells["weighted"] = cells["count"] * cells["score"]
+        self.cells = cells
+
+        # Share of each satisfaction level within each income bracket (%)
+        by_category = cells.groupby(["income_category", "satisfaction_level"], observed=True)["count"].sum()
+        totals = by_category.groupby(level="income_category", observed=True).transform("sum")
+        self.distribution = (by_category / totals).mul(100).round(1).unstack(fill_value=0)
+
+        self.category_means = self._mean_score("income_category")
+        self.band_means = self._mean_score("income_band")
+        self.band_housing_means = self._mean_score(["income_band", "housing_situation"]).unstack()
+
+    def _mean_score(self, by):
+        sums = self.cells.groupby(by, observed=True)[["count", "weighted"]].sum()
+        return sums["weighted"] / sums["count"]
+
+
+@st.cache_data(show_spinner=False)
+@persistent("income_satisfaction")
+def cached_income_satisfaction(_df, dataset_version, satisfaction_levels=(), income_brackets=()):
+    """
+    Cached IncomeSatisfactionStats for the selected satisfaction levels and income brackets.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    satisfaction_levels (tuple): satisfaction_level values to keep (empty keeps all)
+    income_brackets (tuple): "rendimento-anual" values to keep (empty keeps all)
+    """
+    mask = pd.Series(True, index=_df.index)
+    if satisfaction_levels:
+        mask &= _df["satisfaction_level"].isin(satisfaction_levels)
+    if income_brackets:
+        mask &= _df["rendimento-anual"].isin(income_brackets)
+    return IncomeSatisfactionStats(_df[mask])
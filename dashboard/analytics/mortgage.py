@@ -0,0 +1,187 @@
+# mortgage.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics.affordability import INCOME_BRACKET_MIDPOINTS, normalize_bracket
+from data.artifacts import persistent
+
+# Default grid of the purchase simulator
+DEFAULT_RATES = np.round(np.arange(0.5, 8.0001, 0.05), 2)  # annual %, 151 values
+DEFAULT_TERMS = np.arange(5, 41, 1)  # years, 36 values
+DEFAULT_DOWN_PAYMENTS = np.arange(0, 51, 5)  # % of price, 11 values
+DEFAULT_PRICE_QUANTILES = (0.25, 0.5, 0.75)
+
+# Maximum share of net income for the mortgage payment
+PAYMENT_TO_INCOME_LIMIT = 0.35
+
+INCOME_AT_PURCHASE_COLUMNS = {
+    "individual": "rendimento-liquido-anual-individual-na-compra",
+    "household": "rendimento-liquido-anual-conjunto-na-compra",
+}
+
+
+def monthly_payment(principal, annual_rate_pct, term_years):
+    """
+    Fixed-rate annuity payment, broadcast over any compatible array shapes.
+
+    Parameters:
+    principal (array-like): Loan amount (€)
+    annual_rate_pct (array-like): Annual nominal interest rate in percent
+    term_years (array-like): Loan term in years
+
+    Returns:
+    ndarray: Monthly payment (€)
+    """
+    principal = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate_pct, dtype=float) / 100 / 12
+    n = np.asarray(term_years, dtype=float) * 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(r > 0, r / (1 - (1 + r) ** -n), 1 / n)
+    return principal * annuity
+
+
+def district_price_quantiles(df, quantiles=DEFAULT_PRICE_QUANTILES):
+    """
+    Purchase price quantiles per district for owners.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    quantiles (tuple): Quantiles to compute
+
+    Returns:
+    DataFrame: One row per district, one column per quantile, plus the number of owners
+    """
+    owners = df[(df["housing_situation"] == "Casa Própria") & df["valor-compra"].notna()]
+    grouped = owners.groupby("distrito")["valor-compra"]
+    prices = grouped.quantile(list(quantiles)).unstack()
+    prices.columns = list(quantiles)
+    prices["count"] = grouped.size()
+    return prices.sort_values("count", ascending=False)
+
+
+def price_to_income(df):
+    """
+    Price-to-income ratio at the time of purchase.
+
+    Uses the household net income when it was reported and falls back to the individual
+    net income, both taken at the bracket midpoint.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+
+    Returns:
+    DataFrame: distrito, ano-compra, valor-compra, income at purchase and the ratio
+    """
+    owners = df[(df["housing_situation"] == "Casa Própria") & df["valor-compra"].notna()]
+
+    incomes = {}
+    for key, column in INCOME_AT_PURCHASE_COLUMNS.items():
+        if column in owners.columns:
+            incomes[key] = normalize_bracket(owners[column]).map(INCOME_BRACKET_MIDPOINTS)
+        else:
+            incomes[key] = pd.Series(np.nan, index=owners.index)
+    income = incomes["household"].fillna(incomes["individual"]).astype(float)
+    income = income.where(income > 0)
+
+    result = owners[["distrito", "ano-compra", "valor-compra"]].copy()
+    result["income_at_purchase"] = income
+    result["price_to_income"] = result["valor-compra"] / income
+    return result.dropna(subset=["price_to_income"])
+
+
+def mortgage_grid(
+    prices,
+    rates=DEFAULT_RATES,
+    terms=DEFAULT_TERMS,
+    down_payments=DEFAULT_DOWN_PAYMENTS,
+):
+    """
+    Monthly payments for every price × rate × term × down payment combination.
+
+    The whole grid is a single broadcast NumPy expression, so tens of thousands of cells
+    (and far more) are evaluated in one pass.
+
+    Parameters:
+    prices (array-like): Purchase prices (€), any shape; flattened to one axis
+    rates (array-like): Annual interest rates in percent
+    terms (array-like): Terms in years
+    down_payments (array-like): Down payments in percent of the price
+
+    Returns:
+    ndarray: Payments with shape (prices, rates, terms, down payments)
+    """
+    prices = np.asarray(prices, dtype=float).reshape(-1, 1, 1, 1)
+    rates = np.asarray(rates, dtype=float).reshape(1, -1, 1, 1)
+    terms = np.asarray(terms, dtype=float).reshape(1, 1, -1, 1)
+    down = np.asarray(down_payments, dtype=float).reshape(1, 1, 1, -1)
+
+    principal = prices * (1 - down / 100)
+    return monthly_payment(principal, rates, terms)
+
+
+@st.cache_resource(show_spinner=False)
+def cached_district_mortgage_grid(
+    _df,
+    dataset_version,
+    rates=tuple(DEFAULT_RATES),
+    terms=tuple(DEFAULT_TERMS),
+    down_payments=tuple(DEFAULT_DOWN_PAYMENTS),
+    quantiles=DEFAULT_PRICE_QUANTILES,
+):
+    """
+    Cached mortgage grid over the district purchase price quantiles.
+
+    The grid is built once per dataset version and shared by every session without
+    being copied, so the payments array is read-only and the prices frame must not be
+    modified. Only the income-dependent part (payment / income) is left for the rerun,
+    which is a single vectorized division over a slice of the array.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+
+    Returns:
+    tuple: (district price quantiles DataFrame, payments array with shape
+    (districts, quantiles, rates, terms, down payments))
+    """
+    prices, payments = _district_mortgage_grid(
+        _df, dataset_version, rates, terms, down_payments, quantiles
+    )
+    payments.setflags(write=False)
+    return prices, payments
+
+
+@persistent("district_mortgage_grid")
+def _district_mortgage_grid(
+    _df,
+    dataset_version,
+    rates=tuple(DEFAULT_RATES),
+    terms=tuple(DEFAULT_TERMS),
+    down_payments=tuple(DEFAULT_DOWN_PAYMENTS),
+    quantiles=DEFAULT_PRICE_QUANTILES,
+):
+    """Build the district mortgage grid (see cached_district_mortgage_grid)."""
+    prices = district_price_quantiles(_df, quantiles)
+    payments = mortgage_grid(
+        prices[list(quantiles)].to_numpy(), rates, terms, down_payments
+    ).reshape(len(prices), len(quantiles), len(rates), len(terms), len(down_payments))
+    return prices, payments
+
+
+def affordable_share(payments, annual_net_income, limit=PAYMENT_TO_INCOME_LIMIT):
+    """
+    Share of grid cells whose payment stays within the payment-to-income limit.
+
+    Parameters:
+    payments (ndarray): Monthly payments, as returned by mortgage_grid
+    annual_net_income (float): Annual net income (€)
+    limit (float): Maximum payment as a share of monthly net income
+
+    Returns:
+    float: Share of affordable cells, between 0 and 1
+    """
+    if annual_net_income <= 0:
+        return 0.0
+    return float((payments <= annual_net_income / 12 * limit).mean())
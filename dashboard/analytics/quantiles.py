@@ -0,0 +1,259 @@
+# quantiles.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Accuracy parameter of the sketch; the rank error is roughly 1.7 / k (about 1% for k=200)
+DEFAULT_SKETCH_K = 200
+COMPACTOR_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Values are kept in a hierarchy of compactors; an item at level h stands for 2**h
+    input values. When the sketch grows past its capacity, a full compactor is sorted
+    and every other item is promoted to the next level. Two sketches are combined by
+    concatenating their levels and compacting again, so sketches built on disjoint
+    cells or on successive appends merge into the sketch of their union.
+
+    Until the first compaction (fewer than about k values) the sketch holds every
+    value and quantiles are exact.
+    """
+
+    def __init__(self, k=DEFAULT_SKETCH_K, seed=0):
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return int(np.ceil(self.k * COMPACTOR_DECAY**depth)) + 1
+
+    def _size(self):
+        return sum(len(items) for items in self._levels)
+
+    def _max_size(self):
+        return sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for h, items in enumerate(self._levels):
+                if len(items) >= self._capacity(h):
+                    if h + 1 == len(self._levels):
+                        self._levels.append(np.empty(0))
+                    items = np.sort(items)
+                    # Keep the last item of an odd-sized compactor at its level
+                    keep = items[-1:] if len(items) % 2 else items[:0]
+                    even = items[: len(items) - len(keep)]
+                    promoted = even[self._rng.integers(2) :: 2]
+                    self._levels[h] = keep
+                    self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+                    break
+
+    def update(self, values):
+        """
+        Add values (scalar or array-like); NaNs are ignored.
+
+        Parameters:
+        values (array-like): Values to add
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one, in place.
+
+        Parameters:
+        other (KLLSketch): Sketch to merge
+        """
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def copy(self):
+        """Return an independent copy of the sketch."""
+        sketch = KLLSketch(self.k)
+        sketch.count, sketch.min, sketch.max = self.count, self.min, self.max
+        sketch._levels = [items.copy() for items in self._levels]
+        return sketch
+
+    def quantiles(self, qs):
+        """
+        Approximate quantiles.
+
+        Parameters:
+        qs (array-like): Quantiles between 0 and 1
+
+        Returns:
+        ndarray: One value per quantile (NaN for an empty sketch)
+        """
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+
+        if len(self._levels) == 1:
+            # No compaction yet: every value is still in the sketch
+            return np.quantile(self._levels[0], qs)
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**h) for h, level in enumerate(self._levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+
+        # Each item covers `weight` consecutive ranks; interpolate between their centres
+        positions = np.cumsum(weights) - weights / 2 - 0.5
+        positions = positions / max(weights.sum() - 1, 1)
+        return np.clip(np.interp(qs, positions, items), self.min, self.max)
+
+    def quantile(self, q):
+        """Approximate single quantile."""
+        return float(self.quantiles([q])[0])
+
+    def median(self):
+        """Approximate median."""
+        return self.quantile(0.5)
+
+
+class QuantileSketchCube:
+    """
+    Quantile sketches of one numeric column, one sketch per cell of the dimension columns.
+
+    Cells are the distinct combinations of the dimension values, so any filter or
+    grouping on those dimensions is answered by merging the sketches of the matching
+    cells, without touching the raw rows. New rows are added with append().
+
+    Parameters:
+    value (str): Numeric column summarised by the sketches
+    dims (tuple): Dimension columns defining the cells
+    k (int): Accuracy parameter of the sketches
+    """
+
+    def __init__(self, value, dims, k=DEFAULT_SKETCH_K):
+        self.value = value
+        self.dims = tuple(dict.fromkeys(dims))
+        self.k = k
+        self.cells = {}
+        # Categories of the categorical dimensions, in order (grouped results keep it)
+        self.categories = {}
+
+    def append(self, df):
+        """
+        Ingest rows into the cell sketches.
+
+        Parameters:
+        df (DataFrame): Rows with the value and dimension columns
+        """
+        for dim in self.dims:
+            if isinstance(df[dim].dtype, pd.CategoricalDtype):
+                known = self.categories.setdefault(dim, [])
+                known.extend(c for c in df[dim].cat.categories if c not in known)
+        values = pd.to_numeric(df[self.value], errors="coerce")
+        data = df[list(self.dims)].assign(_value=values).dropna(subset=["_value"])
+        if not self.dims:
+            self.cells.setdefault((), KLLSketch(self.k)).update(data["_value"].to_numpy())
+            return self
+        for cell, group in data.groupby(list(self.dims), dropna=False, observed=True)["_value"]:
+            cell = cell if isinstance(cell, tuple) else (cell,)
+            self.cells.setdefault(cell, KLLSketch(self.k)).update(group.to_numpy())
+        return self
+
+    def _matches(self, cell, filters):
+        for column, selected in filters:
+            if cell[self.dims.index(column)] != selected:
+                return False
+        return True
+
+    def sketch(self, filters=(), by=None):
+        """
+        Merge the sketches of the cells matching the filters.
+
+        Parameters:
+        filters (tuple): (column, value) pairs on the dimension columns
+        by (str): Optional dimension to group the result by
+
+        Returns:
+        KLLSketch or dict: One merged sketch, or a dict of sketches per value of `by`
+        """
+        merged = {}
+        for cell, cell_sketch in self.cells.items():
+            if not self._matches(cell, filters):
+                continue
+            key = cell[self.dims.index(by)] if by else None
+            if key in merged:
+                merged[key].merge(cell_sketch)
+            else:
+                merged[key] = cell_sketch.copy()
+        if by:
+            return merged
+        return merged.get(None, KLLSketch(self.k))
+
+    def quantiles(self, qs, filters=(), by=None):
+        """
+        Approximate quantiles for the rows matching the filters.
+
+        Parameters:
+        qs (list): Quantiles between 0 and 1
+        filters (tuple): (column, value) pairs on the dimension columns
+        by (str): Optional dimension to group the result by
+
+        Returns:
+        DataFrame: One row per group (or a single row) and one column per quantile,
+        plus the row count
+        """
+        sketches = self.sketch(filters, by)
+        if not by:
+            sketches = {None: sketches}
+        result = pd.DataFrame(
+            {key: np.append(s.quantiles(qs), s.count) for key, s in sketches.items()},
+            index=list(qs) + ["count"],
+        ).T
+        result.index.name = by
+        if by:
+            # Like groupby, rows with a missing group value only count in ungrouped queries,
+            # and categorical groups come in category order
+            result = result[result.index.notna()]
+            if by in self.categories:
+                result = result.reindex([c for c in self.categories[by] if c in result.index])
+                result.index.name = by
+            else:
+                result = result.sort_index()
+        return result
+
+
+@st.cache_resource(show_spinner=False)
+def sketch_cube(_df, dataset_version, value, dims, k=DEFAULT_SKETCH_K):
+    """
+    Build (once per dataset version) the quantile sketch cube of a column.
+
+    The cube is shared by all sessions and only read afterwards; queries merge copies
+    of the cell sketches.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    value (str): Numeric column
+    dims (tuple): Dimension columns defining the cells
+    """
+    return QuantileSketchCube(value, dims, k).append(_df)
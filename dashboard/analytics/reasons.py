@@ -0,0 +1,118 @@
+# reasons.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data.artifacts import persistent
+
+# Dissatisfaction reason codes of "insatisfacao-motivos"; process_data adds one reason_<code> flag per code
+REASON_CODES = [
+    "pago-demasiado",
+    "falta-espaco",
+    "habitacao-mau-estado",
+    "vivo-longe",
+    "quero-independecia",
+    "dificuldades-financeiras",
+    "financeiramente-dependente",
+    "vivo-longe-de-transportes",
+    "vivo-zona-insegura",
+    "partilho-casa-com-desconhecidos",
+]
+REASON_COLUMNS = [f"reason_{code}" for code in REASON_CODES]
+
+REASON_LABELS = {
+    "reason_pago-demasiado": "Pago Demasiado",
+    "reason_falta-espaco": "Falta de Espaço",
+    "reason_habitacao-mau-estado": "Habitação em Mau Estado",
+    "reason_vivo-longe": "Vivo Longe do Trabalho",
+    "reason_quero-independecia": "Quero Independência",
+    "reason_dificuldades-financeiras": "Dificuldades Financeiras",
+    "reason_financeiramente-dependente": "Dependência Financeira",
+    "reason_vivo-longe-de-transportes": "Longe de Transportes",
+    "reason_vivo-zona-insegura": "Zona Insegura",
+    "reason_partilho-casa-com-desconhecidos": "Partilho Casa com Desconhecidos",
+}
+
+# Demographic dimensions the reason prevalence is computed for
+REASON_DIMENSIONS = {
+    "education_level": "Nível Educacional",
+    "employment_status": "Situação Profissional",
+    "distrito": "Distrito",
+    "rendimento_clean": "Escalão de Rendimento",
+    "housing_situation": "Situação Habitacional",
+    "age_group": "Faixa Etária",
+}
+
+
+def reason_flags(reason_lists):
+    """
+    One 0/1 column per reason code from a column of reason lists, in one pass.
+
+    Parameters:
+    reason_lists (Series): Lists of reason codes (missing values mean no reason)
+
+    Returns:
+    DataFrame: reason_<code> integer columns, aligned with the input index
+    """
+    codes = reason_lists.explode()
+    codes = codes[codes.isin(REASON_CODES)]
+    if codes.empty:
+        onehot = pd.DataFrame(0, index=reason_lists.index, columns=REASON_CODES)
+    else:
+        onehot = pd.crosstab(codes.index, codes).clip(upper=1)
+        onehot = onehot.reindex(index=reason_lists.index, columns=REASON_CODES, fill_value=0)
+    return onehot.add_prefix("reason_").astype("int64")
+
+
+class ReasonStats:
+    """
+    Reason prevalence, co-occurrence and lift computed from the reason flag matrix.
+
+    The flags of every respondent form an n × k matrix R. Prevalence by a dimension is a
+    single groupby over the whole matrix, the co-occurrence counts are Rᵀ R and the lift
+    of a pair of reasons is P(a and b) / (P(a) P(b)) taken from those counts.
+
+    Results are indexed by the reason_<code> column names; REASON_LABELS gives their
+    display names.
+
+    Parameters:
+    df (DataFrame): Respondents to summarise
+    dimensions (list): Columns to compute the prevalence by
+    """
+
+    def __init__(self, df, dimensions=tuple(REASON_DIMENSIONS)):
+        flags = df[REASON_COLUMNS].astype(float)
+        matrix = flags.to_numpy()
+        self.n = len(df)
+
+        self.counts = pd.Series(matrix.sum(axis=0), index=REASON_COLUMNS)
+        self.prevalence = {
+            dim: flags.groupby(df[dim], observed=True).mean() * 100
+            for dim in dimensions
+            if dim in df.columns
+        }
+
+        co_occurrence = matrix.T @ matrix
+        self.co_occurrence = pd.DataFrame(co_occurrence, index=REASON_COLUMNS, columns=REASON_COLUMNS)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = self.n * co_occurrence / np.outer(np.diag(co_occurrence), np.diag(co_occurrence))
+        lift[~np.isfinite(lift)] = np.nan
+        np.fill_diagonal(lift, np.nan)
+        self.lift = pd.DataFrame(lift, index=REASON_COLUMNS, columns=REASON_COLUMNS)
+
+
+@st.cache_data(show_spinner=False)
+@persistent("reason_stats")
+def cached_reason_stats(_df, dataset_version, satisfaction_levels=None):
+    """
+    Cached ReasonStats for all respondents or for some satisfaction levels.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    satisfaction_levels (tuple): Optional satisfaction_level values to keep
+    """
+    if satisfaction_levels:
+        _df = _df[_df["satisfaction_level"].isin(satisfaction_levels)]
+    return ReasonStats(_df)
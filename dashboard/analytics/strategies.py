@@ -0,0 +1,105 @@
+# strategies.py
+import pandas as pd
+import streamlit as st
+
+from data.artifacts import persistent
+
+# Multi-label strategy columns, by housing type
+STRATEGY_COLUMNS = {
+    "Arrendamento": "estrategia-arrendamento",
+    "Compra": "estrategia-compra",
+}
+
+# Numeric scale of the primary satisfaction answer
+SATISFACTION_SCORES = {
+    "muito-satisfeito": 5,
+    "satisfeito": 4,
+    "indiferente": 3,
+    "insatisfeito": 2,
+    "muito-insatisfeito": 1,
+}
+
+
+def strategy_label(code):
+    """Display label of a strategy code, e.g. "apoio-familiar-inicio" -> "Apoio familiar inicio"."""
+    return code.replace("_", " ").replace("-", " ").capitalize()
+
+
+def explode_strategies(df):
+    """
+    Long-format strategy table: one row per (respondent, strategy) pair.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+
+    Returns:
+    DataFrame: Columns respondent (index label in df), tipo (housing type), strategy
+    (raw code) and label (display label)
+    """
+    frames = []
+    for housing_type, column in STRATEGY_COLUMNS.items():
+        codes = df[column].explode().dropna()
+        frames.append(
+            pd.DataFrame({"respondent": codes.index, "tipo": housing_type, "strategy": codes.to_numpy()})
+        )
+    long = pd.concat(frames, ignore_index=True).drop_duplicates()
+    long["label"] = long["strategy"].map(strategy_label)
+    return long.reset_index(drop=True)
+
+
+def strategy_summary(df, long):
+    """
+    Per-strategy counts, mean rent, mean purchase value and mean satisfaction.
+
+    All statistics come from a single grouped aggregation over the long table joined
+    with the respondent values.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    long (DataFrame): Output of explode_strategies for the same data
+
+    Returns:
+    DataFrame: One row per (tipo, strategy) with label, count, mean_rent, mean_purchase
+    and mean_satisfaction
+    """
+    values = pd.DataFrame(
+        {
+            "rent": pd.to_numeric(df["valor-mensal-renda"], errors="coerce"),
+            "purchase": pd.to_numeric(df["valor-compra"], errors="coerce"),
+            "satisfaction": df["satisfacao_primary"].map(SATISFACTION_SCORES),
+        },
+        index=df.index,
+    )
+    joined = long.join(values, on="respondent")
+    summary = joined.groupby(["tipo", "strategy", "label"], sort=False).agg(
+        count=("respondent", "size"),
+        mean_rent=("rent", "mean"),
+        mean_purchase=("purchase", "mean"),
+        mean_satisfaction=("satisfaction", "mean"),
+    )
+    return summary.reset_index().sort_values(["tipo", "count"], ascending=[True, False], ignore_index=True)
+
+
+@st.cache_resource(show_spinner=False)
+def strategy_table(_df, dataset_version):
+    """
+    Build (once per dataset version) the long-format strategy table.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    """
+    return explode_strategies(_df)
+
+
+@st.cache_data(show_spinner=False)
+@persistent("strategy_summary")
+def cached_strategy_summary(_df, dataset_version):
+    """
+    Cached strategy_summary of the full dataset.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    """
+    return strategy_summary(_df, strategy_table(_df, dataset_version))
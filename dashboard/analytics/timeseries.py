@@ -0,0 +1,79 @@
+# timeseries.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics.filters import apply_filters
+from data.artifacts import persistent
+
+ROLLING_WINDOW = 3
+
+
+def period_aggregates(df, time_col, value, window=ROLLING_WINDOW):
+    """
+    Per-period aggregates and period-over-period changes in one grouped pass.
+
+    Parameters:
+    df (DataFrame): Data to aggregate
+    time_col (str): Numeric time column (e.g. "ano-compra")
+    value (str): Numeric column to aggregate
+    window (int): Number of periods of the rolling mean
+
+    Returns:
+    DataFrame: One row per period, sorted by time, with mean, count, sum, var,
+    change and pct_change against the previous period, rolling_mean, cumulative_count
+    and cumulative_mean
+    """
+    values = pd.to_numeric(df[value], errors="coerce")
+    grouped = values.groupby(df[time_col], sort=True)
+    agg = grouped.agg(["mean", "count", "sum", "var"])
+    agg.index.name = time_col
+
+    previous = agg["mean"].shift()
+    agg["previous_period"] = pd.Series(agg.index, index=agg.index).shift()
+    agg["change"] = agg["mean"] - previous
+    # Same convention as before: no percentage change from a zero baseline
+    agg["pct_change"] = np.where(previous != 0, agg["change"] / previous * 100, 0)
+
+    agg["rolling_mean"] = agg["mean"].rolling(window, min_periods=1).mean()
+    agg["cumulative_count"] = agg["count"].cumsum()
+    agg["cumulative_mean"] = agg["sum"].cumsum() / agg["cumulative_count"].replace(0, np.nan)
+    return agg.reset_index()
+
+
+def trend_fit(agg, time_col, column="mean"):
+    """
+    Linear trend of a per-period aggregate.
+
+    Parameters:
+    agg (DataFrame): Output of period_aggregates
+    time_col (str): Time column
+    column (str): Aggregate to fit
+
+    Returns:
+    LinregressResult or None: scipy.stats.linregress result, None with fewer than two periods
+    """
+    valid = agg[[time_col, column]].dropna()
+    if len(valid) < 2:
+        return None
+    # scipy is only needed once a trend is drawn, so it is not loaded at startup
+    from scipy import stats
+
+    return stats.linregress(valid[time_col].to_numpy(float), valid[column].to_numpy(float))
+
+
+@st.cache_data(show_spinner=False)
+@persistent("period_aggregates")
+def cached_period_aggregates(_df, dataset_version, time_col, value, filters=(), window=ROLLING_WINDOW):
+    """
+    Cached period_aggregates per (filter state, time column, variable).
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    time_col (str): Numeric time column
+    value (str): Numeric column to aggregate
+    filters (tuple): (column, value) pairs; rows must match all of them
+    window (int): Number of periods of the rolling mean
+    """
+    return period_aggregates(apply_filters(_df, filters), time_col, value, window)
@@ -1,255 +1,45 @@
-import os
-import numpy as np
+import importlib
 import pandas as pd
 import streamlit as st
-from tabs.tab0_general_overview import show_visao_geral_tab
-from tabs.tab1_housing_distribution import show_housing_distribution_tab
-from tabs.tab2_geographic_analysis import show_geographic_analysis_tab
-from tabs.tab3_satisfaction_levels import show_satisfaction_levels_tab
-from tabs.tab4_income_housing_costs import show_income_housing_costs_tab
-from tabs.tab5_education_employment import show_education_employment_tab
-from tabs.tab6_housing_types_sizes import show_housing_types_sizes_tab
-from tabs.tab7_exploratory_analysis import show_exploratory_analysis_tab
+from config import DASHBOARD_TABS
+from analytics.strategies import strategy_table
+from data.loader import data_path
+from data.schema import dataset_schema
+from data.versioning import DatasetHandle
+from data.watcher import dataset_watcher
 
 # Set page configuration
 st.set_page_config(layout="wide", page_title="Dashboard do Habitação Transparente")
 
-# Define function to load data
-@st.cache_data
-def load_data(file_path):
-    try:
-        df = pd.read_csv(file_path)
-    except Exception as e:
-        st.error(f"Error loading file: {e}")
-        return pd.DataFrame()  # Return empty dataframe if loading fails
-
-    # Process the data for easier analysis
-    # Clean list-like columns
-    for col in ['situacao-habitacional', 'tipo-casa', 'tipologia', 'situacao-profissional', 
-                'satisfacao', 'estrategia-arrendamento', 'insatisfacao-motivos', 'estrategia-compra']:
-        if col in df.columns:
-            df[col] = df[col].str.replace('[', '').str.replace(']', '').str.replace("'", '').str.split(', ')
-            # Extract first value for simplicity
-            df[col + '_primary'] = df[col].apply(lambda x: x[0] if isinstance(x, list) and len(x) > 0 else x)
-    
-    # Parse income brackets for easier categorization
-    def parse_income(income_str):
-        # Handle NaN values
-        if pd.isna(income_str):
-            return np.nan, np.nan
-        
-        # Extract the income range from brackets if present
-        if isinstance(income_str, list):
-            if not income_str:  # Empty list
-                return np.nan, np.nan
-            income_str = income_str[0]  # Take the first element if it's a list
-        
-        # Remove any extraneous characters or whitespace
-        clean_income_str = str(income_str).strip().lower()
-        
-        # Income bracket mapping
-        income_mapping = {
-            'sem-rendimento': 0,
-            '<7001': 3500,
-            '7001-12000': 9500,
-            '12001-20000': 16000,
-            '20001-35000': 27500,
-            '35001-50000': 42500,
-            '50001-80000': 65000,
-            '>80001': 100000
-        }
-        
-        # Return mapped value if direct match exists
-        if clean_income_str in income_mapping:
-            return clean_income_str, income_mapping[clean_income_str]
-        
-        # Handle edge cases with regex pattern matching
-        import re
-        
-        # Match patterns like "<7001", "7001-12000", ">80001"
-        pattern = r'(<|>)?(\d+)(?:-(\d+))?'
-        match = re.match(pattern, clean_income_str)
-        
-        if match:
-            prefix, start, end = match.groups()
-            
-            # Standardize the format for cleaned string
-            if prefix == '<':
-                clean_str = f"<{start}"
-                value = float(start) / 2  # Half of upper bound
-            elif prefix == '>':
-                clean_str = f">{start}"
-                value = float(start) * 1.25  # 25% more than lower bound
-            elif end:  # Range like "7001-12000"
-                clean_str = f"{start}-{end}"
-                value = (float(start) + float(end)) / 2  # Midpoint
-            else:  # Single value
-                clean_str = start
-                value = float(start)
-                
-            return clean_str, value
-        
-        # If no patterns matched
-        return np.nan, np.nan
-
-    # Apply the function to the dataframe and create two new columns
-    cleaned_values = df['rendimento-anual'].apply(parse_income)
-    df['rendimento_clean'] = [x[0] for x in cleaned_values]
-    df['rendimento_numerical'] = [x[1] for x in cleaned_values]
-    
-    # Create a clean housing situation column
-    df['housing_situation'] = df['situacao-habitacional_primary'].map({
-        'arrendo': 'Arrendamento',
-        'comprei': 'Casa Própria',
-        'outrem': 'Others'
-    })
-    
-    # Clean satisfaction levels
-    df['satisfaction_level'] = df['satisfacao_primary'].map({
-        'muito-satisfeito': 'Very Satisfied',
-        'satisfeito': 'Satisfied',
-        'indiferente': 'Neutral',
-        'insatisfeito': 'Dissatisfied',
-        'muito-insatisfeito': 'Very Dissatisfied'
-    })
-    
-    # Extract numeric values from area-util
-    def parse_area(area_str):
-        if pd.isna(area_str):
-            return np.nan
-        elif area_str == '>400':
-            return 450
-        elif '-' in area_str:
-            try:
-                min_val, max_val = map(int, area_str.split('-'))
-                return (min_val + max_val) / 2
-            except ValueError:
-                return np.nan
-        else:
-            return np.nan
-    
-    df['area_numerical'] = df['area-util'].apply(parse_area)
-    
-    # Create rent percentage categories
-    def categorize_rent_percentage(pct):
-        if pd.isna(pct):
-            return "Unknown"
-        try:
-            pct = float(pct)
-        except ValueError:
-            return "Unknown"
-        if pct <= 30:
-            return "≤30% (Affordable)"
-        elif pct <= 50:
-            return "31-50% (Moderate)"
-        elif pct <= 80:
-            return "51-80% (High)"
-        else:
-            return ">80% (Very High)"
-    
-    # Calculate rent burden percentage
-    df['rent_burden'] = df.apply(
-        lambda row: (row['valor-mensal-renda'] / (row['rendimento_numerical'] / 12)) * 100 
-        if pd.notna(row['valor-mensal-renda']) and pd.notna(row['rendimento_numerical']) and row['rendimento_numerical'] > 0 
-        else np.nan, 
-        axis=1
-    )
-
-    df['rent_burden'] = df['rent_burden'].apply(categorize_rent_percentage)
-    
-    # Create house type and typology columns
-    df['house_type'] = df['tipo-casa_primary'].map({
-        'apartamento': 'Apartment',
-        'moradia': 'House'
-    })
-    
-    # Clean typology
-    df['bedroom_count'] = df['tipologia_primary'].map({
-        'T0': '0',
-        'T1': '1',
-        'T2': '2',
-        'T3': '3',
-        'T4+': '4+'
-    })
-    
-    # Process dissatisfaction reasons
-    dissatisfaction_reasons = [
-        'pago-demasiado', 'falta-espaco', 'habitacao-mau-estado', 
-        'vivo-longe', 'quero-independecia', 'dificuldades-financeiras',
-        'financeiramente-dependente', 'vivo-longe-de-transportes',
-        'vivo-zona-insegura', 'partilho-casa-com-desconhecidos'
-    ]
-    
-    for reason in dissatisfaction_reasons:
-        df[f'reason_{reason}'] = df['insatisfacao-motivos'].apply(
-            lambda x: 1 if isinstance(x, list) and reason in x else 0
-        )
-    
-    # Clean professional situation
-    df['employment_status'] = df['situacao-profissional_primary'].map({
-        'empregado-tempo-inteiro': 'Full-time',
-        'empregado-tempo-parcial': 'Part-time',
-        'independente': 'Self-employed',
-        'desempregado': 'Unemployed',
-        'estudante': 'Student',
-        'reformado': 'Retired'
-    })
-    
-    # Clean education levels
-    df['education_level'] = df['educacao'].map({
-        'licenciatura': "Bachelor's",
-        'mestrado': "Master's",
-        'doutoramento': 'PhD',
-        'secundario': 'High School',
-        'profissional': 'Vocational',
-        'basico': 'Basic'
-    })
+# Set file path for data loading
+file_path = data_path()
 
-    df['distrito'] = df['distrito'].str.capitalize()
-    
-    return df
+# Load the data from root folder. The watcher keeps serving the current version while a
+# changed data.csv is processed in the background, then swaps the new one in.
+try:
+    dataset = dataset_watcher(file_path).dataset()
+except Exception as e:
+    st.error(f"Error loading file: {e}")
+    dataset = DatasetHandle(pd.DataFrame(), "unavailable")  # Empty dataset if loading fails
 
-# Set file path for data loading
-file_path = os.getcwd() + "/data.csv"
+# The dataset is held once per server process; each run gets a view of it, so whatever a
+# tab does to its frame stays within that run
+df = dataset.view()
 
-# Load the data from root folder
-df = load_data(file_path)
+# Column metadata and the long-format strategy table, built once per dataset version
+# and shared by the tabs. Every cache is keyed on the version token, never on the frame.
+dataset_schema(df, dataset.version)
+strategy_table(df, dataset.version)
 
 # Create dashboard title and introduction
 st.image("design docs/dssg_icon_header.svg",width=250)
 
-# Create tabs for different insights
-tab0, tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    "Visão Geral",
-    "Situações Habitacionais", 
-    "Análise Geográfica", 
-    "Níveis de Satisfação", 
-    "Rendimento vs Custos de Habitação",
-    "Educação e Emprego",
-    "Tipos e Tamanhos de Habitação",
-    "Análise Exploratória de Dados"
-])
-
-with tab0:
-    show_visao_geral_tab(df)
-
-with tab1:
-    show_housing_distribution_tab(df)
-
-with tab2:
-    show_geographic_analysis_tab(df)
-
-with tab3:
-    show_satisfaction_levels_tab(df)
-
-with tab4:
-    show_income_housing_costs_tab(df)
-    
-with tab5:
-    show_education_employment_tab(df)
+# Create tabs for different insights. Switching tabs reruns the app and only the open
+# tab is rendered, so a session never pays for tabs it does not look at.
+tab_containers = st.tabs([label for label, _, _ in DASHBOARD_TABS], key="main_tabs", on_change="rerun")
 
-with tab6:
-    show_housing_types_sizes_tab(df)
-    
-with tab7:
-    show_exploratory_analysis_tab(df)
\ No newline at end of file
+for tab, (_, module_name, function_name) in zip(tab_containers, DASHBOARD_TABS):
+    if tab.open:
+        with tab:
+            show_tab = getattr(importlib.import_module(module_name), function_name)
+            show_tab(df)
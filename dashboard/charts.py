@@ -0,0 +1,255 @@
+# charts.py
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from config import (
+    COLOR_SCALES,
+    DENSITY_BINS,
+    HOVER_DETAIL_MAX_POINTS,
+    WEBGL_POINT_THRESHOLD,
+)
+
+
+def scatter(data_frame, x, y, hover_data=None, **kwargs):
+    """
+    Build a scatter plot, switching to WebGL rendering above a point threshold.
+
+    Wraps px.scatter. Above WEBGL_POINT_THRESHOLD points the traces are drawn as
+    Scattergl; above HOVER_DETAIL_MAX_POINTS the extra hover columns are dropped, so
+    the figure no longer ships one customdata row per point and hover only shows x/y.
+
+    Parameters:
+    data_frame (DataFrame): Data to plot
+    x (str): Column for the x axis
+    y (str): Column for the y axis
+    hover_data (list): Extra columns shown on hover for small datasets
+    **kwargs: Any other px.scatter argument (color, size, labels, title, ...)
+
+    Returns:
+    Figure: The Plotly figure
+    """
+    n_points = len(data_frame)
+    kwargs.setdefault(
+        "render_mode", "webgl" if n_points > WEBGL_POINT_THRESHOLD else "svg"
+    )
+
+    if n_points > HOVER_DETAIL_MAX_POINTS:
+        hover_data = None
+        kwargs.pop("hover_name", None)
+
+    fig = px.scatter(data_frame, x=x, y=y, hover_data=hover_data, **kwargs)
+
+    if n_points > HOVER_DETAIL_MAX_POINTS:
+        fig.update_traces(hovertemplate="%{x}<br>%{y}<extra></extra>")
+    return fig
+
+
+def density_heatmap(
+    data_frame, x, y, bins=DENSITY_BINS, x_range=None, y_range=None, title=None, labels=None
+):
+    """
+    Bin a scatter server-side into a 2D histogram and draw it as a heatmap.
+
+    Only the bins×bins grid is sent to the browser, so the payload does not depend on
+    the number of rows. An invisible trace on the bin centres makes the chart
+    box-selectable, which show_zoomable_density uses to zoom.
+
+    Parameters:
+    data_frame (DataFrame): Data to plot
+    x (str): Numeric column for the x axis
+    y (str): Numeric column for the y axis
+    bins (int): Number of bins per axis
+    x_range (tuple): Optional (min, max) window on the x axis
+    y_range (tuple): Optional (min, max) window on the y axis
+    title (str): Chart title
+    labels (dict): Optional axis labels keyed by column name
+
+    Returns:
+    Figure: The Plotly figure
+    """
+    labels = labels or {}
+    x_values = pd.to_numeric(data_frame[x], errors="coerce").to_numpy(dtype=float)
+    y_values = pd.to_numeric(data_frame[y], errors="coerce").to_numpy(dtype=float)
+
+    mask = np.isfinite(x_values) & np.isfinite(y_values)
+    if x_range is not None:
+        mask &= (x_values >= x_range[0]) & (x_values <= x_range[1])
+    if y_range is not None:
+        mask &= (y_values >= y_range[0]) & (y_values <= y_range[1])
+    x_values, y_values = x_values[mask], y_values[mask]
+
+    fig = go.Figure()
+    if len(x_values):
+        hist_range = [
+            list(x_range) if x_range is not None else [x_values.min(), x_values.max()],
+            list(y_range) if y_range is not None else [y_values.min(), y_values.max()],
+        ]
+        # Degenerate ranges (single value) would make histogram2d fail
+        for axis_range in hist_range:
+            if axis_range[0] == axis_range[1]:
+                axis_range[0] -= 0.5
+                axis_range[1] += 0.5
+
+        counts, x_edges, y_edges = np.histogram2d(
+            x_values, y_values, bins=bins, range=hist_range
+        )
+        x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+        y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+        z = np.where(counts.T > 0, counts.T, np.nan)
+
+        fig.add_trace(
+            go.Heatmap(
+                x=x_centers,
+                y=y_centers,
+                z=z,
+                colorscale=COLOR_SCALES["sequential"],
+                hoverongaps=False,
+                colorbar=dict(title="Contagem"),
+                hovertemplate=(
+                    f"{labels.get(x, x)}: %{{x:.4g}}<br>"
+                    f"{labels.get(y, y)}: %{{y:.4g}}<br>"
+                    "Contagem: %{z:.0f}<extra></extra>"
+                ),
+            )
+        )
+        grid_x, grid_y = np.meshgrid(x_centers, y_centers)
+        fig.add_trace(
+            go.Scatter(
+                x=grid_x.ravel(),
+                y=grid_y.ravel(),
+                mode="markers",
+                marker=dict(opacity=0),
+                hoverinfo="skip",
+                showlegend=False,
+            )
+        )
+
+    fig.update_layout(
+        title=title or f"Densidade de {labels.get(y, y)} vs {labels.get(x, x)}",
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+        dragmode="select",
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    if y_range is not None:
+        fig.update_yaxes(range=list(y_range))
+    return fig
+
+
+def density_zoom(key):
+    """
+    Return the (x_range, y_range) zoom window stored for a density chart.
+
+    Parameters:
+    key (str): Unique key of the density chart
+    """
+    return st.session_state.get(f"{key}_zoom") or (None, None)
+
+
+def show_zoomable_density(fig, key):
+    """
+    Display a density heatmap and re-bin it on the window selected with box select.
+
+    The selected window is stored in the session state, so the next run bins only the
+    points inside it at full resolution.
+
+    Parameters:
+    fig (Figure): Figure returned by density_heatmap
+    key (str): Unique key of the density chart
+    """
+    zoom_key = f"{key}_zoom"
+    depth = st.session_state.get(f"{key}_zoom_depth", 0)
+
+    # A new chart key per zoom level, so the previous selection does not re-apply
+    event = st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="box",
+        key=f"{key}_chart_{depth}",
+    )
+
+    boxes = event.selection.get("box", []) if event else []
+    if boxes:
+        box = boxes[0]
+        st.session_state[zoom_key] = (
+            (min(box["x"]), max(box["x"])),
+            (min(box["y"]), max(box["y"])),
+        )
+        st.session_state[f"{key}_zoom_depth"] = depth + 1
+        st.rerun()
+
+    if st.session_state.get(zoom_key) is not None:
+        if st.button("Repor zoom", key=f"{key}_reset_zoom"):
+            st.session_state[zoom_key] = None
+            st.session_state[f"{key}_zoom_depth"] = depth + 1
+            st.rerun()
+    else:
+        st.caption("Selecione uma área no gráfico para ampliar e recalcular a densidade.")
+
+
+def box_from_summary(
+    summary,
+    title=None,
+    x_title=None,
+    y_title=None,
+    color_map=None,
+    color_sequence=None,
+    category_order=None,
+    notched=False,
+):
+    """
+    Draw precomputed box statistics (see analytics.box_stats.box_summary).
+
+    One trace per group, as px.box does with color set to the grouping column, but the
+    browser only receives the quartiles, fences and the capped outlier sample.
+
+    Parameters:
+    summary (DataFrame): Output of box_summary, indexed by group
+    title (str): Chart title
+    x_title (str): Title of the group axis
+    y_title (str): Title of the value axis
+    color_map (dict): Optional colour per group
+    color_sequence (list): Colours cycled over the groups when color_map is not given
+    category_order (list): Optional order of the groups
+    notched (bool): Draw notches around the median
+
+    Returns:
+    Figure: The Plotly figure
+    """
+    if category_order is not None:
+        summary = summary.reindex([g for g in category_order if g in summary.index])
+    color_sequence = color_sequence or COLOR_SCALES["qualitative"]
+
+    fig = go.Figure()
+    for i, (group, row) in enumerate(summary.iterrows()):
+        color = (color_map or {}).get(group, color_sequence[i % len(color_sequence)])
+        fig.add_trace(
+            go.Box(
+                name=str(group),
+                x=[group],
+                q1=[row["q1"]],
+                median=[row["median"]],
+                q3=[row["q3"]],
+                mean=[row["mean"]],
+                lowerfence=[row["lowerfence"]],
+                upperfence=[row["upperfence"]],
+                notchspan=[row["notchspan"]],
+                notched=notched,
+                y=[row["outliers"]],
+                boxpoints="outliers",
+                marker_color=color,
+                hoverinfo="y",
+            )
+        )
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        showlegend=True,
+    )
+    return fig
@@ -94,4 +94,29 @@ VISUALIZATION_COLORS = {
     "choropleth": "Greens",  # Green sequential colorscale
     "density": "Viridis",  # Default density colorscale
     "correlation": "RdBu",  # Red-Blue diverging colorscale
-}
\ No newline at end of file
+}
+# Rendering thresholds for scatter plots (number of points)
+WEBGL_POINT_THRESHOLD = 1000  # above this, scatters are drawn with WebGL (Scattergl)
+HOVER_DETAIL_MAX_POINTS = 5000  # above this, hover shows only x/y instead of hover_data
+DENSITY_POINT_THRESHOLD = 50000  # above this, scatters default to the binned density mode
+DENSITY_BINS = 60  # bins per axis of the binned density mode
+
+# Paginated data grid
+DATA_GRID_PAGE_SIZES = [25, 50, 100, 250]  # rows per page offered in the data grid
+DATA_GRID_DEFAULT_COLUMNS = 12  # columns shown by default before the user picks a projection
+
+# Data refresh
+DATA_WATCH_INTERVAL = 5  # seconds between checks of data.csv and the GeoJSON for changes (0 disables)
+
+# Dashboard tabs: (label, module, render function). Each tab module, and the plotting and
+# mapping libraries it imports, is only loaded the first time that tab is opened.
+DASHBOARD_TABS = [
+    ("Visão Geral", "tabs.tab0_general_overview", "show_visao_geral_tab"),
+    ("Situações Habitacionais", "tabs.tab1_housing_distribution", "show_housing_distribution_tab"),
+    ("Análise Geográfica", "tabs.tab2_geographic_analysis", "show_geographic_analysis_tab"),
+    ("Níveis de Satisfação", "tabs.tab3_satisfaction_levels", "show_satisfaction_levels_tab"),
+    ("Rendimento vs Custos de Habitação", "tabs.tab4_income_housing_costs", "show_income_housing_costs_tab"),
+    ("Educação e Emprego", "tabs.tab5_education_employment", "show_education_employment_tab"),
+    ("Tipos e Tamanhos de Habitação", "tabs.tab6_housing_types_sizes", "show_housing_types_sizes_tab"),
+    ("Análise Exploratória de Dados", "tabs.tab7_exploratory_analysis", "show_exploratory_analysis_tab"),
+]
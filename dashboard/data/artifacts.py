@@ -0,0 +1,209 @@
+# artifacts.py
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+# Persistent cache folder, relative to the folder the app is started from (like data.csv)
+ARTIFACT_DIR = os.environ.get("HABITACAO_CACHE_DIR", ".cache")
+MANIFEST_FILE = "manifest.json"
+
+
+class ArtifactStore:
+    """
+    On-disk store of dataset-dependent artifacts, one folder per version token.
+
+    The warm-up build step (warmup.py) opens the store writable and fills it; the app
+    only reads from it, so a deployment without a warmed store behaves exactly as
+    before and computes everything in memory. Files are written to a temporary name
+    and renamed, so a reader never sees a partially written artifact.
+
+    Parameters:
+    root (str): Folder of the store
+    writable (bool): Whether artifacts built on a miss are saved
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, writable=False):
+        self.root = Path(root)
+        self.writable = writable
+
+    def version_dir(self, version):
+        return self.root / version
+
+    def path(self, version, name):
+        return self.version_dir(version) / name
+
+    def exists(self, version, name):
+        return self.path(version, name).is_file()
+
+    def write_bytes(self, version, name, write):
+        """
+        Atomically create an artifact file.
+
+        Parameters:
+        version (str): Version token
+        name (str): File name within the version folder
+        write (callable): Function writing the content to a binary file object
+        """
+        folder = self.version_dir(version)
+        folder.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, folder / name)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return folder / name
+
+    def load(self, version, name):
+        """Unpickle an artifact; None when it is missing or unreadable."""
+        try:
+            with open(self.path(version, name), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def save(self, version, name, value):
+        """Pickle an artifact (atomically)."""
+        return self.write_bytes(
+            version, name, lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+    def write_manifest(self, version):
+        """
+        Record the size and SHA-256 of every artifact of a version in manifest.json.
+
+        Returns:
+        dict: The manifest
+        """
+        folder = self.version_dir(version)
+        files = {
+            path.name: {"bytes": path.stat().st_size, "sha256": _file_digest(path)}
+            for path in sorted(folder.iterdir())
+            if path.is_file() and path.name != MANIFEST_FILE and not path.name.startswith(".tmp-")
+        }
+        manifest = {"version": version, "files": files}
+        content = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        self.write_bytes(version, MANIFEST_FILE, lambda f: f.write(content))
+        return manifest
+
+    def verify(self, version):
+        """
+        Check every artifact of a version against its manifest.
+
+        Returns:
+        list: Problems found (empty when the version is complete and intact)
+        """
+        try:
+            manifest = json.loads(self.path(version, MANIFEST_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return [f"{version}: missing or unreadable {MANIFEST_FILE}"]
+
+        problems = []
+        for name, entry in manifest["files"].items():
+            path = self.path(version, name)
+            if not path.is_file():
+                problems.append(f"{version}/{name}: missing")
+            elif _file_digest(path) != entry["sha256"]:
+                problems.append(f"{version}/{name}: checksum mismatch")
+            elif name.endswith(".pkl") and self.load(version, name) is None:
+                problems.append(f"{version}/{name}: cannot be loaded")
+        return problems
+
+    def prune(self, keep_versions):
+        """Delete the folders of every version not in keep_versions; returns the deleted versions."""
+        if not self.root.is_dir():
+            return []
+        removed = []
+        for folder in self.root.iterdir():
+            if folder.is_dir() and folder.name not in keep_versions:
+                shutil.rmtree(folder)
+                removed.append(folder.name)
+        return removed
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_store = ArtifactStore()
+
+
+def artifact_store():
+    """Return the artifact store used by this process."""
+    return _store
+
+
+def set_artifact_store(store):
+    """Replace the artifact store used by this process (the warm-up opens it writable)."""
+    global _store
+    _store = store
+
+
+def artifact_name(name, params=None):
+    """File name of an artifact: its name plus a digest of its parameters."""
+    params_key = json.dumps(params or {}, sort_keys=True, default=str)
+    return f"{name}-{hashlib.sha1(params_key.encode('utf-8')).hexdigest()[:16]}.pkl"
+
+
+def cached_artifact(name, version, build, params=None):
+    """
+    Return an artifact from the store, building it on a miss.
+
+    The result is saved only when the store is writable.
+
+    Parameters:
+    name (str): Artifact name (e.g. "reason_stats")
+    version (str): Version token of the source the artifact is built from
+    build (callable): Zero-argument function returning the artifact
+    params (dict): Parameters the artifact depends on
+    """
+    store = artifact_store()
+    file_name = artifact_name(name, params)
+    value = store.load(version, file_name)
+    if value is None:
+        value = build()
+        if store.writable:
+            store.save(version, file_name, value)
+    return value
+
+
+def persistent(name):
+    """
+    Look the result of a dataset computation up in the artifact store first.
+
+    For functions called as f(_df, dataset_version, **params); the artifact is keyed
+    on the version token and the bound parameter values, defaults included. Stack it
+    under st.cache_data (or call it from a st.cache_resource function), so the store
+    is only read on an in-memory miss.
+
+    Parameters:
+    name (str): Artifact name
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(_df, dataset_version, *args, **kwargs):
+            bound = signature.bind(_df, dataset_version, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(list(bound.arguments.items())[2:])
+            return cached_artifact(
+                name, dataset_version, lambda: func(_df, dataset_version, *args, **kwargs), params
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,79 @@
+# districts.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data.geo import GEOJSON_FILE, district_geojson
+from data.loader import DISTRICTS, PARTITION_COLUMN, district_key
+
+
+@st.cache_resource(show_spinner=False)
+def district_table(geojson_file=GEOJSON_FILE):
+    """
+    The district dimension: one row per district_id, built once per server process.
+
+    Survey rows carry the district_id column and GeoJSON features a district_id
+    property, so joins between data and geometry and district lookups are integer
+    operations instead of name normalizations on every rerun. The returned frame is
+    shared and must not be modified.
+
+    Parameters:
+    geojson_file (str): Path to the district GeoJSON
+
+    Returns:
+    DataFrame: Indexed by district_id, with name (as in the distrito column), key (ASCII
+    lowercase name), feature_index (position of the GeoJSON feature, <NA> when the file
+    has no boundary for it) and zone (continente, madeira or acores)
+    """
+    feature_index = {
+        feature["properties"]["district_id"]: position
+        for position, feature in enumerate(district_geojson(geojson_file)["features"])
+    }
+    return pd.DataFrame(
+        {
+            "name": [name for name, _ in DISTRICTS.values()],
+            "key": [district_key(name) for name, _ in DISTRICTS.values()],
+            "feature_index": pd.array([feature_index.get(district_id) for district_id in DISTRICTS], dtype="Int64"),
+            "zone": [zone for _, zone in DISTRICTS.values()],
+        },
+        index=pd.Index(list(DISTRICTS), name="district_id"),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def district_index(_df, dataset_version):
+    """
+    Row positions of every district, built once per dataset version and shared by every session.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+
+    Returns:
+    dict: distrito value -> read-only array of row positions, in row order
+    """
+    if PARTITION_COLUMN not in _df.columns:
+        return {}
+    index = _df.groupby(PARTITION_COLUMN, sort=False).indices
+    for positions in index.values():
+        positions.flags.writeable = False
+    return index
+
+
+def district_rows(df, dataset_version, district):
+    """
+    The respondents of one district, sliced from the data in memory.
+
+    The rows are looked up in district_index instead of comparing every distrito
+    value, so the cost is proportional to the district's size.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    district (str): distrito value
+
+    Returns:
+    DataFrame: The district's rows, in their original order (empty for an unknown district)
+    """
+    positions = district_index(df, dataset_version).get(district, np.empty(0, dtype=np.intp))
+    return df.iloc[positions]
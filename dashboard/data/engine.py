@@ -0,0 +1,410 @@
+# engine.py
+import importlib.util
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data.artifacts import artifact_store
+from data.districts import district_index
+from data.loader import PARTITION_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# Engine running the filtered and grouped queries: "pandas" (default), "duckdb" or "polars"
+QUERY_ENGINE = os.environ.get("HABITACAO_QUERY_ENGINE", "pandas")
+# Worker threads of the DuckDB engine (all cores by default)
+DUCKDB_THREADS = int(os.environ.get("HABITACAO_DUCKDB_THREADS", os.cpu_count() or 1))
+# DuckDB database of a dataset version in the artifact store, built by the warm-up
+DUCKDB_FILE = "survey.duckdb"
+# Table holding the processed survey, and its column of row positions in the DataFrame
+SURVEY_TABLE = "survey"
+POSITION_COLUMN = "_position"
+
+AGGREGATIONS = ("count", "mean", "sum", "median", "min", "max")
+
+
+def duckdb_available():
+    """Whether the optional duckdb package is installed."""
+    return importlib.util.find_spec("duckdb") is not None
+
+
+def polars_available():
+    """Whether the optional polars package is installed."""
+    return importlib.util.find_spec("polars") is not None
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+class PandasEngine:
+    """
+    Filtered subsets, group aggregates and crosstabs of the processed data, in pandas.
+
+    This is the default engine; DuckDBEngine and PolarsEngine answer the same queries
+    with the same results. Groups come back in the same order in every engine:
+    categorical columns in their category order, other values sorted, and counts by
+    count (descending) with ties in group order.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    """
+
+    name = "pandas"
+
+    def __init__(self, df, dataset_version):
+        self.df = df
+        self.categories = category_dtypes(df)
+        # Row positions of every district, so a district filter only looks at its rows
+        self.district_positions = district_index(df, dataset_version)
+
+    def _positions(self, filters):
+        district_filters = [selected for column, selected in filters if column == PARTITION_COLUMN]
+        if district_filters:
+            positions = self.district_positions.get(district_filters[0], np.empty(0, dtype=np.intp))
+        else:
+            positions = np.arange(len(self.df))
+        for column, selected in filters:
+            if column == PARTITION_COLUMN and selected == district_filters[0]:
+                continue
+            matches = self.df[column].iloc[positions] == selected
+            positions = positions[matches.to_numpy(dtype=bool, na_value=False)]
+        return positions
+
+    def _rows(self, filters):
+        return self.df.iloc[self._positions(filters)] if filters else self.df
+
+    def filtered_positions(self, filters=(), sort_by=None, ascending=True):
+        """
+        Row positions of the filtered view, optionally sorted by one column.
+
+        Parameters:
+        filters (tuple): (column, value) pairs; rows must match all of them
+        sort_by (str): Optional column to sort by (missing values last, ties in row order)
+        ascending (bool): Sort direction
+
+        Returns:
+        ndarray: Integer positions into the DataFrame
+        """
+        positions = self._positions(filters)
+        if sort_by is not None:
+            keys = pd.Series(self.df[sort_by].to_numpy()[positions])
+            order = keys.sort_values(ascending=ascending, na_position="last", kind="stable").index
+            positions = positions[order.to_numpy()]
+        return positions
+
+    def group_aggregate(self, by, value=None, agg="count", filters=()):
+        """
+        Aggregate a column per group of another (rows with a missing group are left out).
+
+        Parameters:
+        by (str): Grouping column
+        value (str): Aggregated column (not needed to count rows)
+        agg (str): One of AGGREGATIONS
+        filters (tuple): (column, value) pairs; rows must match all of them
+
+        Returns:
+        DataFrame: [by, value or "count"], sorted by group (by count, descending, to count rows)
+        """
+        data = self._rows(filters)
+        if agg == "count":
+            counts = data[by].value_counts()
+            counts = counts[counts > 0]  # Categorical columns also list their unobserved categories
+            result = pd.DataFrame({by: counts.index.to_numpy(), "count": counts.to_numpy()})
+        else:
+            result = data.groupby(by, observed=True)[value].agg(agg).reset_index()
+        return sort_groups(result, by, self.categories, counts=agg == "count")
+
+    def crosstab(self, index, columns, filters=()):
+        """
+        Respondent counts per (index, columns) pair of values (rows with a missing value are left out).
+
+        Parameters:
+        index (str): Column whose values are the rows
+        columns (str): Column whose values are the columns
+        filters (tuple): (column, value) pairs; rows must match all of them
+
+        Returns:
+        DataFrame: Counts with the index values as rows and the columns values as columns
+        """
+        data = self._rows(filters)
+        return sort_crosstab(pd.crosstab(data[index], data[columns]), self.categories)
+
+
+class DuckDBEngine:
+    """
+    The PandasEngine queries, answered by an embedded DuckDB database.
+
+    The processed survey is held in a local DuckDB table (no server) and every query is
+    SQL run on all DUCKDB_THREADS cores, with its result fetched as Arrow. When the
+    warm-up built the database file of the dataset version (DUCKDB_FILE in the artifact
+    store) it is opened read-only and the table is paged from disk; otherwise it is
+    copied into an in-memory database. The engine keeps no reference to the pandas frame.
+
+    Only the exploratory analysis tab queries the engine. The app still loads the
+    processed dataset in pandas for every other tab, so the dataset must fit in memory
+    whichever engine is configured.
+
+    Each query runs on its own cursor, so sessions can query concurrently.
+
+    Parameters:
+    df (DataFrame): The full processed housing data, copied into the in-memory database
+    database (str): Database file to open read-only (None for an in-memory database)
+    threads (int): DuckDB worker threads
+    """
+
+    name = "duckdb"
+
+    def __init__(self, df, database=None, threads=DUCKDB_THREADS):
+        import duckdb
+
+        config = {"threads": threads}
+        if database is not None:
+            self.connection = duckdb.connect(str(database), read_only=True, config=config)
+        else:
+            self.connection = duckdb.connect(config=config)
+            load_survey_table(self.connection, df)
+        self.categories = category_dtypes(df)
+        self._lock = threading.Lock()
+
+    def query(self, sql, params=None):
+        """
+        Run a SQL query against the survey table.
+
+        Returns:
+        pyarrow.Table: The result
+        """
+        with self._lock:
+            cursor = self.connection.cursor()
+        try:
+            return cursor.execute(sql, params or []).fetch_arrow_table()
+        finally:
+            cursor.close()
+
+    def _where(self, filters, not_null=()):
+        conditions = [f"{_quote(column)} = ?" for column, _ in filters]
+        conditions += [f"{_quote(column)} IS NOT NULL" for column in not_null]
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, [selected for _, selected in filters]
+
+    def filtered_positions(self, filters=(), sort_by=None, ascending=True):
+        where, params = self._where(filters)
+        order = POSITION_COLUMN
+        if sort_by is not None:
+            direction = "ASC" if ascending else "DESC"
+            order = f"{_quote(sort_by)} {direction} NULLS LAST, {POSITION_COLUMN}"
+        result = self.query(f"SELECT {POSITION_COLUMN} FROM {SURVEY_TABLE}{where} ORDER BY {order}", params)
+        return result.column(POSITION_COLUMN).to_numpy().astype(np.intp)
+
+    def group_aggregate(self, by, value=None, agg="count", filters=()):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {agg}")
+        where, params = self._where(filters, not_null=(by,))
+        key = _quote(by)
+        if agg == "count":
+            sql = f"SELECT {key}, count(*) AS count FROM {SURVEY_TABLE}{where} GROUP BY {key}"
+        else:
+            expression = {
+                "mean": "avg({})",
+                "sum": "coalesce(sum({}), 0)",
+                "median": "quantile_cont({}, 0.5)",
+                "min": "min({})",
+                "max": "max({})",
+            }[agg].format(_quote(value))
+            sql = f"SELECT {key}, {expression} AS {_quote(value)} FROM {SURVEY_TABLE}{where} GROUP BY {key}"
+        return sort_groups(self.query(sql, params).to_pandas(), by, self.categories, counts=agg == "count")
+
+    def crosstab(self, index, columns, filters=()):
+        where, params = self._where(filters, not_null=(index, columns))
+        keys = f"{_quote(index)}, {_quote(columns)}"
+        counts = self.query(
+            f"SELECT {keys}, count(*) AS count FROM {SURVEY_TABLE}{where} GROUP BY {keys}", params
+        ).to_pandas()
+        return _pivot_counts(counts, index, columns, self.categories)
+
+
+class PolarsEngine(PandasEngine):
+    """
+    The PandasEngine queries, answered by Polars lazy queries.
+
+    The processed survey is held as one Arrow-backed Polars frame. Every query is a lazy
+    plan that reads only the columns it needs (projection pushdown), runs on all cores,
+    and is converted to pandas only for the result, at the plotting boundary.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    """
+
+    name = "polars"
+
+    def __init__(self, df, dataset_version):
+        import polars as pl
+
+        super().__init__(df, dataset_version)
+        self.frame = pl.from_arrow(survey_arrow_table(df)).lazy()
+
+    def _filtered(self, filters, not_null=()):
+        import polars as pl
+
+        frame = self.frame
+        for column, selected in filters:
+            frame = frame.filter(pl.col(column) == selected)
+        for column in not_null:
+            frame = frame.filter(pl.col(column).is_not_null())
+        return frame
+
+    def filtered_positions(self, filters=(), sort_by=None, ascending=True):
+        frame = self._filtered(filters)
+        if sort_by is not None:
+            frame = frame.sort([sort_by, POSITION_COLUMN], descending=[not ascending, False], nulls_last=True)
+        positions = frame.select(POSITION_COLUMN).collect().get_column(POSITION_COLUMN)
+        return positions.to_numpy().astype(np.intp)
+
+    def group_aggregate(self, by, value=None, agg="count", filters=()):
+        import polars as pl
+
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {agg}")
+        frame = self._filtered(filters, not_null=(by,))
+        if agg == "count":
+            result = frame.group_by(by).agg(pl.len().alias("count"))
+        else:
+            result = frame.group_by(by).agg(getattr(pl.col(value), agg)())
+        return sort_groups(result.collect().to_pandas(), by, self.categories, counts=agg == "count")
+
+    def crosstab(self, index, columns, filters=()):
+        import polars as pl
+
+        counts = (
+            self._filtered(filters, not_null=(index, columns))
+            .group_by([index, columns])
+            .agg(pl.len().alias("count"))
+            .collect()
+            .to_pandas()
+        )
+        return _pivot_counts(counts, index, columns, self.categories)
+
+
+def category_dtypes(df):
+    """The categorical dtypes of the processed data, whose category order query results keep."""
+    return {column: dtype for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+
+
+def _group_keys(keys, categories):
+    """Group values with the pandas dtype of their column, so they sort in category order."""
+    dtype = categories.get(keys.name)
+    return keys.astype(dtype) if dtype is not None else keys
+
+
+def sort_groups(result, by, categories, counts=False):
+    """
+    Put grouped rows in the engine-independent order.
+
+    Parameters:
+    result (DataFrame): One row per group, with the group values in column by
+    by (str): Grouping column
+    categories (dict): Categorical dtypes of the processed data (category_dtypes)
+    counts (bool): Sort by the "count" column first (descending)
+
+    Returns:
+    DataFrame: The rows in group order (by count, then group order, for counts)
+    """
+    result[by] = _group_keys(result[by], categories)
+    keys, ascending = (["count", by], [False, True]) if counts else ([by], [True])
+    return result.sort_values(keys, ascending=ascending, kind="stable").reset_index(drop=True)
+
+
+def sort_group_index(result, categories):
+    """Rows indexed by group values in group order (see sort_groups)."""
+    result.index = _group_keys(result.index.to_series(), categories).rename(result.index.name)
+    return result.sort_index()
+
+
+def sort_crosstab(table, categories):
+    """A crosstab with its rows and columns in group order (see sort_groups)."""
+    table = sort_group_index(table, categories)
+    return sort_group_index(table.T, categories).T
+
+
+def _pivot_counts(counts, index, columns, categories):
+    """Counts in long format ([index, columns, "count"]) as a crosstab."""
+    table = counts.pivot(index=index, columns=columns, values="count").fillna(0).astype(int)
+    return sort_crosstab(table, categories)
+
+
+def survey_arrow_table(df):
+    """The processed data as an Arrow table, with the row position of every respondent."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return table.append_column(POSITION_COLUMN, pa.array(np.arange(len(df), dtype=np.int64)))
+
+
+def load_survey_table(connection, df):
+    """Create the survey table of a DuckDB connection from the processed data."""
+    connection.register("survey_frame", survey_arrow_table(df))
+    connection.execute(f"CREATE OR REPLACE TABLE {SURVEY_TABLE} AS SELECT * FROM survey_frame")
+    connection.unregister("survey_frame")
+
+
+def write_database(df, store, version):
+    """
+    Build the DuckDB database file of a dataset version in the artifact store.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    store (ArtifactStore): Store to write to
+    version (str): Version token of the dataset
+    """
+    import duckdb
+
+    path = store.path(version, DUCKDB_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".tmp-{DUCKDB_FILE}")
+    tmp_path.unlink(missing_ok=True)
+    with duckdb.connect(str(tmp_path)) as connection:
+        load_survey_table(connection, df)
+    os.replace(tmp_path, path)
+    return path
+
+
+def create_engine(df, dataset_version, engine=QUERY_ENGINE):
+    """
+    Create the query engine for a dataset version.
+
+    DuckDB or Polars is used when it is the configured engine and its package is
+    installed; otherwise the pandas engine is.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    engine (str): "pandas", "duckdb" or "polars"
+    """
+    if engine == "duckdb":
+        if duckdb_available():
+            database = artifact_store().path(dataset_version, DUCKDB_FILE)
+            return DuckDBEngine(df, database if database.is_file() else None)
+        logger.warning("The duckdb package is not installed; using the pandas query engine")
+    elif engine == "polars":
+        if polars_available():
+            return PolarsEngine(df, dataset_version)
+        logger.warning("The polars package is not installed; using the pandas query engine")
+    return PandasEngine(df, dataset_version)
+
+
+@st.cache_resource(show_spinner=False)
+def query_engine(_df, dataset_version):
+    """
+    The query engine of a dataset version, shared by every session.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    """
+    return create_engine(_df, dataset_version)
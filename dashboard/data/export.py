@@ -0,0 +1,148 @@
+# export.py
+import csv
+import importlib.util
+import os
+import tempfile
+
+import pandas as pd
+
+from data.schema import encode_multi_label
+
+# Rows converted and written at a time
+EXPORT_CHUNK_ROWS = 10000
+# Worksheet limit of the xlsx format, header row included
+EXCEL_MAX_ROWS = 1048576
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+    "Excel": {
+        "extension": "xlsx",
+        "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    },
+}
+
+
+def available_formats():
+    """Export formats whose writer is installed; Excel needs the optional openpyxl package."""
+    formats = ["CSV", "Parquet"]
+    if importlib.util.find_spec("openpyxl") is not None:
+        formats.append("Excel")
+    return formats
+
+
+def _prepare_chunk(chunk):
+    """Encode multi-label lists as text and other non-numeric values as strings."""
+    chunk = chunk.apply(encode_multi_label)
+    for col in chunk.columns:
+        if not pd.api.types.is_numeric_dtype(chunk[col]):
+            chunk[col] = chunk[col].map(lambda v: v if isinstance(v, str) or pd.isna(v) else str(v))
+    return chunk
+
+
+def iter_chunks(df, positions, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Yield the rows at the given positions in prepared chunks.
+
+    Only one chunk is copied and converted at a time, so an export never holds a second
+    full copy of the data in memory.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    positions (ndarray): Row positions to export, in order
+    chunk_rows (int): Rows per chunk
+    """
+    for start in range(0, len(positions), chunk_rows):
+        yield _prepare_chunk(df.iloc[positions[start : start + chunk_rows]])
+
+
+def _write_csv(df, positions, out):
+    header = True
+    for chunk in iter_chunks(df, positions):
+        out.write(chunk.to_csv(index=False, header=header, quoting=csv.QUOTE_MINIMAL).encode("utf-8"))
+        header = False
+
+
+def _arrow_schema(df):
+    import pyarrow as pa
+
+    fields = []
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            fields.append(pa.field(col, pa.bool_()))
+        elif pd.api.types.is_numeric_dtype(dtype):
+            # Nullable extension dtypes are written as their numpy equivalent
+            fields.append(pa.field(col, pa.from_numpy_dtype(getattr(dtype, "numpy_dtype", dtype))))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    return pa.schema(fields)
+
+
+def _write_parquet(df, positions, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # A fixed schema keeps every chunk (row group) consistent, even when a column is
+    # entirely missing within a chunk
+    schema = _arrow_schema(df)
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_chunks(df, positions):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _write_excel(df, positions, out):
+    from openpyxl import Workbook
+
+    # Write-only workbooks stream rows to the file instead of keeping the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("dados")
+    sheet.append(list(df.columns))
+    for chunk in iter_chunks(df, positions[: EXCEL_MAX_ROWS - 1]):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(out)
+
+
+WRITERS = {"CSV": _write_csv, "Parquet": _write_parquet, "Excel": _write_excel}
+
+
+def write_rows(df, positions, file_format, out):
+    """
+    Write the rows at the given positions to a binary file object in the chosen format.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    positions (ndarray): Row positions to export, in order
+    file_format (str): "CSV", "Parquet" or "Excel"
+    out (file): Binary file object opened for writing
+    """
+    WRITERS[file_format](df, positions, out)
+
+
+def export_file(df, positions, file_format):
+    """
+    The export file for the rows at the given positions, as an open file object.
+
+    The file is built chunk by chunk in an anonymous temporary file on disk and returned
+    as a reader over it, so the writers never hold the export in memory. Reading it for
+    a download does: Streamlit keeps the bytes of every download in its in-memory media
+    storage, so one full copy of the export is in memory per click. The caller must
+    close the reader, which deletes the temporary file.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    positions (ndarray): Row positions to export, in order
+    file_format (str): "CSV", "Parquet" or "Excel"
+
+    Returns:
+    BufferedReader: The exported file, positioned at its start
+    """
+    with tempfile.TemporaryFile() as out:
+        write_rows(df, positions, file_format, out)
+        out.flush()
+        # A reader of its own keeps the file alive after the writer is closed
+        reader = open(os.dup(out.fileno()), "rb")
+    reader.seek(0)
+    return reader
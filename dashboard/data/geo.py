@@ -0,0 +1,99 @@
+# geo.py
+import json
+
+import streamlit as st
+
+from data.artifacts import cached_artifact
+from data.loader import DISTRICT_IDS, district_key
+from data.versioning import file_version
+
+# District boundaries, relative to the folder the app is started from
+GEOJSON_FILE = "distrito_all_s.geojson"
+# Decimal places kept in the coordinates (4 decimals is about 10 m)
+COORDINATE_DECIMALS = 4
+
+
+def _simplify_ring(ring, decimals):
+    points = []
+    for lon, lat, *_ in ring:
+        point = [round(lon, decimals), round(lat, decimals)]
+        if not points or point != points[-1]:
+            points.append(point)
+    # A linear ring needs at least four positions; keep the original when rounding collapses it
+    if len(points) < 4 or points[0] != points[-1]:
+        return [list(position) for position in ring]
+    return points
+
+
+def simplify_geometry(geojson, decimals=COORDINATE_DECIMALS):
+    """
+    Round the coordinates of a GeoJSON FeatureCollection and drop repeated points.
+
+    The district boundaries are drawn at country scale, where coordinates beyond a few
+    metres are invisible but still inflate every map sent to the browser.
+
+    Parameters:
+    geojson (dict): FeatureCollection of Polygon / MultiPolygon features
+    decimals (int): Decimal places to keep
+
+    Returns:
+    dict: A simplified copy (the input is not modified)
+    """
+    features = []
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            coordinates = [_simplify_ring(ring, decimals) for ring in geometry["coordinates"]]
+        elif geometry["type"] == "MultiPolygon":
+            coordinates = [
+                [_simplify_ring(ring, decimals) for ring in polygon] for polygon in geometry["coordinates"]
+            ]
+        else:
+            coordinates = geometry["coordinates"]
+        features.append(
+            {**feature, "geometry": {**geometry, "coordinates": coordinates}, "properties": dict(feature["properties"])}
+        )
+    return {**geojson, "features": features}
+
+
+def tag_districts(geojson):
+    """
+    Store the district_id of each feature in its properties (None when the district is unknown).
+
+    Parameters:
+    geojson (dict): FeatureCollection whose features have a "Distrito" property; modified in place
+    """
+    for feature in geojson["features"]:
+        properties = feature["properties"]
+        properties["district_id"] = DISTRICT_IDS.get(district_key(properties["Distrito"]))
+    return geojson
+
+
+def read_district_geojson(path=GEOJSON_FILE):
+    """
+    Parse, simplify and tag the district GeoJSON, using the artifact store when it was built ahead of time.
+
+    Parameters:
+    path (str): Path to the GeoJSON file
+    """
+
+    def build():
+        with open(path, "r") as f:
+            return tag_districts(simplify_geometry(json.load(f)))
+
+    return cached_artifact(
+        "district_geometry", file_version(path), build, {"decimals": COORDINATE_DECIMALS}
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def district_geojson(path=GEOJSON_FILE):
+    """
+    The simplified district boundaries, parsed once per server process.
+
+    The returned dictionary is shared by every session and must not be modified.
+
+    Parameters:
+    path (str): Path to the GeoJSON file
+    """
+    return read_district_geojson(path)
@@ -0,0 +1,484 @@
+# loader.py
+import importlib.util
+import json
+import logging
+import os
+import unicodedata
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from analytics.adequacy import add_adequacy_columns
+from analytics.income import add_income_columns
+from analytics.reasons import reason_flags
+from data.artifacts import artifact_store
+from data.versioning import DatasetHandle, file_version
+
+logger = logging.getLogger(__name__)
+
+# Survey data, relative to the folder the app is started from unless HABITACAO_DATA_FILE is set
+DATA_FILE = "data.csv"
+# Engine processing the CSV: "pandas" (default) or "polars"
+LOADER_BACKEND = os.environ.get("HABITACAO_LOADER", "pandas")
+
+# Stored processed dataset: one Parquet file per district, its rows sorted by housing
+# situation (the next filter of the district views), plus an index of the partitions
+# (a single pickle when pyarrow is not installed)
+PARTITION_COLUMN = "distrito"
+PARTITION_SORT_COLUMN = "housing_situation"
+PARTITION_INDEX_FILE = "dataset.partitions.json"
+MISSING_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+PICKLE_FILE = "dataset.pkl"
+
+# Districts (and islands of the autonomous regions) of the survey: district_id -> (name as in
+# the distrito column, zone as in the GeoJSON). The ids are stable across dataset versions.
+DISTRICTS = {
+    1: ('Aveiro', 'continente'),
+    2: ('Beja', 'continente'),
+    3: ('Braga', 'continente'),
+    4: ('Bragança', 'continente'),
+    5: ('Castelo branco', 'continente'),
+    6: ('Coimbra', 'continente'),
+    7: ('Évora', 'continente'),
+    8: ('Faro', 'continente'),
+    9: ('Guarda', 'continente'),
+    10: ('Leiria', 'continente'),
+    11: ('Lisboa', 'continente'),
+    12: ('Portalegre', 'continente'),
+    13: ('Porto', 'continente'),
+    14: ('Santarém', 'continente'),
+    15: ('Setúbal', 'continente'),
+    16: ('Viana do castelo', 'continente'),
+    17: ('Vila real', 'continente'),
+    18: ('Viseu', 'continente'),
+    19: ('Ilha da madeira', 'madeira'),
+    20: ('Ilha de porto santo', 'madeira'),
+    21: ('Ilha de santa maria', 'acores'),
+    22: ('Ilha de são miguel', 'acores'),
+    23: ('Ilha terceira', 'acores'),
+    24: ('Ilha da graciosa', 'acores'),
+    25: ('Ilha de são jorge', 'acores'),
+    26: ('Ilha do pico', 'acores'),
+    27: ('Ilha do faial', 'acores'),
+    28: ('Ilha das flores', 'acores'),
+    29: ('Ilha do corvo', 'acores'),
+}
+
+
+def district_key(name):
+    """ASCII matching key of a district name: lowercase, without accents ("Setúbal" -> "setubal")."""
+    return unicodedata.normalize("NFKD", str(name).strip().lower()).encode("ascii", errors="ignore").decode("ascii")
+
+
+DISTRICT_IDS = {district_key(name): district_id for district_id, (name, _) in DISTRICTS.items()}
+
+# Multi-choice answers, stored as list-like strings such as "['arrendo', 'outrem']"
+LIST_COLUMNS = ['situacao-habitacional', 'tipo-casa', 'tipologia', 'situacao-profissional',
+                'satisfacao', 'estrategia-arrendamento', 'insatisfacao-motivos', 'estrategia-compra']
+
+# Survey answer codes and their cleaned values
+HOUSING_SITUATIONS = {
+    'arrendo': 'Arrendamento',
+    'comprei': 'Casa Própria',
+    'outrem': 'Others'
+}
+SATISFACTION_LEVELS = {
+    'muito-satisfeito': 'Very Satisfied',
+    'satisfeito': 'Satisfied',
+    'indiferente': 'Neutral',
+    'insatisfeito': 'Dissatisfied',
+    'muito-insatisfeito': 'Very Dissatisfied'
+}
+HOUSE_TYPES = {
+    'apartamento': 'Apartment',
+    'moradia': 'House'
+}
+TYPOLOGIES = {
+    'T0': '0',
+    'T1': '1',
+    'T2': '2',
+    'T3': '3',
+    'T4+': '4+'
+}
+EMPLOYMENT_STATUSES = {
+    'empregado-tempo-inteiro': 'Full-time',
+    'empregado-tempo-parcial': 'Part-time',
+    'independente': 'Self-employed',
+    'desempregado': 'Unemployed',
+    'estudante': 'Student',
+    'reformado': 'Retired'
+}
+EDUCATION_LEVELS = {
+    'licenciatura': "Bachelor's",
+    'mestrado': "Master's",
+    'doutoramento': 'PhD',
+    'secundario': 'High School',
+    'profissional': 'Vocational',
+    'basico': 'Basic'
+}
+
+# Living area assumed for the open-ended ">400" answer (m²)
+AREA_OVER_400 = 450
+
+# Birth decade groups of birth_period
+AGE_GROUP_EDGES = [1960, 1970, 1980, 1990, 2000, 2025]
+AGE_GROUP_LABELS = [
+    "1960s (~55-65)",
+    "1970s (~45-55)",
+    "1980s (~35-45)",
+    "1990s (~25-35)",
+    "2000s+ (<25)",
+]
+
+
+def data_path():
+    """Path of the survey CSV the dashboard serves."""
+    return os.environ.get("HABITACAO_DATA_FILE", os.path.join(os.getcwd(), DATA_FILE))
+
+
+def process_data(df):
+    """
+    Clean the raw survey answers and add the derived analysis columns.
+
+    Bump data.versioning.PIPELINE_VERSION whenever this changes the meaning or shape of
+    the derived columns.
+
+    Parameters:
+    df (DataFrame): The raw survey data, as read from data.csv
+
+    Returns:
+    DataFrame: The processed housing data
+    """
+    # Process the data for easier analysis
+    # Clean list-like columns
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].str.replace('[', '').str.replace(']', '').str.replace("'", '').str.split(', ')
+            # Extract first value for simplicity
+            df[col + '_primary'] = df[col].apply(lambda x: x[0] if isinstance(x, list) and len(x) > 0 else x)
+    
+    # Parse income brackets for easier categorization
+    def parse_income(income_str):
+        # Handle NaN values
+        if pd.isna(income_str):
+            return np.nan, np.nan
+        
+        # Extract the income range from brackets if present
+        if isinstance(income_str, list):
+            if not income_str:  # Empty list
+                return np.nan, np.nan
+            income_str = income_str[0]  # Take the first element if it's a list
+        
+        # Remove any extraneous characters or whitespace
+        clean_income_str = str(income_str).strip().lower()
+        
+        # Income bracket mapping
+        income_mapping = {
+            'sem-rendimento': 0,
+            '<7001': 3500,
+            '7001-12000': 9500,
+            '12001-20000': 16000,
+            '20001-35000': 27500,
+            '35001-50000': 42500,
+            '50001-80000': 65000,
+            '>80001': 100000
+        }
+        
+        # Return mapped value if direct match exists
+        if clean_income_str in income_mapping:
+            return clean_income_str, income_mapping[clean_income_str]
+        
+        # Handle edge cases with regex pattern matching
+        import re
+        
+        # Match patterns like "<7001", "7001-12000", ">80001"
+        pattern = r'(<|>)?(\d+)(?:-(\d+))?'
+        match = re.match(pattern, clean_income_str)
+        
+        if match:
+            prefix, start, end = match.groups()
+            
+            # Standardize the format for cleaned string
+            if prefix == '<':
+                clean_str = f"<{start}"
+                value = float(start) / 2  # Half of upper bound
+            elif prefix == '>':
+                clean_str = f">{start}"
+                value = float(start) * 1.25  # 25% more than lower bound
+            elif end:  # Range like "7001-12000"
+                clean_str = f"{start}-{end}"
+                value = (float(start) + float(end)) / 2  # Midpoint
+            else:  # Single value
+                clean_str = start
+                value = float(start)
+                
+            return clean_str, value
+        
+        # If no patterns matched
+        return np.nan, np.nan
+
+    # Apply the function to the dataframe and create two new columns
+    cleaned_values = df['rendimento-anual'].apply(parse_income)
+    df['rendimento_clean'] = [x[0] for x in cleaned_values]
+    df['rendimento_numerical'] = [x[1] for x in cleaned_values]
+    
+    # Create a clean housing situation column
+    df['housing_situation'] = df['situacao-habitacional_primary'].map(HOUSING_SITUATIONS)
+    
+    # Clean satisfaction levels
+    df['satisfaction_level'] = df['satisfacao_primary'].map(SATISFACTION_LEVELS)
+    
+    # Extract numeric values from area-util
+    def parse_area(area_str):
+        if pd.isna(area_str):
+            return np.nan
+        elif area_str == '>400':
+            return AREA_OVER_400
+        elif '-' in area_str:
+            try:
+                min_val, max_val = map(int, area_str.split('-'))
+                return (min_val + max_val) / 2
+            except ValueError:
+                return np.nan
+        else:
+            return np.nan
+    
+    df['area_numerical'] = df['area-util'].apply(parse_area)
+    
+    # Create rent percentage categories
+    def categorize_rent_percentage(pct):
+        if pd.isna(pct):
+            return "Unknown"
+        try:
+            pct = float(pct)
+        except ValueError:
+            return "Unknown"
+        if pct <= 30:
+            return "≤30% (Affordable)"
+        elif pct <= 50:
+            return "31-50% (Moderate)"
+        elif pct <= 80:
+            return "51-80% (High)"
+        else:
+            return ">80% (Very High)"
+    
+    # Calculate rent burden percentage
+    df['rent_burden'] = df.apply(
+        lambda row: (row['valor-mensal-renda'] / (row['rendimento_numerical'] / 12)) * 100 
+        if pd.notna(row['valor-mensal-renda']) and pd.notna(row['rendimento_numerical']) and row['rendimento_numerical'] > 0 
+        else np.nan, 
+        axis=1
+    )
+
+    df['rent_burden'] = df['rent_burden'].apply(categorize_rent_percentage)
+    
+    # Create house type and typology columns
+    df['house_type'] = df['tipo-casa_primary'].map(HOUSE_TYPES)
+    
+    # Clean typology
+    df['bedroom_count'] = df['tipologia_primary'].map(TYPOLOGIES)
+    
+    # Process dissatisfaction reasons: one reason_<code> 0/1 flag per reason, in one pass
+    df = df.join(reason_flags(df['insatisfacao-motivos']))
+    
+    # Clean professional situation
+    df['employment_status'] = df['situacao-profissional_primary'].map(EMPLOYMENT_STATUSES)
+    
+    # Clean education levels
+    df['education_level'] = df['educacao'].map(EDUCATION_LEVELS)
+
+    df['distrito'] = df['distrito'].str.capitalize()
+
+    # Start year of the birth interval
+    df['birth_period'] = pd.to_numeric(
+        df['ano_nascimento_interval'].str.extract(r"\[(\d+)", expand=False), errors='coerce'
+    )
+
+    return add_derived_columns(df)
+
+
+def add_derived_columns(df):
+    """
+    Add the analysis columns derived from the cleaned answers.
+
+    Shared by the pandas and Polars loaders, which produce the same cleaned columns.
+
+    Parameters:
+    df (DataFrame): The cleaned survey data (with birth_period)
+
+    Returns:
+    DataFrame: The processed housing data
+    """
+    df['age_group'] = pd.cut(df['birth_period'], bins=AGE_GROUP_EDGES, labels=AGE_GROUP_LABELS)
+
+    # Integer key of the district dimension (data.districts.district_table); <NA> when unknown
+    names = df['distrito'].dropna().unique()
+    df['district_id'] = df['distrito'].map(
+        {name: DISTRICT_IDS.get(district_key(name)) for name in names}
+    ).astype('Int64')
+
+    # Space per person, bedroom adequacy, overcrowding and the adequacy index per respondent
+    df = add_adequacy_columns(df)
+
+    # Ordered income brackets, groups and bands, and the 1-5 satisfaction score
+    df = add_income_columns(df)
+
+    return df
+
+
+def _restore_objects(value):
+    # Parquet returns multi-label lists as arrays and missing text as None
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if value is None:
+        return np.nan
+    return value
+
+
+def restore_object_columns(df):
+    """Turn the arrays and None values of object columns read back from Arrow into lists and NaN."""
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(_restore_objects).astype(object)
+    return df
+
+
+def _partition_file(key):
+    return f"dataset.{PARTITION_COLUMN}={quote(key, safe='')}.parquet"
+
+
+def _partition_index(store, version):
+    try:
+        return json.loads(store.path(version, PARTITION_INDEX_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def stored_districts(store, version):
+    """Districts with a stored partition (MISSING_PARTITION for rows without one), or None when nothing is stored."""
+    index = _partition_index(store, version)
+    return None if index is None else list(index["partitions"])
+
+
+def read_processed(store, version, districts=None):
+    """
+    Read a processed dataset written by write_processed.
+
+    Only the partitions of the requested districts are read, so reading one district
+    costs in proportion to its number of rows. The stored index restores the original
+    row order of the sorted partitions.
+
+    Parameters:
+    store (ArtifactStore): Store to read from
+    version (str): Version token of the dataset
+    districts (list): distrito values to read (None reads the whole dataset)
+
+    Returns:
+    DataFrame: The rows in their original order, or None when the dataset (or every
+    requested district) is not stored
+    """
+    index = _partition_index(store, version)
+    if index is None:
+        path = store.path(version, PICKLE_FILE)
+        if not path.is_file():
+            return None
+        df = pd.read_pickle(path)
+        return df if districts is None else df[df[PARTITION_COLUMN].isin(districts)]
+
+    keys = list(index["partitions"]) if districts is None else [d for d in districts if d in index["partitions"]]
+    if not keys:
+        return None
+    parts = [pd.read_parquet(store.path(version, index["partitions"][key]["file"])) for key in keys]
+    df = restore_object_columns(pd.concat(parts).sort_index() if len(parts) > 1 else parts[0].sort_index())
+    if districts is None:
+        # The whole dataset: back to the RangeIndex of the processed CSV
+        df = df.reset_index(drop=True)
+    return df
+
+
+def write_processed(df, store, version):
+    """
+    Store the processed dataset under its version token, partitioned by district.
+
+    Each district is written to its own Parquet file, sorted by PARTITION_SORT_COLUMN
+    so the rows of one housing situation are contiguous (and the row group statistics
+    can skip the others); the original position is kept as the index. The partition
+    index file is written last and marks the dataset as complete.
+    Without pyarrow the dataset is pickled whole.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    store (ArtifactStore): Store to write to
+    version (str): Version token of the dataset
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        return store.write_bytes(version, PICKLE_FILE, df.to_pickle)
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Every partition gets the schema (and pandas dtypes) of the whole dataset, so a column
+    # that is empty in one district reads back with the same type as in the others
+    schema = pa.Schema.from_pandas(df, preserve_index=True)
+    partitions = {}
+    for district, part in df.groupby(PARTITION_COLUMN, dropna=False, sort=True):
+        key = MISSING_PARTITION if pd.isna(district) else district
+        name = _partition_file(key)
+        if PARTITION_SORT_COLUMN in part.columns:
+            part = part.sort_values(PARTITION_SORT_COLUMN, kind="stable", na_position="last")
+        table = pa.Table.from_pandas(part, schema=schema, preserve_index=True).replace_schema_metadata(schema.metadata)
+        store.write_bytes(version, name, lambda f, table=table: pq.write_table(table, f))
+        partitions[key] = {"file": name, "rows": len(part)}
+
+    index = {"column": PARTITION_COLUMN, "sorted_by": PARTITION_SORT_COLUMN, "rows": len(df), "partitions": partitions}
+    content = json.dumps(index, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    return store.write_bytes(version, PARTITION_INDEX_FILE, lambda f: f.write(content))
+
+
+def build_dataset(file_path):
+    """
+    Read and process the survey CSV, stamping the dataset version token.
+
+    Parameters:
+    file_path (str): Path to data.csv
+    """
+    if LOADER_BACKEND == "polars" and importlib.util.find_spec("polars") is not None:
+        from data.polars_loader import process_csv
+
+        df = process_csv(file_path)
+    else:
+        if LOADER_BACKEND == "polars":
+            logger.warning("The polars package is not installed; processing the CSV with pandas")
+        df = process_data(pd.read_csv(file_path))
+
+    # Version token used as cache key by the analytics modules
+    df.attrs["dataset_version"] = file_version(file_path)
+    return df
+
+
+def load_dataset(file_path):
+    """
+    Return the processed dataset, from the artifact store when it was built ahead of time.
+
+    On a miss the CSV is processed; the result is saved when the store is writable.
+
+    Parameters:
+    file_path (str): Path to data.csv
+
+    Returns:
+    DatasetHandle: The dataset and its version token
+    """
+    store = artifact_store()
+    version = file_version(file_path)
+    try:
+        df = read_processed(store, version)
+    except Exception:
+        df = None  # Unreadable artifact: rebuild it from the CSV
+    if df is not None:
+        return DatasetHandle(df, version, str(file_path))
+
+    df = build_dataset(file_path)
+    if store.writable:
+        write_processed(df, store, version)
+    return DatasetHandle(df, version, str(file_path))
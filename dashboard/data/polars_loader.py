@@ -0,0 +1,175 @@
+# polars_loader.py
+"""
+Polars implementation of the survey cleaning done by data.loader.process_data.
+
+The CSV is scanned lazily and every cleaning step is one expression of a single query
+plan, which Polars runs on all cores. The cleaned frame is converted to pandas once,
+through Arrow, and the derived analysis columns are then added by the same pandas code
+as the default loader, so both backends produce the same processed dataset.
+
+Requires the optional polars package (selected with HABITACAO_LOADER=polars).
+"""
+import polars as pl
+
+from analytics.affordability import INCOME_BRACKET_MIDPOINTS, RENT_BURDEN_CATEGORIES, RENT_BURDEN_EDGES
+from analytics.reasons import REASON_CODES
+from data.loader import (
+    AREA_OVER_400,
+    EDUCATION_LEVELS,
+    EMPLOYMENT_STATUSES,
+    HOUSE_TYPES,
+    HOUSING_SITUATIONS,
+    LIST_COLUMNS,
+    SATISFACTION_LEVELS,
+    TYPOLOGIES,
+    add_derived_columns,
+    restore_object_columns,
+)
+
+# Income answers such as "<7001", "7001-12000" or ">80001" that are not a known bracket
+INCOME_PATTERN = r"^(<|>)?(\d+)(?:-(\d+))?"
+# Area answers such as "50-75"
+AREA_RANGE_PATTERN = r"^\s*\+?(\d+)\s*-\s*\+?(\d+)\s*$"
+# Fields pd.read_csv reads as missing by default (its na_values), read as null here too
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def _list_answers(column):
+    # "['arrendo', 'outrem']" -> ["arrendo", "outrem"]
+    return pl.col(column).cast(pl.String).str.replace_all(r"[\[\]']", "").str.split(", ")
+
+
+def _map(column, mapping):
+    return pl.col(column).replace_strict(mapping, default=None, return_dtype=pl.String)
+
+
+def _income_columns():
+    """rendimento_clean and rendimento_numerical, as parse_income in process_data."""
+    answer = pl.col("rendimento-anual").cast(pl.String).str.strip_chars().str.to_lowercase()
+    known = answer.is_in(list(INCOME_BRACKET_MIDPOINTS))
+    parts = answer.str.extract_groups(INCOME_PATTERN)
+    prefix = parts.struct.field("1").fill_null("")
+    start = parts.struct.field("2")
+    end = parts.struct.field("3").fill_null("")
+    start_value = start.cast(pl.Float64)
+
+    clean = (
+        pl.when(known).then(answer)
+        .when(start.is_null()).then(None)
+        .when(prefix == "<").then(pl.concat_str([pl.lit("<"), start]))
+        .when(prefix == ">").then(pl.concat_str([pl.lit(">"), start]))
+        .when(end != "").then(pl.concat_str([start, pl.lit("-"), end]))
+        .otherwise(start)
+    )
+    value = (
+        pl.when(known).then(answer.replace_strict(INCOME_BRACKET_MIDPOINTS, default=None, return_dtype=pl.Float64))
+        .when(start.is_null()).then(None)
+        .when(prefix == "<").then(start_value / 2)
+        .when(prefix == ">").then(start_value * 1.25)
+        .when(end != "").then((start_value + end.cast(pl.Float64, strict=False)) / 2)
+        .otherwise(start_value)
+    )
+    return [clean.alias("rendimento_clean"), value.alias("rendimento_numerical")]
+
+
+def _area_column():
+    """area_numerical: midpoint of the area range, AREA_OVER_400 for ">400"."""
+    area = pl.col("area-util").cast(pl.String)
+    bounds = area.str.extract_groups(AREA_RANGE_PATTERN)
+    midpoint = (bounds.struct.field("1").cast(pl.Float64) + bounds.struct.field("2").cast(pl.Float64)) / 2
+    return (
+        pl.when(area == ">400").then(pl.lit(AREA_OVER_400, dtype=pl.Float64))
+        .otherwise(midpoint)
+        .alias("area_numerical")
+    )
+
+
+def _rent_burden_column():
+    """rent_burden: category of the share of monthly income paid in rent."""
+    rent = pl.col("valor-mensal-renda").cast(pl.Float64, strict=False)
+    income = pl.col("rendimento_numerical")
+    pct = pl.when(rent.is_not_null() & income.is_not_null() & (income > 0)).then(rent / (income / 12) * 100)
+
+    category = pl.when(pct.is_null() | pct.is_nan()).then(pl.lit("Unknown"))
+    for edge, label in zip(RENT_BURDEN_EDGES, RENT_BURDEN_CATEGORIES):
+        category = category.when(pct <= edge).then(pl.lit(label))
+    return category.otherwise(pl.lit(RENT_BURDEN_CATEGORIES[-1])).alias("rent_burden")
+
+
+def _capitalize(column):
+    text = pl.col(column).cast(pl.String)
+    return pl.concat_str([text.str.slice(0, 1).str.to_uppercase(), text.str.slice(1).str.to_lowercase()])
+
+
+def clean_answers(frame):
+    """
+    The cleaning steps of process_data as a lazy query, producing the same columns in the same order.
+
+    Parameters:
+    frame (LazyFrame): The raw survey data
+
+    Returns:
+    LazyFrame: The cleaned survey data, up to birth_period
+    """
+    columns = frame.collect_schema().names()
+    list_columns = [col for col in LIST_COLUMNS if col in columns]
+
+    expressions = []
+    for col in list_columns:
+        expressions.append(_list_answers(col).alias(col))
+        expressions.append(_list_answers(col).list.first().alias(col + "_primary"))
+
+    return (
+        frame.with_columns(expressions)
+        .with_columns(_income_columns())
+        .with_columns(
+            _map("situacao-habitacional_primary", HOUSING_SITUATIONS).alias("housing_situation"),
+            _map("satisfacao_primary", SATISFACTION_LEVELS).alias("satisfaction_level"),
+            _area_column(),
+        )
+        .with_columns(_rent_burden_column())
+        .with_columns(
+            _map("tipo-casa_primary", HOUSE_TYPES).alias("house_type"),
+            _map("tipologia_primary", TYPOLOGIES).alias("bedroom_count"),
+        )
+        .with_columns(
+            [
+                pl.col("insatisfacao-motivos").list.contains(code).fill_null(False).cast(pl.Int64).alias(f"reason_{code}")
+                for code in REASON_CODES
+            ]
+        )
+        .with_columns(
+            _map("situacao-profissional_primary", EMPLOYMENT_STATUSES).alias("employment_status"),
+            _map("educacao", EDUCATION_LEVELS).alias("education_level"),
+            _capitalize("distrito").alias("distrito"),
+        )
+        .with_columns(
+            pl.col("ano_nascimento_interval")
+            .cast(pl.String)
+            .str.extract(r"\[(\d+)", 1)
+            .cast(pl.Int64, strict=False)
+            .alias("birth_period")
+        )
+    )
+
+
+def process_csv(file_path):
+    """
+    Read and process the survey CSV with Polars.
+
+    Parameters:
+    file_path (str): Path to data.csv
+
+    Returns:
+    DataFrame: The processed housing data (pandas), equal to process_data(pd.read_csv(file_path))
+    """
+    frame = pl.scan_csv(file_path, infer_schema_length=None, null_values=PANDAS_NA_VALUES)
+    # pandas names an unnamed column (the saved index) "Unnamed: <position>"
+    names = frame.collect_schema().names()
+    frame = frame.rename({name: f"Unnamed: {i}" for i, name in enumerate(names) if name == ""})
+
+    df = restore_object_columns(clean_answers(frame).collect().to_arrow().to_pandas())
+    return add_derived_columns(df)
@@ -0,0 +1,178 @@
+# schema.py
+import pandas as pd
+import streamlit as st
+
+NUMERIC = "numeric"
+CATEGORICAL = "categorical"
+MULTI_LABEL = "multi-label"
+TEMPORAL = "temporal"
+FREE_TEXT = "free text"
+
+# Column names containing one of these terms are offered as time axes
+TIME_TERMS = ("ano", "year", "date", "time", "period")
+
+# Text columns with more distinct values than this share of the rows are free text
+FREE_TEXT_MIN_CARDINALITY = 50
+FREE_TEXT_SHARE = 0.5
+
+# Separator used when multi-label values are written out as text
+MULTI_LABEL_SEPARATOR = "; "
+
+COLUMN_LABELS = {
+    "distrito": "Distrito",
+    "concelho": "Concelho",
+    "housing_situation": "Situação Habitacional",
+    "satisfaction_level": "Nível de Satisfação",
+    "house_type": "Tipo de Habitação",
+    "education_level": "Nível de Educação",
+    "employment_status": "Situação Profissional",
+    "rendimento_clean": "Escalão de Rendimento",
+    "rendimento_numerical": "Rendimento Anual (estimado)",
+    "bedroom_count": "Tipologia",
+    "rent_burden": "Sobrecarga da Renda",
+    "area_numerical": "Área Útil (m²)",
+    "valor-mensal-renda": "Renda Mensal (€)",
+    "valor-compra": "Valor de Compra (€)",
+    "ano-compra": "Ano de Compra",
+    "ano-inicio-arrendamento": "Ano de Início do Arrendamento",
+    "ano-heranca-aquisicao": "Ano de Herança/Aquisição",
+    "num-pessoas-nao-dependentes": "Pessoas Não Dependentes",
+    "num-pessoas-dependentes": "Pessoas Dependentes",
+}
+
+
+def encode_multi_label(series, separator=MULTI_LABEL_SEPARATOR):
+    """
+    Encode a column of label lists as text, keeping the original label order.
+
+    Values that are not lists are returned unchanged, so the encoding is stable and can
+    be applied to any column.
+
+    Parameters:
+    series (Series): Column to encode
+    separator (str): Separator between labels
+    """
+    return series.map(
+        lambda v: separator.join(map(str, v)) if isinstance(v, (list, tuple)) else v
+    )
+
+
+class ColumnInfo:
+    """
+    Metadata of one dataset column.
+
+    Parameters:
+    name (str): Column name
+    dtype (str): Pandas dtype
+    logical_type (str): One of NUMERIC, CATEGORICAL, MULTI_LABEL, TEMPORAL, FREE_TEXT
+    is_numeric (bool): Whether the column has a numeric dtype
+    cardinality (int): Number of distinct non-missing values (None for multi-label columns)
+    label (str): Display label
+    """
+
+    def __init__(self, name, dtype, logical_type, is_numeric, cardinality, label):
+        self.name = name
+        self.dtype = dtype
+        self.logical_type = logical_type
+        self.is_numeric = is_numeric
+        self.cardinality = cardinality
+        self.label = label
+
+    def __repr__(self):
+        return f"ColumnInfo({self.name!r}, {self.logical_type!r}, cardinality={self.cardinality})"
+
+
+def _is_multi_label(series):
+    # Lists parsed by process_data, or list-like strings such as "['20001-35000']"
+    values = series.dropna()
+    if values.map(lambda v: isinstance(v, (list, tuple))).any():
+        return True
+    return values.astype(str).str.contains("[", regex=False).any()
+
+
+def _column_info(series, n_rows):
+    name = series.name
+    is_numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    multi_label = not is_numeric and _is_multi_label(series)
+    cardinality = None if multi_label else int(series.nunique(dropna=True))
+
+    if multi_label:
+        logical_type = MULTI_LABEL
+    elif any(term in name.lower() for term in TIME_TERMS):
+        logical_type = TEMPORAL
+    elif is_numeric:
+        logical_type = NUMERIC
+    elif cardinality > max(FREE_TEXT_MIN_CARDINALITY, FREE_TEXT_SHARE * n_rows):
+        logical_type = FREE_TEXT
+    else:
+        logical_type = CATEGORICAL
+
+    return ColumnInfo(
+        name, str(series.dtype), logical_type, is_numeric, cardinality, COLUMN_LABELS.get(name, name)
+    )
+
+
+class DatasetSchema:
+    """
+    Logical type, cardinality and display label of every column of the processed dataset.
+
+    Built once per dataset version, so the tabs pick their axis and filter options with
+    dictionary lookups instead of inspecting the values on every rerun. Temporal columns
+    keep is_numeric, so numeric years remain available as numeric axes.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    """
+
+    def __init__(self, df):
+        n_rows = len(df)
+        self.columns = {col: _column_info(df[col], n_rows) for col in df.columns}
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def label(self, column):
+        """Display label of a column (the column name when none is defined)."""
+        info = self.columns.get(column)
+        return info.label if info else column
+
+    def of_type(self, *logical_types):
+        """Columns with one of the given logical types, in dataset order."""
+        return [col for col, info in self.columns.items() if info.logical_type in logical_types]
+
+    def numeric_columns(self):
+        """Columns with a numeric dtype, including numeric temporal columns."""
+        return [col for col, info in self.columns.items() if info.is_numeric]
+
+    def categorical_columns(self, include_free_text=True):
+        """Single-valued text columns (multi-label columns are excluded)."""
+        return [
+            col
+            for col, info in self.columns.items()
+            if not info.is_numeric
+            and info.logical_type != MULTI_LABEL
+            and (include_free_text or info.logical_type != FREE_TEXT)
+        ]
+
+    def multi_label_columns(self):
+        """Columns holding several labels per row."""
+        return self.of_type(MULTI_LABEL)
+
+    def time_columns(self):
+        """Columns whose name suggests a time dimension, whatever their logical type."""
+        return [col for col in self.columns if any(term in col.lower() for term in TIME_TERMS)]
+
+
+@st.cache_resource(show_spinner=False)
+def dataset_schema(_df, dataset_version):
+    """
+    Build (once per dataset version) the schema of the processed dataset.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data
+    dataset_version (str): Version token of the dataset
+    """
+    return DatasetSchema(_df)
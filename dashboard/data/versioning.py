@@ -0,0 +1,110 @@
+# versioning.py
+import hashlib
+
+# Bump whenever process_data changes the meaning or shape of the derived columns, or
+# a stored computation changes its results, so every cache keyed on the dataset version
+# (artifact store included) is invalidated with it.
+PIPELINE_VERSION = "7"
+
+
+def file_version(file_path):
+    """
+    Build a version token from the raw bytes of a source file and the pipeline version.
+
+    Parameters:
+    file_path (str): Path to the source file (e.g. data.csv)
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        digest.update(str(file_path).encode("utf-8"))
+    return f"{digest.hexdigest()[:16]}-p{PIPELINE_VERSION}"
+
+
+class DatasetHandle:
+    """
+    The processed dataset together with its immutable version token.
+
+    The token is derived from the content hash of the source file and the pipeline
+    version, so it identifies the data without reading the frame. Cached computations
+    are keyed on the token and small parameters, never on the frame contents; handles
+    compare and hash by their token.
+
+    The token is also stamped on the frame (df.attrs["dataset_version"]), so code that
+    only holds the frame can still get it in O(1) with dataset_version.
+
+    One handle is shared by every session of the server process and its frame is
+    read-only; sessions work on view(), never on df.
+
+    Parameters:
+    df (DataFrame): The processed housing data
+    version (str): Version token (see file_version)
+    source (str): Path of the source file
+    """
+
+    __slots__ = ("_df", "_version", "_source")
+
+    def __init__(self, df, version, source=None):
+        df.attrs["dataset_version"] = version
+        self._df = df
+        self._version = version
+        self._source = source
+
+    @property
+    def df(self):
+        return self._df
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def source(self):
+        return self._source
+
+    def view(self):
+        """
+        A per-session frame sharing the column data of the dataset.
+
+        The columns are not copied; with pandas copy-on-write (the only mode from
+        pandas 3, which requirements.txt pins), adding or modifying columns on the view
+        copies only what is written and never reaches the shared frame or other sessions.
+
+        Copy-on-write does not cover the objects inside cells: the lists of the
+        multi-choice columns are shared and must never be changed in place (build new
+        lists instead). The same holds for frames sliced from the dataset, such as
+        data.districts.district_rows, and cached frames such as district_table are
+        shared outright and must not be modified at all.
+        """
+        return self._df.copy(deep=False)
+
+    def __eq__(self, other):
+        return isinstance(other, DatasetHandle) and other._version == self._version
+
+    def __hash__(self):
+        return hash(self._version)
+
+    def __repr__(self):
+        return f"DatasetHandle(version={self._version!r}, rows={len(self._df)}, source={self._source!r})"
+
+
+def dataset_version(data):
+    """
+    Return the version token of a dataset handle, or of a frame loaded through one.
+
+    Parameters:
+    data (DatasetHandle or DataFrame): The processed housing data
+
+    Raises:
+    ValueError: When the frame carries no version token; cache keys are never built
+    from the frame contents
+    """
+    if isinstance(data, DatasetHandle):
+        return data.version
+    version = data.attrs.get("dataset_version")
+    if not version:
+        raise ValueError("The DataFrame has no dataset version; load it with data.loader.load_dataset")
+    return version
@@ -0,0 +1,183 @@
+# watcher.py
+import logging
+import os
+import threading
+
+import streamlit as st
+
+from config import DATA_WATCH_INTERVAL
+from data.geo import GEOJSON_FILE, district_geojson
+from data.loader import load_dataset
+from data.versioning import file_version
+
+logger = logging.getLogger(__name__)
+
+
+def _signature(path):
+    """Cheap change marker of a file: (modification time, size), None when it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def invalidate_dataset_caches(old_dataset):
+    """
+    Drop the cached results built from a dataset version that is no longer served.
+
+    Caches keyed only on the version are cleared for that version alone; the figure
+    cache drops the entries of that version; caches that also take widget parameters
+    are cleared entirely, since their keys cannot be enumerated.
+
+    Parameters:
+    old_dataset (DatasetHandle): The dataset that was replaced
+    """
+    from analytics.adequacy import cached_adequacy_by_group
+    from analytics.affordability import cached_rent_burden_simulation
+    from analytics.box_stats import cached_box_summary
+    from analytics.correlation import cached_correlation_stats
+    from analytics.income import cached_income_satisfaction
+    from analytics.mortgage import cached_district_mortgage_grid
+    from analytics.quantiles import sketch_cube
+    from analytics.reasons import cached_reason_stats
+    from analytics.strategies import cached_strategy_summary, strategy_table
+    from analytics.timeseries import cached_period_aggregates
+    from data.districts import district_index
+    from data.engine import query_engine
+    from data.schema import dataset_schema
+    from data_grid import cached_filtered_positions
+    from figure_cache import get_figure_cache
+
+    old_df, old_version = old_dataset.df, old_dataset.version
+    for cached in (dataset_schema, district_index, query_engine, strategy_table, cached_strategy_summary):
+        cached.clear(old_df, old_version)
+    for cached in (
+        cached_adequacy_by_group,
+        cached_box_summary,
+        cached_correlation_stats,
+        cached_district_mortgage_grid,
+        cached_filtered_positions,
+        cached_income_satisfaction,
+        cached_period_aggregates,
+        cached_reason_stats,
+        cached_rent_burden_simulation,
+        sketch_cube,
+    ):
+        cached.clear()
+    get_figure_cache().invalidate(dataset_version=old_version)
+
+
+class DatasetWatcher:
+    """
+    Serve the processed dataset and pick up changes to data.csv and the GeoJSON.
+
+    A daemon thread polls both files. A change in modification time or size is only
+    acted upon once the file has stayed the same for a full interval (so a file being
+    copied in is not read half-written) and its content hash differs from the version
+    being served. The new dataset is then built in that thread while sessions keep
+    getting the current one, swapped in with a single reference assignment, and only
+    the caches of the replaced version are invalidated. A new GeoJSON only clears the
+    district geometry and the district table.
+
+    Parameters:
+    data_file (str): Path to data.csv
+    geojson_file (str): Path to the district GeoJSON
+    interval (float): Seconds between checks
+    """
+
+    def __init__(self, data_file, geojson_file=GEOJSON_FILE, interval=DATA_WATCH_INTERVAL):
+        self.data_file = data_file
+        self.geojson_file = geojson_file
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._dataset = load_dataset(data_file)
+        self._signatures = {path: _signature(path) for path in (data_file, geojson_file)}
+        self._versions = {data_file: self._dataset.version, geojson_file: file_version(geojson_file)}
+        self._pending = {}
+
+    def dataset(self):
+        """The DatasetHandle currently served."""
+        with self._lock:
+            return self._dataset
+
+    def start(self):
+        """Start polling in a daemon thread (a no-op when the interval is 0)."""
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Data file check failed")
+
+    def check(self):
+        """
+        Run one polling step.
+
+        Returns:
+        list: The files whose new content was applied
+        """
+        applied = []
+        for path in (self.data_file, self.geojson_file):
+            signature = _signature(path)
+            if signature == self._signatures[path]:
+                self._pending.pop(path, None)
+                continue
+            if signature is None or self._pending.get(path) != signature:
+                # Missing, or still changing: look again at the next check
+                self._pending[path] = signature
+                continue
+
+            del self._pending[path]
+            self._signatures[path] = signature
+            version = file_version(path)
+            if version == self._versions[path]:
+                continue  # Touched or rewritten with the same content
+
+            if path == self.data_file:
+                if not self._swap_dataset():
+                    continue
+            else:
+                from data.districts import district_table
+
+                district_geojson.clear()
+                district_table.clear()
+                logger.info("District geometry updated to %s", version)
+            self._versions[path] = version
+            applied.append(path)
+        return applied
+
+    def _swap_dataset(self):
+        try:
+            new_dataset = load_dataset(self.data_file)
+        except Exception:
+            logger.exception("Could not process %s; still serving the previous version", self.data_file)
+            return False
+        with self._lock:
+            old_dataset, self._dataset = self._dataset, new_dataset
+        invalidate_dataset_caches(old_dataset)
+        logger.info("Dataset updated from %s to %s", old_dataset.version, new_dataset.version)
+        return True
+
+
+@st.cache_resource(show_spinner=False)
+def dataset_watcher(data_file, geojson_file=GEOJSON_FILE):
+    """
+    The DatasetWatcher shared by every session of this server process, already polling.
+
+    Parameters:
+    data_file (str): Path to data.csv
+    geojson_file (str): Path to the district GeoJSON
+    """
+    return DatasetWatcher(data_file, geojson_file).start()
@@ -0,0 +1,163 @@
+# data_grid.py
+import math
+
+import streamlit as st
+
+from config import DATA_GRID_DEFAULT_COLUMNS, DATA_GRID_PAGE_SIZES
+from data.engine import query_engine
+from data.export import EXPORT_FORMATS, available_formats, export_file
+from data.schema import encode_multi_label
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def cached_filtered_positions(_df, dataset_version, filters=(), sort_by=None, ascending=True):
+    """
+    Cached row positions of the filtered view per (filter state, sort column, direction).
+
+    The positions are shared read-only between sessions, so paging through the grid
+    only slices this array.
+
+    Parameters:
+    _df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    filters (tuple): (column, value) pairs; rows must match all of them
+    sort_by (str): Optional column to sort by
+    ascending (bool): Sort direction
+    """
+    positions = query_engine(_df, dataset_version).filtered_positions(filters, sort_by, ascending)
+    positions.setflags(write=False)
+    return positions
+
+
+def data_page(df, positions, page, page_size, columns):
+    """
+    Build one page of the grid: the projected columns of the rows on that page.
+
+    Multi-label columns are encoded as text so the page serializes to Arrow cleanly.
+
+    Parameters:
+    df (DataFrame): The full processed housing data
+    positions (ndarray): Row positions of the (sorted) filtered view
+    page (int): Page number, starting at 1
+    page_size (int): Rows per page
+    columns (list): Columns to include
+    """
+    start = (page - 1) * page_size
+    page_df = df.iloc[positions[start : start + page_size]][list(columns)]
+    return page_df.apply(encode_multi_label)
+
+
+def show_data_grid(df, dataset_version, filters=(), schema=None, key="data_grid", label="Ver Dados"):
+    """
+    Paginated, server-side view of the filtered data inside an expander.
+
+    Nothing is computed or sent while the expander is collapsed. When it is open, only
+    the selected columns of the current page are sent to the browser; sorting happens
+    on the server over the whole filtered view.
+
+    Parameters:
+    df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    filters (tuple): (column, value) pairs; rows must match all of them
+    schema (DatasetSchema): Optional schema used for labels and sortable columns
+    key (str): Widget key prefix
+    label (str): Expander label
+    """
+    expander = st.expander(label, expanded=False, key=f"{key}_expander", on_change="rerun")
+    with expander:
+        if not expander.open:
+            return
+
+        format_label = schema.label if schema is not None else str
+        all_columns = df.columns.tolist()
+        multi_label = set(schema.multi_label_columns()) if schema is not None else set()
+
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        with col1:
+            columns = st.multiselect(
+                "Colunas",
+                all_columns,
+                default=all_columns[:DATA_GRID_DEFAULT_COLUMNS],
+                format_func=format_label,
+                key=f"{key}_columns",
+            )
+        with col2:
+            sort_options = ["Nenhuma"] + [col for col in all_columns if col not in multi_label]
+            sort_by = st.selectbox(
+                "Ordenar por", sort_options, format_func=format_label, key=f"{key}_sort"
+            )
+        with col3:
+            direction = st.selectbox(
+                "Ordem", ["Ascendente", "Descendente"], key=f"{key}_direction"
+            )
+        with col4:
+            page_size = st.selectbox(
+                "Linhas por página", DATA_GRID_PAGE_SIZES, key=f"{key}_page_size"
+            )
+
+        if not columns:
+            st.info("Selecione pelo menos uma coluna.")
+            return
+
+        positions = cached_filtered_positions(
+            df,
+            dataset_version,
+            tuple(filters),
+            None if sort_by == "Nenhuma" else sort_by,
+            direction == "Ascendente",
+        )
+        n_pages = max(1, math.ceil(len(positions) / page_size))
+        # The page count is part of the key, so the page resets when it changes
+        page = st.number_input(
+            "Página", min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page_{n_pages}"
+        )
+        page = min(int(page), n_pages)
+
+        st.dataframe(data_page(df, positions, page, page_size, columns), use_container_width=True)
+        st.caption(f"Página {page} de {n_pages} · {len(positions)} registos")
+
+
+def show_export_controls(df, dataset_version, filters=(), key="data_export", file_stem="dados_habitacao"):
+    """
+    Download button for the filtered data in CSV, Parquet or Excel.
+
+    The file is only generated when the button is clicked, chunk by chunk on disk;
+    multi-label columns are written as "label; label" text. Streamlit then holds the
+    bytes in its in-memory media storage, so every click keeps a full copy of the
+    export in memory until the download is served.
+
+    Parameters:
+    df (DataFrame): The full processed housing data (not a filtered subset)
+    dataset_version (str): Version token of the dataset
+    filters (tuple): (column, value) pairs; rows must match all of them
+    key (str): Widget key prefix
+    file_stem (str): Name of the downloaded file, without extension
+    """
+    formats = available_formats()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        file_format = st.selectbox(
+            "Formato",
+            formats,
+            key=f"{key}_format",
+            help=None if "Excel" in formats else "A exportação para Excel requer o pacote openpyxl.",
+        )
+    positions = cached_filtered_positions(df, dataset_version, tuple(filters))
+    spec = EXPORT_FORMATS[file_format]
+
+    def export_data():
+        # Streamlit reads the whole file into memory anyway; reading it here lets the
+        # temporary file be closed (and deleted) as soon as the bytes are taken
+        with export_file(df, positions, file_format) as reader:
+            return reader.read()
+
+    with col2:
+        st.write("")
+        st.download_button(
+            f"Descarregar {len(positions)} registos ({file_format})",
+            data=export_data,
+            file_name=f"{file_stem}.{spec['extension']}",
+            mime=spec["mime"],
+            key=f"{key}_download",
+            on_click="ignore",
+        )
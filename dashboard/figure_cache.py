@@ -0,0 +1,127 @@
+# figure_cache.py
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+import streamlit as st
+
+from data.artifacts import cached_artifact
+
+# Memory budget for serialized figures, shared by every session of the server process
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of serialized Plotly figures.
+
+    Entries are figure JSON strings keyed by (tab, chart id, dataset version, widget
+    values). The least recently used entries are evicted once the total size of the
+    stored JSON exceeds the memory budget. All operations are guarded by a lock, since
+    Streamlit runs every session in its own thread.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(tab, chart_id, dataset_version, params=None):
+        """Build a hashable key; widget values are serialized with sorted keys."""
+        params_key = json.dumps(params or {}, sort_keys=True, default=str)
+        return (tab, chart_id, dataset_version, params_key)
+
+    def get(self, key):
+        """Return the cached figure JSON for a key, or None."""
+        with self._lock:
+            figure_json = self._entries.get(key)
+            if figure_json is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return figure_json
+
+    def put(self, key, figure_json):
+        """Store figure JSON and evict least recently used entries over the budget."""
+        size = len(figure_json)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = figure_json
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def invalidate(self, dataset_version=None, tab=None):
+        """
+        Drop entries for a dataset version and/or tab; with no arguments, drop everything.
+
+        Parameters:
+        dataset_version (str): Only drop entries built from this dataset version
+        tab (str): Only drop entries of this tab
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if dataset_version is not None and key[2] != dataset_version:
+                    continue
+                if tab is not None and key[0] != tab:
+                    continue
+                self._size -= len(self._entries.pop(key))
+
+    def stats(self):
+        """Return entry count, stored bytes, hits and misses."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Return the FigureCache shared by all sessions of this server process."""
+    return FigureCache()
+
+
+def cached_figure(tab, chart_id, dataset_version, build_figure, params=None):
+    """
+    Return a figure from the shared cache, building and storing it on a miss.
+
+    On a miss the artifact store is checked before the figure is built.
+
+    Parameters:
+    tab (str): Tab identifier (e.g. "tab2")
+    chart_id (str): Chart identifier, unique within the tab
+    dataset_version (str): Version token of the dataset the chart is built from
+    build_figure (callable): Zero-argument function returning a Plotly figure
+    params (dict): Widget values the chart depends on
+
+    Returns:
+    Figure: The Plotly figure
+    """
+    cache = get_figure_cache()
+    key = FigureCache.make_key(tab, chart_id, dataset_version, params)
+
+    figure_json = cache.get(key)
+    if figure_json is None:
+        # Figures pre-rendered by the warm-up are read from the artifact store
+        figure_json = cached_artifact(
+            "figure",
+            dataset_version,
+            lambda: pio.to_json(build_figure(), validate=False),
+            {"tab": tab, "chart": chart_id, "params": params or {}},
+        )
+        cache.put(key, figure_json)
+    return pio.from_json(figure_json, skip_invalid=True)
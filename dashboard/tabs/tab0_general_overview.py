@@ -1,17 +1,29 @@
 # tab0_visao_geral.py
-import json
 import sys
 from pathlib import Path
 
-import folium
+import numpy as np
 import plotly.express as px
 import pandas as pd
 import streamlit as st
-from streamlit_folium import folium_static
 
 # Add the parent directory to system path
 sys.path.append(str(Path(__file__).parent.parent))
-from config import SATISFACTION_COLORS, HOUSING_COLORS, BACKGROUND_COLORS, TEXT_COLORS
+from config import SATISFACTION_COLORS, HOUSING_COLORS, BACKGROUND_COLORS, TEXT_COLORS, COLOR_SCALES
+from analytics.mortgage import (
+    DEFAULT_DOWN_PAYMENTS,
+    DEFAULT_PRICE_QUANTILES,
+    DEFAULT_RATES,
+    DEFAULT_TERMS,
+    PAYMENT_TO_INCOME_LIMIT,
+    affordable_share,
+    cached_district_mortgage_grid,
+    price_to_income,
+)
+from data.districts import district_rows, district_table
+from data.geo import district_geojson
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 
 def show_visao_geral_tab(df):
@@ -30,15 +42,7 @@ def show_visao_geral_tab(df):
         df["housing_situation"] == "Others"
     ).mean() * 100
 
-    # Calculate satisfaction score (1-5 scale)
-    satisfaction_mapping = {
-        "Very Satisfied": 5,
-        "Satisfied": 4,
-        "Neutral": 3,
-        "Dissatisfied": 2,
-        "Very Dissatisfied": 1,
-    }
-    df["satisfaction_score"] = df["satisfaction_level"].map(satisfaction_mapping)
+    # Satisfaction score (1-5 scale), computed at load
     avg_satisfaction = df["satisfaction_score"].mean()
 
     # Header and Key Metrics Row with enhanced styling
@@ -187,65 +191,22 @@ def show_visao_geral_tab(df):
     with map_col:
         st.subheader("Mapa de Indicadores por Distrito")
         # Calculate satisfaction score by district
-        district_satisfaction = (
-            df.groupby("distrito")["satisfaction_score"]
-            .agg(["mean", "count"])
-            .reset_index()
-        )
-        district_satisfaction = district_satisfaction.rename(
-            columns={"mean": "satisfaction_score"}
-        )
+        district_satisfaction = df.groupby("district_id")["satisfaction_score"].agg(["mean", "count"])
 
         try:
-            # Load GeoJSON data for Portugal
-            with open("distrito_all_s.geojson", "r") as f:
-                portugal_geojson = json.load(f)
-
-            # Normalize district names for matching
-            district_satisfaction["distrito_normalized"] = (
-                district_satisfaction["distrito"]
-                .str.lower()
-                .str.normalize("NFKD")
-                .str.encode("ascii", errors="ignore")
-                .str.decode("utf-8")
-            )
-
-            # Mapping of district names between datasets
-            district_mapping = {
-                "viana do castelo": "viana do castelo",
-                "braga": "braga",
-                "vila real": "vila real",
-                "braganca": "braganca",
-                "aveiro": "aveiro",
-                "coimbra": "coimbra",
-                "leiria": "leiria",
-                "lisboa": "lisboa",
-                "porto": "porto",
-                "setubal": "setubal",
-                "viseu": "viseu",
-                "guarda": "guarda",
-                "santarem": "santarem",
-                "beja": "beja",
-                "castelo branco": "castelo branco",
-                "evora": "evora",
-                "faro": "faro",
-                "portalegre": "portalegre",
-                "ilha da madeira": "madeira",
-                "acores": "acores",
-            }
-
-            # Create a new column with matched district names
-            district_satisfaction["distrito_geojson"] = district_satisfaction[
-                "distrito_normalized"
-            ].map(district_mapping)
+            # Load GeoJSON data for Portugal (parsed and simplified once per process, read-only);
+            # features and rows are joined on their integer district_id
+            portugal_geojson = district_geojson()
+            districts = district_table()
 
             # Convert to dictionaries for easier access
-            district_satisfaction_dict = district_satisfaction.set_index(
-                "distrito_geojson"
-            )["satisfaction_score"].to_dict()
-            district_count_dict = district_satisfaction.set_index("distrito_geojson")[
-                "count"
-            ].to_dict()
+            district_satisfaction_dict = district_satisfaction["mean"].to_dict()
+            district_count_dict = district_satisfaction["count"].to_dict()
+
+            # Map libraries are only loaded once a map is actually drawn
+            import folium
+            import folium.plugins
+            from streamlit_folium import folium_static
 
             # Create map centered on Portugal
             m = folium.Map(
@@ -257,9 +218,9 @@ def show_visao_geral_tab(df):
 
             # Style function for the GeoJSON
             def style_function(feature):
-                district_name = feature["properties"]["Distrito"].lower()
+                district_id = feature["properties"]["district_id"]
                 try:
-                    score = district_satisfaction_dict[district_name]
+                    score = district_satisfaction_dict[district_id]
                     if score < 1.5:
                         color = SATISFACTION_COLORS["Very Dissatisfied"]
                     elif score < 2.5:
@@ -306,13 +267,14 @@ def show_visao_geral_tab(df):
 
             # Add custom popups with satisfaction data and click event
             for feature in portugal_geojson["features"]:
-                district_name = feature["properties"]["Distrito"].lower()
-                if district_name in district_satisfaction_dict:
-                    score = district_satisfaction_dict[district_name]
-                    count = district_count_dict[district_name]
+                district_id = feature["properties"]["district_id"]
+                if district_id in district_satisfaction_dict:
+                    score = district_satisfaction_dict[district_id]
+                    count = district_count_dict[district_id]
+                    district_name = districts.at[district_id, "name"]
 
                     # Get additional information for the district
-                    district_data = df[df["distrito"].str.lower() == district_name]
+                    district_data = district_rows(df, dataset_version(df), district_name)
 
                     # Calculate rent average, handling potential NaN values
                     avg_rent = district_data[
@@ -511,13 +473,13 @@ def show_visao_geral_tab(df):
             st.session_state.selected_district = "Porto"
 
         # Get available districts for the dropdown
-        districts = ["All"] + sorted([d.capitalize() for d in district_mapping.keys()])
+        district_options = ["All"] + district_table().sort_values("key")["name"].tolist()
 
         # District selection dropdown - The key fix is here
         selected_district = st.selectbox(
             "Selecione um distrito",
-            districts,
-            index=districts.index("Porto"),
+            district_options,
+            index=district_options.index("Porto"),
             key="district_selector",
             label_visibility="collapsed",
         )
@@ -528,7 +490,8 @@ def show_visao_geral_tab(df):
 
         # Filter data based on the CURRENT selected district
         if selected_district and selected_district != "All":
-            filtered_df = df[df["distrito"].str.lower() == selected_district.lower()]
+            # Dropdown names are capitalized like the distrito column
+            filtered_df = district_rows(df, dataset_version(df), selected_district)
             region_title = selected_district.capitalize()
         else:
             filtered_df = df
@@ -742,3 +705,132 @@ def show_visao_geral_tab(df):
             """,
                 unsafe_allow_html=True,
             )
+
+        # Purchase Affordability Simulator
+        st.subheader("Simulador de Acessibilidade Compra")
+
+        st.markdown(
+            """
+        <div class="info-card">
+            Compare a prestação mensal do crédito habitação com o seu rendimento, para os preços de compra
+            reportados em cada distrito. A prestação não deve exceder 35% do rendimento líquido mensal.
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+        district_prices, payments = cached_district_mortgage_grid(df, dataset_version(df))
+
+        if district_prices.empty:
+            st.write("Não há dados de compra disponíveis para a simulação.")
+        else:
+            purchase_district = st.selectbox(
+                "Distrito",
+                district_prices.index.tolist(),
+                format_func=lambda d: f"{d} ({district_prices.loc[d, 'count']} compras)",
+                key="purchase_district_selector",
+            )
+            price_level = st.radio(
+                "Preço de referência",
+                ["P25", "Mediana", "P75"],
+                index=1,
+                horizontal=True,
+                key="purchase_price_level",
+            )
+            rate = st.select_slider(
+                "Taxa de juro anual (%)",
+                options=DEFAULT_RATES.tolist(),
+                value=3.5,
+                key="purchase_rate",
+            )
+            term = st.select_slider(
+                "Prazo (anos)",
+                options=DEFAULT_TERMS.tolist(),
+                value=30,
+                key="purchase_term",
+            )
+            down_payment = st.select_slider(
+                "Entrada (% do preço)",
+                options=DEFAULT_DOWN_PAYMENTS.tolist(),
+                value=10,
+                key="purchase_down_payment",
+            )
+
+            district_idx = district_prices.index.get_loc(purchase_district)
+            quantile_idx = ["P25", "Mediana", "P75"].index(price_level)
+            rate_idx = DEFAULT_RATES.tolist().index(rate)
+            term_idx = DEFAULT_TERMS.tolist().index(term)
+            down_idx = DEFAULT_DOWN_PAYMENTS.tolist().index(down_payment)
+
+            price = district_prices.iloc[district_idx][DEFAULT_PRICE_QUANTILES[quantile_idx]]
+            payment = payments[district_idx, quantile_idx, rate_idx, term_idx, down_idx]
+            payment_ratio = payment / monthly_income * 100
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(
+                    f"""
+                <div class="metric-card" style="height: 180px; display: grid; grid-template-rows: 1fr 1fr 1fr; justify-content: center; align-items: center;">
+                    <div class="metric-label">Prestação Mensal</div>
+                    <div class="metric-value">{payment:.0f}€</div>
+                    <div class="metric-label">{payment_ratio:.0f}% do rendimento</div>
+                </div>
+                """,
+                    unsafe_allow_html=True,
+                )
+            with col2:
+                st.markdown(
+                    f"""
+                <div class="metric-card" style="height: 180px; display: grid; grid-template-rows: 1fr 1fr 1fr; justify-content: center; align-items: center;">
+                    <div class="metric-label">Preço / Rendimento Anual</div>
+                    <div class="metric-value">{price / income_input:.1f}x</div>
+                    <div class="metric-label">preço de {price:,.0f}€</div>
+                </div>
+                """,
+                    unsafe_allow_html=True,
+                )
+
+            # Payment-to-income over the full rate × term grid for the selected down payment.
+            # The cached figure only holds the axes and layout, which no input changes; the
+            # values of the selected slice are set on every rerun.
+            payment_grid = payments[district_idx, quantile_idx, :, :, down_idx]
+
+            def build_payment_ratio_heatmap():
+                fig = px.imshow(
+                    np.zeros((len(DEFAULT_RATES), len(DEFAULT_TERMS))),
+                    x=DEFAULT_TERMS,
+                    y=DEFAULT_RATES,
+                    origin="lower",
+                    aspect="auto",
+                    color_continuous_scale=COLOR_SCALES["diverging"][::-1],
+                    range_color=[0, 100],
+                    labels={"x": "Prazo (anos)", "y": "Taxa de juro (%)", "color": "Prestação / Rendimento (%)"},
+                    title="Taxa de Esforço por Taxa de Juro e Prazo",
+                )
+                fig.update_layout(
+                    height=350,
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    font_color=TEXT_COLORS[2],
+                    title_font_color=TEXT_COLORS[0],
+                )
+                return fig.update_traces(z=None)
+
+            fig = cached_figure("tab0", "payment_ratio_heatmap", dataset_version(df), build_payment_ratio_heatmap)
+            fig.update_traces(z=np.minimum(payment_grid / monthly_income * 100, 100))
+            st.plotly_chart(fig, use_container_width=True)
+
+            grid_share = affordable_share(payments[district_idx], income_input)
+            st.caption(
+                f"{grid_share * 100:.0f}% das {payments[district_idx].size:,} combinações de preço, taxa, "
+                f"prazo e entrada ficam abaixo de {PAYMENT_TO_INCOME_LIMIT * 100:.0f}% do rendimento."
+            )
+
+            # Price-to-income ratio reported at the time of purchase
+            pti = price_to_income(df)
+            district_pti = pti[pti["distrito"] == purchase_district]["price_to_income"]
+            if not district_pti.empty:
+                st.caption(
+                    f"Rácio preço/rendimento mediano na compra em {purchase_district}: "
+                    f"{district_pti.median():.1f}x ({len(district_pti)} respostas)."
+                )
@@ -1,7 +1,6 @@
 # tab1_housing_distribution.py
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import sys
 from pathlib import Path
@@ -9,6 +8,9 @@ from pathlib import Path
 # Add the parent directory to system path
 sys.path.append(str(Path(__file__).parent.parent))
 from config import *
+from analytics.strategies import cached_strategy_summary
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 
 def show_housing_distribution_tab(df):
@@ -19,6 +21,7 @@ def show_housing_distribution_tab(df):
     df (DataFrame): Os dados habitacionais processados
     """
     st.header("Distribuição de Situações Habitacionais")
+    version = dataset_version(df)
 
     # Introdução com estilo melhorado
     st.markdown("""
@@ -45,24 +48,27 @@ def show_housing_distribution_tab(df):
             1
         ).astype(str) + "%"
 
-        # Create enhanced pie chart with percentages using HOUSING_COLORS
-        fig = px.pie(
-            housing_counts,
-            values="Count",
-            names="Housing Situation",
-            color="Housing Situation",
-            color_discrete_map=HOUSING_COLORS,
-            title="Distribuição das Situações Habitacionais",
-            hover_data=["Percentage"],
-        )
-        fig.update_traces(textinfo="percent+label")
-        fig.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[3],  # White background
-            paper_bgcolor=BACKGROUND_COLORS[3],  # White paper
-            title_font_color=TEXT_COLORS[0],    # Dark green title
-            font_color=TEXT_COLORS[2],          # Medium green text
-        )
-        st.plotly_chart(fig)
+        def build_housing_pie():
+            # Create enhanced pie chart with percentages using HOUSING_COLORS
+            fig = px.pie(
+                housing_counts,
+                values="Count",
+                names="Housing Situation",
+                color="Housing Situation",
+                color_discrete_map=HOUSING_COLORS,
+                title="Distribuição das Situações Habitacionais",
+                hover_data=["Percentage"],
+            )
+            fig.update_traces(textinfo="percent+label")
+            fig.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[3],  # White background
+                paper_bgcolor=BACKGROUND_COLORS[3],  # White paper
+                title_font_color=TEXT_COLORS[0],    # Dark green title
+                font_color=TEXT_COLORS[2],          # Medium green text
+            )
+            return fig
+
+        st.plotly_chart(cached_figure("tab1", "housing_pie", version, build_housing_pie))
 
         # Add insights below the chart
         dominant_situation = housing_counts.iloc[housing_counts["Count"].argmax()][
@@ -75,25 +81,6 @@ def show_housing_distribution_tab(df):
         """)
 
     with col2:
-        # Extract birth year range for age groups and improve labeling
-        df["birth_period"] = df["ano_nascimento_interval"].str.extract(r"\[(\d+)")
-        df["birth_period"] = pd.to_numeric(df["birth_period"], errors="coerce")
-
-        # Calculate approximate current age (as of 2025)
-        df["approx_age"] = 2025 - df["birth_period"]
-
-        df["age_group"] = pd.cut(
-            df["birth_period"],
-            bins=[1960, 1970, 1980, 1990, 2000, 2025],
-            labels=[
-                "1960s (~55-65)",
-                "1970s (~45-55)",
-                "1980s (~35-45)",
-                "1990s (~25-35)",
-                "2000s+ (<25)",
-            ],
-        )
-
         # Pivot table for housing situation by age group
         pivot_data = (
             pd.crosstab(df["age_group"], df["housing_situation"], normalize="index")
@@ -107,35 +94,38 @@ def show_housing_distribution_tab(df):
             value_name="Percentage",
         )
 
-        fig = px.bar(
-            pivot_data_melted,
-            x="age_group",
-            y="Percentage",
-            color="Housing Situation",
-            color_discrete_map=HOUSING_COLORS,  # Use consistent housing colors
-            title="Situação Habitacional por Década de Nascimento",
-            labels={
-                "age_group": "Década de Nascimento (Intervalo Etário)",
-                "Percentage": "Percentagem (%)",
-            },
-        )
-        fig.update_layout(
-            xaxis_title="Década de Nascimento (Intervalo Etário Aproximado)",
-            plot_bgcolor=BACKGROUND_COLORS[0],    # Light green background
-            paper_bgcolor=BACKGROUND_COLORS[3],   # White paper
-            font_color=TEXT_COLORS[2],           # Medium green text
-            title_font_color=TEXT_COLORS[0],     # Dark green title
-            legend_title_font_color=TEXT_COLORS[1],  # Dark green legend title
-            xaxis=dict(
-                tickfont=dict(color=TEXT_COLORS[2]),  # Medium green tick labels
-                title_font=dict(color=TEXT_COLORS[1])  # Dark green axis title
-            ),
-            yaxis=dict(
-                tickfont=dict(color=TEXT_COLORS[2]),  # Medium green tick labels
-                title_font=dict(color=TEXT_COLORS[1])  # Dark green axis title
-            ),
-        )
-        st.plotly_chart(fig)
+        def build_housing_by_age():
+            fig = px.bar(
+                pivot_data_melted,
+                x="age_group",
+                y="Percentage",
+                color="Housing Situation",
+                color_discrete_map=HOUSING_COLORS,  # Use consistent housing colors
+                title="Situação Habitacional por Década de Nascimento",
+                labels={
+                    "age_group": "Década de Nascimento (Intervalo Etário)",
+                    "Percentage": "Percentagem (%)",
+                },
+            )
+            fig.update_layout(
+                xaxis_title="Década de Nascimento (Intervalo Etário Aproximado)",
+                plot_bgcolor=BACKGROUND_COLORS[0],    # Light green background
+                paper_bgcolor=BACKGROUND_COLORS[3],   # White paper
+                font_color=TEXT_COLORS[2],           # Medium green text
+                title_font_color=TEXT_COLORS[0],     # Dark green title
+                legend_title_font_color=TEXT_COLORS[1],  # Dark green legend title
+                xaxis=dict(
+                    tickfont=dict(color=TEXT_COLORS[2]),  # Medium green tick labels
+                    title_font=dict(color=TEXT_COLORS[1])  # Dark green axis title
+                ),
+                yaxis=dict(
+                    tickfont=dict(color=TEXT_COLORS[2]),  # Medium green tick labels
+                    title_font=dict(color=TEXT_COLORS[1])  # Dark green axis title
+                ),
+            )
+            return fig
+
+        st.plotly_chart(cached_figure("tab1", "housing_by_age", version, build_housing_by_age))
 
         # Add insights about generational differences
         st.markdown("""
@@ -229,21 +219,26 @@ def show_housing_distribution_tab(df):
         )
         edu_counts = edu_counts.sort_values("Education Level")
 
-        fig = px.bar(
-            edu_counts,
-            x="Education Level",
-            y="Count",
-            color="Education Level",
-            color_discrete_sequence=PRIMARY_COLORS,  # Use primary color palette
-            title=f"Distribuição do Nível de Educação para {selected_situation}",
-            labels={"Education Level": "Nível de Educação", "Count": "Contagem"}
-        )
-        fig.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            showlegend=False  # Hide legend since colors are just for aesthetics
+        def build_education_by_situation():
+            fig = px.bar(
+                edu_counts,
+                x="Education Level",
+                y="Count",
+                color="Education Level",
+                color_discrete_sequence=PRIMARY_COLORS,  # Use primary color palette
+                title=f"Distribuição do Nível de Educação para {selected_situation}",
+                labels={"Education Level": "Nível de Educação", "Count": "Contagem"}
+            )
+            fig.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                showlegend=False  # Hide legend since colors are just for aesthetics
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab1", "education_by_situation", version, build_education_by_situation, {"situation": selected_situation})
         )
-        st.plotly_chart(fig)
 
         st.markdown(f"""
         Este gráfico mostra a distribuição do nível de educação entre as pessoas na situação habitacional "{selected_situation}".
@@ -258,16 +253,19 @@ def show_housing_distribution_tab(df):
             rent_burden_counts = filtered_df["rent_burden"].value_counts().reset_index()
             rent_burden_counts.columns = ["Rent Burden", "Count"]
 
-            fig = px.pie(
-                rent_burden_counts,
-                values="Count",
-                names="Rent Burden",
-                title="Distribuição do Peso da Renda",
-                hole=0.4,
-                color="Rent Burden",
-                color_discrete_map=RENT_BURDEN_COLORS,
-            )
-            st.plotly_chart(fig)
+            def build_rent_burden_donut():
+                fig = px.pie(
+                    rent_burden_counts,
+                    values="Count",
+                    names="Rent Burden",
+                    title="Distribuição do Peso da Renda",
+                    hole=0.4,
+                    color="Rent Burden",
+                    color_discrete_map=RENT_BURDEN_COLORS,
+                )
+                return fig
+
+            st.plotly_chart(cached_figure("tab1", "rent_burden_donut", version, build_rent_burden_donut))
 
             st.markdown("""
             **Explicação do Peso da Renda:**
@@ -293,87 +291,39 @@ def show_housing_distribution_tab(df):
     # Criar duas colunas para as análises de arrendamento e compra
     col1, col2 = st.columns(2)
 
-    # Função para verificar valores únicos nas estratégias
-    def check_unique_strategies(df):
-        # Para estratégias de arrendamento
-        rent_strategies = set()
-        for strategies in df['estrategia-arrendamento'].dropna():
-            if isinstance(strategies, list):
-                for strategy in strategies:
-                    rent_strategies.add(strategy)
-        
-        # Limpar os valores de rent_strategies
-        cleaned_rent_strategies = set()
-        for strategy in rent_strategies:
-            # Substituir underscores e dash por espaços e capitalizar primeira letra
-            cleaned_strategy = strategy.replace('_', ' ').replace('-', ' ').capitalize()
-            cleaned_rent_strategies.add(cleaned_strategy)
-        
-        print("Valores únicos em estrategia-arrendamento:")
-        print(sorted(list(cleaned_rent_strategies)))
-        
-        # Para estratégias de compra
-        buy_strategies = set()
-        for strategies in df['estrategia-compra'].dropna():
-            if isinstance(strategies, list):
-                for strategy in strategies:
-                    buy_strategies.add(strategy)
-        
-        # Limpar os valores de buy_strategies
-        cleaned_buy_strategies = set()
-        for strategy in buy_strategies:
-            # Substituir underscores por espaços e capitalizar primeira letra
-            cleaned_strategy = strategy.replace('_', ' ').replace('-', ' ').capitalize()
-            cleaned_buy_strategies.add(cleaned_strategy)
-        
-        print("\nValores únicos em estrategia-compra:")
-        print(sorted(list(cleaned_buy_strategies)))
-        
-        return cleaned_rent_strategies, cleaned_buy_strategies
-
-    # Para executar esta verificação, você adicionaria este bloco temporariamente no início da função
-    # show_housing_distribution_tab ou o executaria em uma célula Jupyter separada antes de finalizar o código
-    rent_unique, buy_unique = check_unique_strategies(df)
+    # Contagens, renda, valor de compra e satisfação por estratégia, numa única agregação
+    strategy_stats = cached_strategy_summary(df, version)
+    rent_stats = strategy_stats[strategy_stats["tipo"] == "Arrendamento"]
+    buy_stats = strategy_stats[strategy_stats["tipo"] == "Compra"]
 
-    # Criar mapas a partir dos valores únicos
-    rent_strategy_map = {strategy.lower().replace(' ', '-'): strategy for strategy in rent_unique}
-    buy_strategy_map = {strategy.lower().replace(' ', '-'): strategy for strategy in buy_unique}
-
-    
     with col1:
         st.subheader("Estratégias de Arrendamento")
         
-        # Processar os dados de estratégia de arrendamento
-        # Extrair todas as estratégias mencionadas por respondentes
-        rent_strategies = []
-        for strategies in df['estrategia-arrendamento'].dropna():
-            if isinstance(strategies, list):
-                rent_strategies.extend(strategies)
-        
-        rent_strategy_counts = pd.Series(rent_strategies).value_counts().reset_index()
+        rent_strategy_counts = rent_stats[["label", "count"]]
         rent_strategy_counts.columns = ["Estratégia", "Contagem"]
         
-        rent_strategy_counts['Estratégia'] = rent_strategy_counts['Estratégia'].map(rent_strategy_map)
-        
-        # Criar gráfico de barras para estratégias de arrendamento
-        fig = px.bar(
-            rent_strategy_counts,
-            x="Estratégia",
-            y="Contagem",
-            color="Estratégia",
-            color_discrete_sequence=PRIMARY_COLORS,
-            title="Estratégias Utilizadas para Encontrar Arrendamento",
-            labels={"Estratégia": "Estratégia de Arrendamento", "Contagem": "Número de Pessoas"}
-        )
-        fig.update_layout(
-            xaxis_title="Estratégia de Arrendamento",
-            yaxis_title="Número de Pessoas",
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            showlegend=False,
-            xaxis={'categoryorder':'total descending'}
-        )
-        st.plotly_chart(fig)
+        def build_rent_strategies():
+            # Criar gráfico de barras para estratégias de arrendamento
+            fig = px.bar(
+                rent_strategy_counts,
+                x="Estratégia",
+                y="Contagem",
+                color="Estratégia",
+                color_discrete_sequence=PRIMARY_COLORS,
+                title="Estratégias Utilizadas para Encontrar Arrendamento",
+                labels={"Estratégia": "Estratégia de Arrendamento", "Contagem": "Número de Pessoas"}
+            )
+            fig.update_layout(
+                xaxis_title="Estratégia de Arrendamento",
+                yaxis_title="Número de Pessoas",
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                showlegend=False,
+                xaxis={'categoryorder':'total descending'}
+            )
+            return fig
+
+        st.plotly_chart(cached_figure("tab1", "rent_strategies", version, build_rent_strategies))
         
         # Adicionar insights sobre as estratégias de arrendamento
         top_rent_strategy = rent_strategy_counts.iloc[0]['Estratégia']
@@ -387,42 +337,31 @@ def show_housing_distribution_tab(df):
         # Análise adicional: Relação entre estratégia de arrendamento e valor da renda
         st.subheader("Valor da Renda por Estratégia")
         
-        # Criar um dataframe para armazenar valor médio de renda por estratégia
-        rent_values_by_strategy = []
-        
-        for strategy in rent_strategy_map.keys():
-            strategy_df = df[df['estrategia-arrendamento'].apply(
-                lambda x: isinstance(x, list) and strategy in x
-            )]
-            
-            avg_rent = strategy_df['valor-mensal-renda'].mean()
-            if not pd.isna(avg_rent):
-                rent_values_by_strategy.append({
-                    'Estratégia': rent_strategy_map.get(strategy, strategy),
-                    'Renda Média': avg_rent
-                })
-        
-        rent_values_df = pd.DataFrame(rent_values_by_strategy)
+        rent_values_df = rent_stats[["label", "mean_rent"]].dropna()
+        rent_values_df.columns = ["Estratégia", "Renda Média"]
         
         if not rent_values_df.empty:
             # Ordenar por valor de renda
             rent_values_df = rent_values_df.sort_values('Renda Média', ascending=False)
             
-            fig = px.bar(
-                rent_values_df,
-                x="Estratégia",
-                y="Renda Média",
-                color="Estratégia",
-                color_discrete_sequence=PRIMARY_COLORS,
-                title="Renda Média Mensal por Estratégia de Arrendamento",
-                labels={"Renda Média": "Valor Médio da Renda (€)"}
-            )
-            fig.update_layout(
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                showlegend=False
-            )
-            st.plotly_chart(fig)
+            def build_rent_by_strategy():
+                fig = px.bar(
+                    rent_values_df,
+                    x="Estratégia",
+                    y="Renda Média",
+                    color="Estratégia",
+                    color_discrete_sequence=PRIMARY_COLORS,
+                    title="Renda Média Mensal por Estratégia de Arrendamento",
+                    labels={"Renda Média": "Valor Médio da Renda (€)"}
+                )
+                fig.update_layout(
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    showlegend=False
+                )
+                return fig
+
+            st.plotly_chart(cached_figure("tab1", "rent_by_strategy", version, build_rent_by_strategy))
             
             st.markdown("""
             Este gráfico mostra a relação entre as estratégias utilizadas para encontrar arrendamento e o valor médio 
@@ -432,36 +371,31 @@ def show_housing_distribution_tab(df):
     with col2:
         st.subheader("Estratégias de Compra")
         
-        # Processar os dados de estratégia de compra
-        buy_strategies = []
-        for strategies in df['estrategia-compra'].dropna():
-            if isinstance(strategies, list):
-                buy_strategies.extend(strategies)
-        
-        buy_strategy_counts = pd.Series(buy_strategies).value_counts().reset_index()
+        buy_strategy_counts = buy_stats[["label", "count"]]
         buy_strategy_counts.columns = ["Estratégia", "Contagem"]
         
-        buy_strategy_counts['Estratégia'] = buy_strategy_counts['Estratégia'].map(buy_strategy_map)
-        
-        # Criar gráfico de barras para estratégias de compra
-        fig = px.bar(
-            buy_strategy_counts,
-            x="Estratégia",
-            y="Contagem",
-            color="Estratégia",
-            color_discrete_sequence=PRIMARY_COLORS,
-            title="Estratégias Utilizadas para Compra de Habitação",
-            labels={"Estratégia": "Estratégia de Compra", "Contagem": "Número de Pessoas"}
-        )
-        fig.update_layout(
-            xaxis_title="Estratégia de Compra",
-            yaxis_title="Número de Pessoas",
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            showlegend=False,
-            xaxis={'categoryorder':'total descending'}
-        )
-        st.plotly_chart(fig)
+        def build_buy_strategies():
+            # Criar gráfico de barras para estratégias de compra
+            fig = px.bar(
+                buy_strategy_counts,
+                x="Estratégia",
+                y="Contagem",
+                color="Estratégia",
+                color_discrete_sequence=PRIMARY_COLORS,
+                title="Estratégias Utilizadas para Compra de Habitação",
+                labels={"Estratégia": "Estratégia de Compra", "Contagem": "Número de Pessoas"}
+            )
+            fig.update_layout(
+                xaxis_title="Estratégia de Compra",
+                yaxis_title="Número de Pessoas",
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                showlegend=False,
+                xaxis={'categoryorder':'total descending'}
+            )
+            return fig
+
+        st.plotly_chart(cached_figure("tab1", "buy_strategies", version, build_buy_strategies))
         
         # Adicionar insights sobre as estratégias de compra
         top_buy_strategy = buy_strategy_counts.iloc[0]['Estratégia']
@@ -475,42 +409,33 @@ def show_housing_distribution_tab(df):
         # Análise adicional: Relação entre estratégia de compra e valor da propriedade
         st.subheader("Valor de Compra por Estratégia")
         
-        # Criar um dataframe para armazenar valor médio de compra por estratégia
-        purchase_values_by_strategy = []
-        
-        for strategy in buy_strategy_map.keys():
-            strategy_df = df[df['estrategia-compra'].apply(
-                lambda x: isinstance(x, list) and strategy in x
-            )]
-            
-            avg_purchase = strategy_df['valor-compra'].mean()
-            if not pd.isna(avg_purchase):
-                purchase_values_by_strategy.append({
-                    'Estratégia': buy_strategy_map.get(strategy, strategy),
-                    'Valor Médio': avg_purchase
-                })
-        
-        purchase_values_df = pd.DataFrame(purchase_values_by_strategy)
+        purchase_values_df = buy_stats[["label", "mean_purchase"]].dropna()
+        purchase_values_df.columns = ["Estratégia", "Valor Médio"]
         
         if not purchase_values_df.empty:
             # Ordenar por valor de compra
             purchase_values_df = purchase_values_df.sort_values('Valor Médio', ascending=False)
             
-            fig = px.bar(
-                purchase_values_df,
-                x="Estratégia",
-                y="Valor Médio",
-                color="Estratégia",
-                color_discrete_sequence=PRIMARY_COLORS,
-                title="Valor Médio de Compra por Estratégia",
-                labels={"Valor Médio": "Valor Médio de Compra (€)"}
-            )
-            fig.update_layout(
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                showlegend=False
+            def build_purchase_by_strategy():
+                fig = px.bar(
+                    purchase_values_df,
+                    x="Estratégia",
+                    y="Valor Médio",
+                    color="Estratégia",
+                    color_discrete_sequence=PRIMARY_COLORS,
+                    title="Valor Médio de Compra por Estratégia",
+                    labels={"Valor Médio": "Valor Médio de Compra (€)"}
+                )
+                fig.update_layout(
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    showlegend=False
+                )
+                return fig
+
+            st.plotly_chart(
+                cached_figure("tab1", "purchase_by_strategy", version, build_purchase_by_strategy)
             )
-            st.plotly_chart(fig)
             
             st.markdown("""
             Este gráfico mostra a relação entre as estratégias utilizadas para compra de habitação e o valor médio 
@@ -534,25 +459,28 @@ def show_housing_distribution_tab(df):
             rent_year_groups = rent_time_df.groupby('ano-inicio-arrendamento')['valor-mensal-renda'].mean().reset_index()
             rent_year_groups.columns = ['Ano de Início', 'Renda Média']
             
-            # Criar gráfico de linha para evolução do valor de renda ao longo do tempo
-            fig = px.line(
-                rent_year_groups,
-                x='Ano de Início',
-                y='Renda Média',
-                markers=True,
-                title='Evolução do Valor Médio da Renda por Ano de Início',
-                labels={'Renda Média': 'Valor Médio da Renda (€)'}
-            )
-            fig.update_layout(
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                xaxis=dict(
-                    tickmode='linear',
-                    tick0=rent_year_groups['Ano de Início'].min(),
-                    dtick=5  # Mostrar ticks a cada 5 anos
+            def build_rent_by_start_year():
+                # Criar gráfico de linha para evolução do valor de renda ao longo do tempo
+                fig = px.line(
+                    rent_year_groups,
+                    x='Ano de Início',
+                    y='Renda Média',
+                    markers=True,
+                    title='Evolução do Valor Médio da Renda por Ano de Início',
+                    labels={'Renda Média': 'Valor Médio da Renda (€)'}
                 )
-            )
-            st.plotly_chart(fig)
+                fig.update_layout(
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    xaxis=dict(
+                        tickmode='linear',
+                        tick0=rent_year_groups['Ano de Início'].min(),
+                        dtick=5  # Mostrar ticks a cada 5 anos
+                    )
+                )
+                return fig
+
+            st.plotly_chart(cached_figure("tab1", "rent_by_start_year", version, build_rent_by_start_year))
             
             st.markdown("""
             Este gráfico mostra como o valor médio das rendas mudou ao longo do tempo, representando
@@ -571,25 +499,28 @@ def show_housing_distribution_tab(df):
             buy_year_groups = buy_time_df.groupby('ano-compra')['valor-compra'].mean().reset_index()
             buy_year_groups.columns = ['Ano de Compra', 'Valor Médio']
             
-            # Criar gráfico de linha para evolução do valor de compra ao longo do tempo
-            fig = px.line(
-                buy_year_groups,
-                x='Ano de Compra',
-                y='Valor Médio',
-                markers=True,
-                title='Evolução do Valor Médio de Compra por Ano',
-                labels={'Valor Médio': 'Valor Médio de Compra (€)'}
-            )
-            fig.update_layout(
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                xaxis=dict(
-                    tickmode='linear',
-                    tick0=buy_year_groups['Ano de Compra'].min(),
-                    dtick=5  # Mostrar ticks a cada 5 anos
+            def build_purchase_by_year():
+                # Criar gráfico de linha para evolução do valor de compra ao longo do tempo
+                fig = px.line(
+                    buy_year_groups,
+                    x='Ano de Compra',
+                    y='Valor Médio',
+                    markers=True,
+                    title='Evolução do Valor Médio de Compra por Ano',
+                    labels={'Valor Médio': 'Valor Médio de Compra (€)'}
                 )
-            )
-            st.plotly_chart(fig)
+                fig.update_layout(
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    xaxis=dict(
+                        tickmode='linear',
+                        tick0=buy_year_groups['Ano de Compra'].min(),
+                        dtick=5  # Mostrar ticks a cada 5 anos
+                    )
+                )
+                return fig
+
+            st.plotly_chart(cached_figure("tab1", "purchase_by_year", version, build_purchase_by_year))
             
             st.markdown("""
             Este gráfico mostra como o valor médio das compras de habitação mudou ao longo do tempo,
@@ -600,82 +531,40 @@ def show_housing_distribution_tab(df):
     # Análise da relação entre estratégias e satisfação
     st.subheader("Estratégias e Níveis de Satisfação")
     
-    # Criar um dataframe para análise de satisfação por estratégia
-    satisfaction_by_strategy = []
-    
-    # Mapear níveis de satisfação para valores numéricos para cálculo de média
-    satisfaction_map = {
-        'muito-satisfeito': 5,
-        'satisfeito': 4,
-        'indiferente': 3,
-        'insatisfeito': 2,
-        'muito-insatisfeito': 1
-    }
-    
-    # Função para extrair o valor numérico da satisfação principal
-    def get_satisfaction_value(satisfacao_list):
-        if isinstance(satisfacao_list, list) and len(satisfacao_list) > 0:
-            return satisfaction_map.get(satisfacao_list[0], np.nan)
-        return np.nan
-    
-    # Aplicar função para criar coluna numérica de satisfação
-    df['satisfaction_numeric'] = df['satisfacao'].apply(get_satisfaction_value)
-    
-    # Analisar satisfação para estratégias de arrendamento
-    for strategy in rent_strategy_map.keys():
-        strategy_df = df[df['estrategia-arrendamento'].apply(
-            lambda x: isinstance(x, list) and strategy in x
-        )]
-        
-        avg_satisfaction = strategy_df['satisfaction_numeric'].mean()
-        if not pd.isna(avg_satisfaction):
-            satisfaction_by_strategy.append({
-                'Estratégia': rent_strategy_map.get(strategy, strategy),
-                'Satisfação Média': avg_satisfaction,
-                'Tipo': 'Arrendamento'
-            })
-    
-    # Analisar satisfação para estratégias de compra
-    for strategy in buy_strategy_map.keys():
-        strategy_df = df[df['estrategia-compra'].apply(
-            lambda x: isinstance(x, list) and strategy in x
-        )]
-        
-        avg_satisfaction = strategy_df['satisfaction_numeric'].mean()
-        if not pd.isna(avg_satisfaction):
-            satisfaction_by_strategy.append({
-                'Estratégia': buy_strategy_map.get(strategy, strategy),
-                'Satisfação Média': avg_satisfaction,
-                'Tipo': 'Compra'
-            })
-    
-    satisfaction_df = pd.DataFrame(satisfaction_by_strategy)
+    # Satisfação média (resposta principal, de 1 a 5) por estratégia e tipo
+    satisfaction_df = strategy_stats[["label", "mean_satisfaction", "tipo"]].dropna()
+    satisfaction_df.columns = ["Estratégia", "Satisfação Média", "Tipo"]
     
     if not satisfaction_df.empty:
-        # Criar gráfico comparativo de satisfação por estratégia e tipo
-        fig = px.bar(
-            satisfaction_df,
-            x='Estratégia',
-            y='Satisfação Média',
-            color='Tipo',
-            barmode='group',
-            title='Nível de Satisfação Médio por Estratégia de Habitação',
-            color_discrete_map={
-                'Arrendamento': PRIMARY_COLORS[0],
-                'Compra': PRIMARY_COLORS[1]
-            }
-        )
-        fig.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            xaxis={'categoryorder':'total descending'},
-            yaxis=dict(
-                range=[0, 5],
-                tickvals=[1, 2, 3, 4, 5],
-                ticktext=['Muito Insatisfeito', 'Insatisfeito', 'Indiferente', 'Satisfeito', 'Muito Satisfeito']
+        def build_satisfaction_by_strategy():
+            # Criar gráfico comparativo de satisfação por estratégia e tipo
+            fig = px.bar(
+                satisfaction_df,
+                x='Estratégia',
+                y='Satisfação Média',
+                color='Tipo',
+                barmode='group',
+                title='Nível de Satisfação Médio por Estratégia de Habitação',
+                color_discrete_map={
+                    'Arrendamento': PRIMARY_COLORS[0],
+                    'Compra': PRIMARY_COLORS[1]
+                }
+            )
+            fig.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                xaxis={'categoryorder':'total descending'},
+                yaxis=dict(
+                    range=[0, 5],
+                    tickvals=[1, 2, 3, 4, 5],
+                    ticktext=['Muito Insatisfeito', 'Insatisfeito', 'Indiferente', 'Satisfeito', 'Muito Satisfeito']
+                )
             )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab1", "satisfaction_by_strategy", version, build_satisfaction_by_strategy)
         )
-        st.plotly_chart(fig)
         
         st.markdown("""
         Este gráfico mostra a relação entre as estratégias utilizadas para encontrar habitação e o nível 
@@ -1,8 +1,14 @@
 # tab2_geographic_analysis.py
 import streamlit as st
 import plotly.express as px
-import pandas as pd
+import plotly.graph_objects as go
 from config import *
+from analytics.affordability import HIGH_BURDEN_LABEL, cached_rent_burden_simulation
+from analytics.box_stats import box_summary, cached_box_summary
+from charts import box_from_summary
+from data.districts import district_rows
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 def show_geographic_analysis_tab(df):
     """
@@ -16,6 +22,7 @@ def show_geographic_analysis_tab(df):
     df (DataFrame): The processed housing data
     """
     st.header("Análise da Distribuição Geográfica")
+    version = dataset_version(df)
     
     # Introdução com estilo melhorado
     st.markdown("""
@@ -37,10 +44,10 @@ def show_geographic_analysis_tab(df):
         st.metric("Total de Distritos", total_districts)
     with col2:
         most_expensive_district = df[df['housing_situation'] == 'Arrendamento'].groupby('distrito')['valor-mensal-renda'].mean().idxmax()
-        st.metric("Distrito Mais Caro (Arrendamento)", most_expensive_district.capitalize())
+        st.metric("Distrito Mais Caro (Arrendamento)", most_expensive_district)
     with col3:
         highest_ownership = df.groupby('distrito')['housing_situation'].apply(lambda x: (x == 'Casa Própria').mean() * 100).idxmax()
-        st.metric("Taxa Mais Alta de Propriedade", highest_ownership.capitalize())
+        st.metric("Taxa Mais Alta de Propriedade", highest_ownership)
     
     # Create map placeholders
     col1, col2 = st.columns([3, 1])
@@ -48,27 +55,30 @@ def show_geographic_analysis_tab(df):
     with col1:
         # Districts distribution with improved aesthetics
         st.subheader("Distribuição Habitacional por Distrito")
-        district_counts = df.groupby(['distrito', 'housing_situation']).size().reset_index(name='count')
-        fig = px.bar(
-            district_counts,
-            x='distrito',
-            y='count',
-            color='housing_situation',
-            color_discrete_map=HOUSING_COLORS,
-            title='Situações Habitacionais por Distrito',
-            labels={'distrito': 'Distrito', 'count': 'Contagem', 'housing_situation': 'Situação Habitacional'}
-        )
-        fig.update_layout(
-            xaxis_title="Distrito",
-            yaxis_title="Número de Residentes",
-            legend_title="Situação Habitacional",
-            height=500,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
-        )
-        st.plotly_chart(fig)
+        def build_district_counts_chart():
+            district_counts = df.groupby(['distrito', 'housing_situation']).size().reset_index(name='count')
+            fig = px.bar(
+                district_counts,
+                x='distrito',
+                y='count',
+                color='housing_situation',
+                color_discrete_map=HOUSING_COLORS,
+                title='Situações Habitacionais por Distrito',
+                labels={'distrito': 'Distrito', 'count': 'Contagem', 'housing_situation': 'Situação Habitacional'}
+            )
+            fig.update_layout(
+                xaxis_title="Distrito",
+                yaxis_title="Número de Residentes",
+                legend_title="Situação Habitacional",
+                height=500,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(cached_figure('tab2', 'district_counts', version, build_district_counts_chart))
         
         st.markdown("""
         **Principais Insights:**
@@ -81,7 +91,6 @@ def show_geographic_analysis_tab(df):
         st.subheader("Principais Distritos")
         top_districts = df['distrito'].value_counts().reset_index()
         top_districts.columns = ['Distrito', 'Contagem']
-        top_districts['Distrito'] = top_districts['Distrito'].str.capitalize()
         top_districts = top_districts.head(5)
         
         st.dataframe(top_districts, hide_index=True)
@@ -108,31 +117,33 @@ def show_geographic_analysis_tab(df):
     # Housing situation by district
     st.subheader("Distribuição das Situações Habitacionais")
     
-    # Calculate percentages
-    district_percentages = df.groupby('distrito')['housing_situation'].value_counts(normalize=True).mul(100).round(1).reset_index(name='percentage')
-    district_percentages = district_percentages.rename(columns={'level_1': 'housing_situation'})
-    district_percentages['distrito'] = district_percentages['distrito'].str.capitalize()
-    
-    fig = px.bar(
-        district_percentages,
-        x='distrito',
-        y='percentage',
-        color='housing_situation',
-        title='Percentagem de Situações Habitacionais por Distrito',
-        labels={'distrito': 'Distrito', 'percentage': 'Percentagem (%)', 'housing_situation': 'Situação Habitacional'},
-        color_discrete_map=HOUSING_COLORS
-    )
-    fig.update_layout(
-        xaxis_title="Distrito",
-        yaxis_title="Percentagem de Residentes",
-        legend_title="Situação Habitacional",
-        height=500,
-        plot_bgcolor=BACKGROUND_COLORS[0],
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0]
-    )
-    st.plotly_chart(fig)
+    def build_district_percentages_chart():
+        # Calculate percentages
+        district_percentages = df.groupby('distrito')['housing_situation'].value_counts(normalize=True).mul(100).round(1).reset_index(name='percentage')
+        district_percentages = district_percentages.rename(columns={'level_1': 'housing_situation'})
+        
+        fig = px.bar(
+            district_percentages,
+            x='distrito',
+            y='percentage',
+            color='housing_situation',
+            title='Percentagem de Situações Habitacionais por Distrito',
+            labels={'distrito': 'Distrito', 'percentage': 'Percentagem (%)', 'housing_situation': 'Situação Habitacional'},
+            color_discrete_map=HOUSING_COLORS
+        )
+        fig.update_layout(
+            xaxis_title="Distrito",
+            yaxis_title="Percentagem de Residentes",
+            legend_title="Situação Habitacional",
+            height=500,
+            plot_bgcolor=BACKGROUND_COLORS[0],
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0]
+        )
+        return fig
+
+    st.plotly_chart(cached_figure('tab2', 'district_percentages', version, build_district_percentages_chart))
     
     st.markdown("""
     **O Que Isto Mostra:**
@@ -146,14 +157,16 @@ def show_geographic_analysis_tab(df):
     
     region_selector = st.selectbox(
         "Selecione uma Região para Ver os Custos Habitacionais",
-        options=["Todas"] + sorted(pd.Series(df['distrito'].unique()).str.capitalize().tolist())
+        options=["Todas"] + sorted(df['distrito'].unique().tolist())
     )
     
     if region_selector != "Todas":
-        region_df = df[df['distrito'].str.capitalize() == region_selector]
+        region_df = district_rows(df, version, region_selector)
+        region_filter = (('distrito', region_selector),)
         st.markdown(f"A analisar custos habitacionais para o distrito de **{region_selector}**")
     else:
         region_df = df
+        region_filter = ()
         st.markdown("A analisar custos habitacionais em **todos os distritos**")
     
     col1, col2 = st.columns(2)
@@ -166,14 +179,14 @@ def show_geographic_analysis_tab(df):
             avg_rent = rent_data['valor-mensal-renda'].mean().round(2)
             st.metric("Renda Mensal Média", f"€{avg_rent:.2f}")
             
-            fig = px.box(
-                rent_data,
-                x='distrito',
-                y='valor-mensal-renda',
-                color='distrito',
+            rent_box = cached_box_summary(
+                df, version, 'valor-mensal-renda', by='distrito',
+                filters=(('housing_situation', 'Arrendamento'),) + region_filter
+            )
+            fig = box_from_summary(
+                rent_box,
                 title='Renda Mensal por Distrito',
-                labels={'valor-mensal-renda': 'Renda Mensal (€)', 'distrito': 'Distrito'},
-                color_discrete_sequence=PRIMARY_COLORS
+                color_sequence=PRIMARY_COLORS
             )
             fig.update_layout(
                 xaxis_title="Distrito",
@@ -203,14 +216,14 @@ def show_geographic_analysis_tab(df):
             avg_purchase = purchase_data['valor-compra'].mean().round(2)
             st.metric("Preço Médio de Compra", f"€{avg_purchase:.2f}")
             
-            fig = px.box(
-                purchase_data,
-                x='distrito',
-                y='valor-compra',
-                color='distrito',
+            purchase_box = cached_box_summary(
+                df, version, 'valor-compra', by='distrito',
+                filters=(('housing_situation', 'Casa Própria'),) + region_filter
+            )
+            fig = box_from_summary(
+                purchase_box,
                 title='Preço de Compra de Imóveis por Distrito',
-                labels={'valor-compra': 'Preço de Compra (€)', 'distrito': 'Distrito'},
-                color_discrete_sequence=SECONDARY_COLORS
+                color_sequence=SECONDARY_COLORS
             )
             fig.update_layout(
                 xaxis_title="Distrito",
@@ -240,33 +253,35 @@ def show_geographic_analysis_tab(df):
     with col1:
         # Rent burden by district
         rent_burden_data = df[df['housing_situation'] == 'Arrendamento'].dropna(subset=['rent_burden', 'distrito'])
-        rent_burden_data['distrito'] = rent_burden_data['distrito'].str.capitalize()
         if not rent_burden_data.empty:
-            burden_counts = rent_burden_data.groupby(['distrito', 'rent_burden']).size().reset_index(name='count')
-            
-            fig = px.bar(
-                burden_counts,
-                x='distrito',
-                y='count',
-                color='rent_burden',
-                title='Sobrecarga de Renda por Distrito',
-                labels={'distrito': 'Distrito', 'count': 'Contagem', 'rent_burden': 'Sobrecarga de Renda'},
-                category_orders={
-                    'rent_burden': ['≤30% (Affordable)', '31-50% (Moderate)', '51-80% (High)', '>80% (Very High)', 'Unknown']
-                },
-                color_discrete_map=RENT_BURDEN_COLORS
-            )
-            fig.update_layout(
-                xaxis_title="Distrito",
-                yaxis_title="Número de Residentes",
-                legend_title="Sobrecarga de Renda",
-                height=500,
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                font_color=TEXT_COLORS[2],
-                title_font_color=TEXT_COLORS[0]
-            )
-            st.plotly_chart(fig)
+            def build_burden_by_district_chart():
+                burden_counts = rent_burden_data.groupby(['distrito', 'rent_burden']).size().reset_index(name='count')
+                
+                fig = px.bar(
+                    burden_counts,
+                    x='distrito',
+                    y='count',
+                    color='rent_burden',
+                    title='Sobrecarga de Renda por Distrito',
+                    labels={'distrito': 'Distrito', 'count': 'Contagem', 'rent_burden': 'Sobrecarga de Renda'},
+                    category_orders={
+                        'rent_burden': ['≤30% (Affordable)', '31-50% (Moderate)', '51-80% (High)', '>80% (Very High)', 'Unknown']
+                    },
+                    color_discrete_map=RENT_BURDEN_COLORS
+                )
+                fig.update_layout(
+                    xaxis_title="Distrito",
+                    yaxis_title="Número de Residentes",
+                    legend_title="Sobrecarga de Renda",
+                    height=500,
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    font_color=TEXT_COLORS[2],
+                    title_font_color=TEXT_COLORS[0]
+                )
+                return fig
+
+            st.plotly_chart(cached_figure('tab2', 'burden_by_district', version, build_burden_by_district_chart))
             
             st.markdown("""
             **Explicação da Sobrecarga de Renda:**
@@ -281,31 +296,29 @@ def show_geographic_analysis_tab(df):
         # Property age by district
         if 'ano-compra' in df.columns:
             purchase_year_data = df[df['housing_situation'] == 'Casa Própria'].dropna(subset=['ano-compra', 'distrito'])
-            purchase_year_data['distrito'] = purchase_year_data['distrito'].str.capitalize()
             if not purchase_year_data.empty:
                 # Calculate property age
                 current_year = 2025  # Current year of analysis
                 purchase_year_data['property_age'] = current_year - purchase_year_data['ano-compra']
                 
-                fig = px.box(
-                    purchase_year_data,
-                    x='distrito',
-                    y='property_age',
-                    color='distrito',
-                    title='Idade dos Imóveis por Distrito',
-                    labels={'property_age': 'Idade do Imóvel (Anos)', 'distrito': 'Distrito'},
-                    color_discrete_sequence=ACCENT_COLORS
-                )
-                fig.update_layout(
-                    xaxis_title="Distrito",
-                    yaxis_title="Idade do Imóvel (Anos)",
-                    height=500,
-                    plot_bgcolor=BACKGROUND_COLORS[0],
-                    paper_bgcolor=BACKGROUND_COLORS[3],
-                    font_color=TEXT_COLORS[2],
-                    title_font_color=TEXT_COLORS[0]
-                )
-                st.plotly_chart(fig)
+                def build_property_age_chart():
+                    fig = box_from_summary(
+                        box_summary(purchase_year_data, 'property_age', by='distrito'),
+                        title='Idade dos Imóveis por Distrito',
+                        color_sequence=ACCENT_COLORS
+                    )
+                    fig.update_layout(
+                        xaxis_title="Distrito",
+                        yaxis_title="Idade do Imóvel (Anos)",
+                        height=500,
+                        plot_bgcolor=BACKGROUND_COLORS[0],
+                        paper_bgcolor=BACKGROUND_COLORS[3],
+                        font_color=TEXT_COLORS[2],
+                        title_font_color=TEXT_COLORS[0]
+                    )
+                    return fig
+
+                st.plotly_chart(cached_figure('tab2', 'property_age', version, build_property_age_chart))
                 
                 st.markdown("""
                 **Análise da Idade dos Imóveis:**
@@ -316,4 +329,55 @@ def show_geographic_analysis_tab(df):
             else:
                 st.write("Não há dados sobre a idade dos imóveis disponíveis para análise.")
         else:
-            st.write("Dados sobre a idade dos imóveis não disponíveis no conjunto de dados.")
\ No newline at end of file
+            st.write("Dados sobre a idade dos imóveis não disponíveis no conjunto de dados.")
+    
+    # Monte Carlo uncertainty of the high rent burden share by district
+    st.subheader("Incerteza da Sobrecarga Elevada por Distrito")
+    district_simulation = cached_rent_burden_simulation(df, version, by='distrito')
+    district_high_burden = district_simulation[district_simulation['category'] == HIGH_BURDEN_LABEL]
+    district_high_burden = district_high_burden.dropna(subset=['distrito']).sort_values('mean_share', ascending=False)
+    if not district_high_burden.empty:
+        def build_high_burden_uncertainty_chart():
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                x=district_high_burden['distrito'],
+                y=district_high_burden['mean_share'],
+                marker_color=RENT_BURDEN_COLORS['51-80% (High)'],
+                error_y=dict(
+                    type='data',
+                    symmetric=False,
+                    array=district_high_burden['upper'] - district_high_burden['mean_share'],
+                    arrayminus=district_high_burden['mean_share'] - district_high_burden['lower'],
+                    color=TEXT_COLORS[0]
+                ),
+                name='Simulação (média e intervalo 90%)'
+            ))
+            fig.add_trace(go.Scatter(
+                x=district_high_burden['distrito'],
+                y=district_high_burden['midpoint_share'],
+                mode='markers',
+                marker=dict(color=TEXT_COLORS[0], symbol='diamond', size=9),
+                name='Ponto médio do escalão'
+            ))
+            fig.update_layout(
+                title='Arrendatários com Sobrecarga >50% por Distrito',
+                xaxis_title="Distrito",
+                yaxis_title="Percentagem de Arrendatários (%)",
+                height=450,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(cached_figure('tab2', 'high_burden_uncertainty', version, build_high_burden_uncertainty_chart))
+        
+        st.markdown("""
+        **Como ler este gráfico:**
+        - As barras mostram a percentagem média de arrendatários com sobrecarga acima de 50% em milhares de simulações do rendimento dentro de cada escalão
+        - As barras de erro mostram o intervalo de 90% das simulações; distritos com poucos inquiridos têm intervalos mais largos
+        - Os losangos mostram o valor obtido com o ponto médio de cada escalão de rendimento
+        """)
+    else:
+        st.write("Não há dados de arrendamento suficientes para a simulação.")
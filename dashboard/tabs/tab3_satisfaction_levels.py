@@ -1,26 +1,23 @@
 # tab3_satisfaction_levels.py
-import json
 import sys
 from pathlib import Path
 
-import folium
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
-from streamlit_folium import folium_static
 
 # Add the parent directory to system path
 sys.path.append(str(Path(__file__).parent.parent))
-from config import BACKGROUND_COLORS, COLOR_SCALES, SATISFACTION_COLORS, TEXT_COLORS
-
-# Create a numeric satisfaction score with Portuguese labels mapping to English values in the data
-satisfaction_scores = {
-    "Very Satisfied": 5,  # muito-satisfeito
-    "Satisfied": 4,      # satisfeito
-    "Neutral": 3,        # indiferente
-    "Dissatisfied": 2,   # insatisfeito
-    "Very Dissatisfied": 1, # muito-insatisfeito
-}
+from config import BACKGROUND_COLORS, COLOR_SCALES, RENT_BURDEN_COLORS, SATISFACTION_COLORS, TEXT_COLORS
+import charts
+from analytics.affordability import HIGH_BURDEN_LABEL, cached_rent_burden_simulation
+from analytics.income import INCOME_BRACKET_LABELS, INCOME_BRACKETS, cached_income_satisfaction
+from analytics.reasons import cached_reason_stats
+from data.districts import district_table
+from data.geo import district_geojson
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 # Mapping between English data values and Portuguese display labels
 satisfaction_pt_labels = {
@@ -49,6 +46,7 @@ def show_satisfaction_levels_tab(df):
     df (DataFrame): The processed housing data
     """
     st.header("Análise de Níveis de Satisfação Habitacional")
+    version = dataset_version(df)
 
     # Introdução com estilo melhorado
     st.markdown(
@@ -104,37 +102,6 @@ def show_satisfaction_levels_tab(df):
             value=f"{dissatisfied_pct:.1f}%",
             help="Percentagem de respostas 'Insatisfeito' ou 'Muito Insatisfeito'",
         )
-    # Define better income bracket ordering and visualization
-    income_order = [
-        "sem-rendimento",
-        "<7001",
-        "7001-12000",
-        "12001-20000",
-        "20001-35000",
-        "35001-50000",
-        "50001-80000",
-        ">80001",
-    ]
-
-    # More human-readable income labels for display
-    income_labels = {
-        "sem-rendimento": "Sem Rendimento",
-        "<7001": "Até €7.000",
-        "7001-12000": "€7.001-€12.000",
-        "12001-20000": "€12.001-€20.000",
-        "20001-35000": "€20.001-€35.000",
-        "35001-50000": "€35.001-€50.000",
-        "50001-80000": "€50.001-€80.000",
-        ">80001": "Mais de €80.000",
-    }
-
-    # Create a categorical variable for income with proper ordering
-    df["income_category"] = pd.Categorical(
-        df["rendimento-anual"].fillna("Unknown"),
-        categories=income_order + ["Unknown"],
-        ordered=True,
-    )
-
     # Interactive filter by satisfaction level
     st.subheader("Explorar Demografia por Nível de Satisfação")
     st.markdown("""
@@ -164,13 +131,13 @@ def show_satisfaction_levels_tab(df):
         selected_income = st.multiselect(
             "Selecione Escalões de Rendimento",
             options=[
-                income_labels[inc]
-                for inc in income_order
+                INCOME_BRACKET_LABELS[inc]
+                for inc in INCOME_BRACKETS
                 if inc in df["rendimento-anual"].unique()
             ],
             default=[
-                income_labels[inc]
-                for inc in income_order
+                INCOME_BRACKET_LABELS[inc]
+                for inc in INCOME_BRACKETS
                 if inc in df["rendimento-anual"].unique()
             ],
             format_func=lambda x: x,
@@ -178,7 +145,7 @@ def show_satisfaction_levels_tab(df):
 
         # Convert back to original format for filtering
         selected_income_original = [
-            key for key, value in income_labels.items() if value in selected_income
+            key for key, value in INCOME_BRACKET_LABELS.items() if value in selected_income
         ]
 
     # Apply filters
@@ -194,6 +161,14 @@ def show_satisfaction_levels_tab(df):
     else:
         filtered_df = df
 
+    # Widget values the filtered charts depend on (figure cache keys)
+    income_filters = {"satisfaction": selected_satisfaction, "income": selected_income_original}
+
+    # Every income × housing × satisfaction statistic below comes from one aggregation
+    income_stats = cached_income_satisfaction(
+        df, version, tuple(selected_satisfaction), tuple(selected_income_original)
+    )
+
     # Income vs. Satisfaction Analysis
     st.subheader("Análise de Rendimento vs. Satisfação")
 
@@ -203,77 +178,73 @@ def show_satisfaction_levels_tab(df):
     )
 
     with income_tab1:
-        # Group by ordered income category for better visualization
-        income_satisfaction = (
-            filtered_df.groupby("income_category")["satisfaction_level"]
-            .value_counts(normalize=True)
-            .mul(100)
-            .round(1)
-            .unstack()
-            .fillna(0)
-        )
+        def build_income_distribution():
+            # Share of each satisfaction level per income bracket, in bracket order
+            income_satisfaction = income_stats.distribution.copy()
 
-        # Replace category names with more readable versions for the chart
-        income_satisfaction.index = income_satisfaction.index.map(
-            lambda x: income_labels.get(x, x)
-        )
+            # Replace category names with more readable versions for the chart
+            income_satisfaction.index = income_satisfaction.index.map(
+                lambda x: INCOME_BRACKET_LABELS.get(x, x)
+            )
         
-        # Replace English column names with Portuguese labels
-        income_satisfaction.columns = [satisfaction_pt_labels.get(col, col) for col in income_satisfaction.columns]
+            # Replace English column names with Portuguese labels
+            income_satisfaction.columns = [satisfaction_pt_labels.get(col, col) for col in income_satisfaction.columns]
+
+            fig1 = px.bar(
+                income_satisfaction,
+                barmode="stack",
+                title="Distribuição de Satisfação por Escalão de Rendimento (%)",
+                labels={"income_category": "Rendimento Anual", "value": "Percentagem"},
+                color_discrete_map=SATISFACTION_COLORS_PT,
+            )
+            fig1.update_layout(
+                legend_title="Nível de Satisfação",
+                height=500,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig1
 
-        fig1 = px.bar(
-            income_satisfaction,
-            barmode="stack",
-            title="Distribuição de Satisfação por Escalão de Rendimento (%)",
-            labels={"income_category": "Rendimento Anual", "value": "Percentagem"},
-            color_discrete_map=SATISFACTION_COLORS_PT,
-        )
-        fig1.update_layout(
-            legend_title="Nível de Satisfação",
-            height=500,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
+        st.plotly_chart(
+            cached_figure("tab3", "income_distribution", version, build_income_distribution, income_filters),
+            use_container_width=True,
         )
-        st.plotly_chart(fig1, use_container_width=True)
 
     with income_tab2:
-        # Calculate average satisfaction score by income bracket (using categorical ordering)
-        filtered_df["satisfaction_score"] = filtered_df["satisfaction_level"].map(
-            satisfaction_scores
-        )
-
-        # Group by income category to maintain proper order
-        avg_satisfaction = (
-            filtered_df.groupby("income_category")["satisfaction_score"]
-            .mean()
-            .reset_index()
-        )
-        avg_satisfaction.columns = ["Escalão de Rendimento", "Pontuação Média de Satisfação"]
+        def build_income_mean_satisfaction():
+            # Average satisfaction score by income bracket (in categorical order)
+            avg_satisfaction = income_stats.category_means.reset_index()
+            avg_satisfaction.columns = ["Escalão de Rendimento", "Pontuação Média de Satisfação"]
+
+            # Replace with readable labels
+            avg_satisfaction["Escalão de Rendimento"] = avg_satisfaction["Escalão de Rendimento"].map(
+                lambda x: INCOME_BRACKET_LABELS.get(x, x)
+            )
 
-        # Replace with readable labels
-        avg_satisfaction["Escalão de Rendimento"] = avg_satisfaction["Escalão de Rendimento"].map(
-            lambda x: income_labels.get(x, x)
-        )
+            fig2 = px.bar(
+                avg_satisfaction,
+                x="Escalão de Rendimento",
+                y="Pontuação Média de Satisfação",
+                title="Pontuação Média de Satisfação por Escalão de Rendimento",
+                color="Pontuação Média de Satisfação",
+                color_continuous_scale=COLOR_SCALES["sequential"],
+                text_auto=".2f",
+            )
+            fig2.update_layout(
+                height=500,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig2
 
-        fig2 = px.bar(
-            avg_satisfaction,
-            x="Escalão de Rendimento",
-            y="Pontuação Média de Satisfação",
-            title="Pontuação Média de Satisfação por Escalão de Rendimento",
-            color="Pontuação Média de Satisfação",
-            color_continuous_scale=COLOR_SCALES["sequential"],
-            text_auto=".2f",
-        )
-        fig2.update_layout(
-            height=500,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
+        st.plotly_chart(
+            cached_figure("tab3", "income_mean_satisfaction", version, build_income_mean_satisfaction, income_filters),
+            use_container_width=True,
         )
-        st.plotly_chart(fig2, use_container_width=True)
 
         # Calculate correlation
         corr = filtered_df["rendimento_numerical"].corr(
@@ -292,24 +263,6 @@ def show_satisfaction_levels_tab(df):
         col1, col2 = st.columns([3, 2])
 
         with col1:
-            # Create income groups for visualization
-            filtered_df["income_group"] = pd.cut(
-                filtered_df["rendimento_numerical"],
-                bins=[0, 7000, 12000, 20000, 35000, 50000, 80000, float("inf")],
-                labels=[
-                    "Sem/Baixo Rendimento",
-                    "€7K-€12K",
-                    "€12K-€20K",
-                    "€20K-€35K",
-                    "€35K-€50K",
-                    "€50K-€80K",
-                    "Mais de €80K",
-                ],
-            )
-
-            # Handle NaN values in 'area_numerical' column
-            filtered_df["area_numerical"] = filtered_df["area_numerical"].fillna(0)
-
             # Create a mapping for housing situation labels
             housing_situation_pt = {
                 "Arrendamento": "Arrendamento",
@@ -317,92 +270,72 @@ def show_satisfaction_levels_tab(df):
                 "Others": "Outros"
             }
             
-            # Create a new copy with Portuguese housing situation labels for visualization
-            viz_df = filtered_df.copy()
-            viz_df["housing_situation_pt"] = viz_df["housing_situation"].map(housing_situation_pt)
-
-            # Scatter plot with better grouping, labels and theme
-            fig3 = px.scatter(
-                viz_df,
-                x="rendimento_numerical",
-                y="satisfaction_score",
-                color="housing_situation_pt",
-                size="area_numerical",
-                hover_data=["distrito", "concelho", "income_group"],
-                opacity=0.7,
-                title="Rendimento vs. Satisfação (Tamanho = Área Habitacional)",
-                labels={
-                    "rendimento_numerical": "Rendimento Anual (€)",
-                    "satisfaction_score": "Pontuação de Satisfação (1-5)",
-                    "housing_situation_pt": "Situação Habitacional"
-                },
-                color_discrete_sequence=COLOR_SCALES["qualitative"]
-            )
+            def build_income_scatter():
+                # Only the plotted columns are copied; missing areas are drawn with size 0
+                viz_df = filtered_df[
+                    ["rendimento_numerical", "satisfaction_score", "area_numerical", "distrito", "concelho", "income_group"]
+                ].assign(
+                    area_numerical=filtered_df["area_numerical"].fillna(0),
+                    housing_situation_pt=filtered_df["housing_situation"].map(housing_situation_pt),
+                )
 
-            # Add income group reference lines
-            for income_level in [7000, 12000, 20000, 35000, 50000, 80000]:
-                fig3.add_vline(
-                    x=income_level,
-                    line_dash="dash",
-                    line_color=TEXT_COLORS[1],
-                    opacity=0.5
+                # Scatter plot with better grouping, labels and theme
+                fig3 = charts.scatter(
+                    viz_df,
+                    x="rendimento_numerical",
+                    y="satisfaction_score",
+                    color="housing_situation_pt",
+                    size="area_numerical",
+                    hover_data=["distrito", "concelho", "income_group"],
+                    opacity=0.7,
+                    title="Rendimento vs. Satisfação (Tamanho = Área Habitacional)",
+                    labels={
+                        "rendimento_numerical": "Rendimento Anual (€)",
+                        "satisfaction_score": "Pontuação de Satisfação (1-5)",
+                        "housing_situation_pt": "Situação Habitacional"
+                    },
+                    color_discrete_sequence=COLOR_SCALES["qualitative"]
                 )
 
-            fig3.update_layout(
-                height=450,
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                font_color=TEXT_COLORS[2],
-                title_font_color=TEXT_COLORS[0]
+                # Add income group reference lines
+                for income_level in [7000, 12000, 20000, 35000, 50000, 80000]:
+                    fig3.add_vline(
+                        x=income_level,
+                        line_dash="dash",
+                        line_color=TEXT_COLORS[1],
+                        opacity=0.5
+                    )
+
+                fig3.update_layout(
+                    height=450,
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    font_color=TEXT_COLORS[2],
+                    title_font_color=TEXT_COLORS[0]
+                )
+                return fig3
+
+            st.plotly_chart(
+                cached_figure("tab3", "income_scatter", version, build_income_scatter, income_filters),
+                use_container_width=True,
             )
-            st.plotly_chart(fig3, use_container_width=True)
 
         with col2:
             # Key insights based on the data with improved income grouping
             st.subheader("Insights Principais")
 
-            # Define income groups for analysis
-            income_groups = {
-                "Baixo Rendimento": filtered_df[filtered_df["rendimento_numerical"] < 12000],
-                "Rendimento Médio": filtered_df[
-                    (filtered_df["rendimento_numerical"] >= 12000)
-                    & (filtered_df["rendimento_numerical"] < 35000)
-                ],
-                "Rendimento Alto": filtered_df[
-                    (filtered_df["rendimento_numerical"] >= 35000)
-                    & (filtered_df["rendimento_numerical"] < 80000)
-                ],
-                "Rendimento Muito Alto": filtered_df[
-                    filtered_df["rendimento_numerical"] >= 80000
-                ],
-            }
-
-            # Calculate satisfaction by income group
-            income_group_satisfaction = {
-                group: data["satisfaction_score"].mean()
-                for group, data in income_groups.items()
-                if not data.empty
-            }
-
-            # Calculate by ownership within income groups
-            ownership_by_income = {}
-            for group, data in income_groups.items():
-                if not data.empty:
-                    owned = data[data["housing_situation"] == "Casa Própria"][
-                        "satisfaction_score"
-                    ].mean()
-                    rented = data[data["housing_situation"] == "Arrendamento"][
-                        "satisfaction_score"
-                    ].mean()
-                    ownership_by_income[group] = (owned, rented)
+            # Satisfaction by income band, overall and by ownership (load-time income_band)
+            band_housing = income_stats.band_housing_means.reindex(
+                columns=["Casa Própria", "Arrendamento"]
+            )
 
             # Display metrics
             st.markdown("**Satisfação por Grupo de Rendimento:**")
-            for group, score in income_group_satisfaction.items():
+            for group, score in income_stats.band_means.items():
                 st.metric(label=group, value=f"{score:.2f}/5")
 
             st.markdown("**Interação Rendimento-Propriedade:**")
-            for group, (owned, rented) in ownership_by_income.items():
+            for group, (owned, rented) in band_housing.iterrows():
                 if not (pd.isna(owned) or pd.isna(rented)):
                     st.markdown(
                         f"**{group}**: Própria {owned:.2f} vs Arrendada {rented:.2f} (Dif: {owned - rented:.2f})"
@@ -414,51 +347,54 @@ def show_satisfaction_levels_tab(df):
     col1, col2 = st.columns([3, 2])
 
     with col1:
-        # Create a heatmap of satisfaction by housing situation
-        satisfaction_pivot = pd.crosstab(
-            df["housing_situation"], df["satisfaction_level"]
-        )
+        def build_housing_heatmap():
+            # Create a heatmap of satisfaction by housing situation
+            satisfaction_pivot = pd.crosstab(
+                df["housing_situation"], df["satisfaction_level"]
+            )
 
-        # Map housing situation names to Portuguese
-        satisfaction_pivot.index = satisfaction_pivot.index.map(
-            lambda x: housing_situation_pt.get(x, x)
-        )
+            # Map housing situation names to Portuguese
+            satisfaction_pivot.index = satisfaction_pivot.index.map(
+                lambda x: housing_situation_pt.get(x, x)
+            )
 
-        # Reorder columns for better visualization
-        ordered_cols = [
-            "Very Satisfied",
-            "Satisfied",
-            "Neutral",
-            "Dissatisfied",
-            "Very Dissatisfied",
-        ]
-        ordered_cols = [
-            col for col in ordered_cols if col in satisfaction_pivot.columns
-        ]
-        satisfaction_pivot = satisfaction_pivot[ordered_cols]
+            # Reorder columns for better visualization
+            ordered_cols = [
+                "Very Satisfied",
+                "Satisfied",
+                "Neutral",
+                "Dissatisfied",
+                "Very Dissatisfied",
+            ]
+            ordered_cols = [
+                col for col in ordered_cols if col in satisfaction_pivot.columns
+            ]
+            satisfaction_pivot = satisfaction_pivot[ordered_cols]
         
-        # Translate column names to Portuguese
-        satisfaction_pivot.columns = [satisfaction_pt_labels.get(col, col) for col in satisfaction_pivot.columns]
+            # Translate column names to Portuguese
+            satisfaction_pivot.columns = [satisfaction_pt_labels.get(col, col) for col in satisfaction_pivot.columns]
+
+            fig = px.imshow(
+                satisfaction_pivot,
+                text_auto=True,
+                color_continuous_scale=COLOR_SCALES["sequential"],
+                title="Níveis de Satisfação por Situação Habitacional",
+                labels={
+                    "x": "Nível de Satisfação",
+                    "y": "Situação Habitacional",
+                    "color": "Contagem",
+                },
+            )
+            fig.update_layout(
+                height=400,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig
 
-        fig = px.imshow(
-            satisfaction_pivot,
-            text_auto=True,
-            color_continuous_scale=COLOR_SCALES["sequential"],
-            title="Níveis de Satisfação por Situação Habitacional",
-            labels={
-                "x": "Nível de Satisfação",
-                "y": "Situação Habitacional",
-                "color": "Contagem",
-            },
-        )
-        fig.update_layout(
-            height=400,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
-        )
-        st.plotly_chart(fig)
+        st.plotly_chart(cached_figure("tab3", "housing_heatmap", version, build_housing_heatmap))
 
         # Add explanation for the heatmap
         st.markdown("""
@@ -468,30 +404,33 @@ def show_satisfaction_levels_tab(df):
         """)
 
     with col2:
-        # Pie chart of overall satisfaction - Create a copy with translated labels
-        satisfaction_counts_df = df["satisfaction_level"].value_counts().reset_index()
-        satisfaction_counts_df.columns = ["Nível de Satisfação", "Contagem"]
+        def build_satisfaction_pie():
+            # Pie chart of overall satisfaction - Create a copy with translated labels
+            satisfaction_counts_df = df["satisfaction_level"].value_counts().reset_index()
+            satisfaction_counts_df.columns = ["Nível de Satisfação", "Contagem"]
         
-        # Map English to Portuguese satisfaction levels
-        satisfaction_counts_df["Nível de Satisfação"] = satisfaction_counts_df["Nível de Satisfação"].map(
-            satisfaction_pt_labels
-        )
+            # Map English to Portuguese satisfaction levels
+            satisfaction_counts_df["Nível de Satisfação"] = satisfaction_counts_df["Nível de Satisfação"].map(
+                satisfaction_pt_labels
+            )
 
-        fig = px.pie(
-            satisfaction_counts_df,
-            values="Contagem",
-            names="Nível de Satisfação",
-            color="Nível de Satisfação",
-            color_discrete_map=SATISFACTION_COLORS_PT,
-            title="Distribuição Geral de Satisfação",
-        )
-        fig.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[3],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
-        )
-        st.plotly_chart(fig)
+            fig = px.pie(
+                satisfaction_counts_df,
+                values="Contagem",
+                names="Nível de Satisfação",
+                color="Nível de Satisfação",
+                color_discrete_map=SATISFACTION_COLORS_PT,
+                title="Distribuição Geral de Satisfação",
+            )
+            fig.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[3],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig
+
+        st.plotly_chart(cached_figure("tab3", "satisfaction_pie", version, build_satisfaction_pie))
 
         # Calculate and display the percentage of satisfied vs dissatisfied
         satisfied_pct = (
@@ -540,32 +479,34 @@ def show_satisfaction_levels_tab(df):
         "reason_partilho-casa-com-desconhecidos": "Partilho casa com desconhecidos",
     }
 
-    # Calculate frequencies of each reason
-    reason_counts = {}
-    for col in dissatisfaction_cols:
-        if col in reason_mapping:
-            reason_counts[reason_mapping[col]] = df[col].sum()
-
+    # Frequencies of every reason from the cached reason matrix statistics
+    reason_stats = cached_reason_stats(df, version)
+    reason_counts = reason_stats.counts[
+        [col for col in dissatisfaction_cols if col in reason_mapping]
+    ]
     reason_df = pd.DataFrame(
-        {"Razão": list(reason_counts.keys()), "Contagem": list(reason_counts.values())}
+        {"Razão": reason_counts.index.map(reason_mapping), "Contagem": reason_counts.to_numpy()}
     ).sort_values("Contagem", ascending=False)
 
-    # Create horizontal bar chart
-    fig = px.bar(
-        reason_df,
-        y="Razão",
-        x="Contagem",
-        orientation="h",
-        color="Contagem",
-        color_continuous_scale=COLOR_SCALES["sequential"],
-        title="Razões para Insatisfação Habitacional",
-    )
-    fig.update_layout(
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0],
-    )
-    st.plotly_chart(fig)
+    def build_reasons():
+        # Create horizontal bar chart
+        fig = px.bar(
+            reason_df,
+            y="Razão",
+            x="Contagem",
+            orientation="h",
+            color="Contagem",
+            color_continuous_scale=COLOR_SCALES["sequential"],
+            title="Razões para Insatisfação Habitacional",
+        )
+        fig.update_layout(
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0],
+        )
+        return fig
+
+    st.plotly_chart(cached_figure("tab3", "reasons", version, build_reasons))
 
     # Add explanation for the dissatisfaction reasons
     top_reasons = reason_df.head(3)["Razão"].tolist()
@@ -579,6 +520,39 @@ def show_satisfaction_levels_tab(df):
     Estas conclusões sugerem que as intervenções políticas devem focar-se na acessibilidade, eficiência de localização e qualidade habitacional.
     """)
 
+    # Which reasons are cited together
+    with st.expander("Razões Citadas em Conjunto", expanded=False):
+        pair_measure = st.radio(
+            "Medida",
+            ["Co-ocorrência", "Lift"],
+            horizontal=True,
+            key="tab3_reason_pair_measure",
+            help="Lift > 1 indica que duas razões são citadas em conjunto mais vezes do que seria de esperar se fossem independentes.",
+        )
+        def build_reason_pairs():
+            pair_matrix = reason_stats.co_occurrence if pair_measure == "Co-ocorrência" else reason_stats.lift
+            pair_matrix = pair_matrix.rename(index=reason_mapping, columns=reason_mapping)
+
+            fig = px.imshow(
+                pair_matrix.round(2),
+                text_auto=True,
+                color_continuous_scale=COLOR_SCALES["sequential"],
+                title=f"{pair_measure} das Razões de Insatisfação",
+                aspect="auto",
+            )
+            fig.update_layout(
+                height=550,
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab3", "reason_pairs", version, build_reason_pairs, {"measure": pair_measure}),
+            use_container_width=True,
+        )
+
     # Interactive filter by satisfaction level
     st.subheader("Explorar Demografia por Nível de Satisfação")
     st.markdown("""
@@ -605,40 +579,42 @@ def show_satisfaction_levels_tab(df):
     else:
         filtered_df = df
 
+    satisfaction_filter = {"satisfaction": selected_satisfaction}
+
     # Income vs. satisfaction
     st.subheader("Rendimento vs. Satisfação")
 
 
 
-    # Satisfaction by income - only compute this once
-    income_satisfaction = (
-        filtered_df.groupby("rendimento_clean")["satisfaction_level"]
-        .value_counts()
-        .unstack()
-        .fillna(0)
-    )
+    def build_income_satisfaction_counts():
+        # Satisfaction by income - only compute this once
+        income_satisfaction = (
+            filtered_df.groupby("rendimento_clean")["satisfaction_level"]
+            .value_counts()
+            .unstack()
+            .fillna(0)
+        )
 
-    # Convert column names to Portuguese
-    income_satisfaction.columns = [satisfaction_pt_labels.get(col, col) for col in income_satisfaction.columns]
+        # Convert column names to Portuguese
+        income_satisfaction.columns = [satisfaction_pt_labels.get(col, col) for col in income_satisfaction.columns]
 
-    # Create only one chart
-    fig = px.bar(
-        income_satisfaction,
-        barmode="stack",
-        title="Níveis de Satisfação por Escalão de Rendimento",
-        labels={"rendimento_clean": "Rendimento Anual (€)", "value": "Contagem"},
-        color_discrete_map=SATISFACTION_COLORS_PT,
-    )
+        # Create only one chart
+        fig = px.bar(
+            income_satisfaction,
+            barmode="stack",
+            title="Níveis de Satisfação por Escalão de Rendimento",
+            labels={"rendimento_clean": "Rendimento Anual (€)", "value": "Contagem"},
+            color_discrete_map=SATISFACTION_COLORS_PT,
+        )
 
-    # Display the chart only once
-    st.plotly_chart(fig)
+        # Display the chart only once
+        return fig
 
-    # Calculate correlation between income and satisfaction
-    filtered_df["satisfaction_score"] = filtered_df["satisfaction_level"].map(
-        satisfaction_scores
+    st.plotly_chart(
+        cached_figure("tab3", "income_satisfaction_counts", version, build_income_satisfaction_counts, satisfaction_filter),
     )
 
-    # Calculate correlation
+    # Calculate correlation between income and the load-time satisfaction score
     corr = filtered_df["rendimento_numerical"].corr(filtered_df["satisfaction_score"])
 
     st.markdown(f"""
@@ -705,27 +681,29 @@ def show_satisfaction_levels_tab(df):
 
         rent_satisfaction_melted = rent_satisfaction_melted.sort_values("rent_burden")
 
-        fig = px.bar(
-            rent_satisfaction_melted,
-            x="rent_burden_pt",  # Use Portuguese labels for display
-            y="Contagem",
-            color="Nível de Satisfação",
-            color_discrete_map=SATISFACTION_COLORS_PT,
-            title="Níveis de Satisfação por Sobrecarga de Renda (% do Rendimento)",
-            labels={"rent_burden_pt": "Renda como % do Rendimento"},
-        )
-        fig.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
-        )
-        st.plotly_chart(fig)
+        def build_rent_burden_satisfaction():
+            fig = px.bar(
+                rent_satisfaction_melted,
+                x="rent_burden_pt",  # Use Portuguese labels for display
+                y="Contagem",
+                color="Nível de Satisfação",
+                color_discrete_map=SATISFACTION_COLORS_PT,
+                title="Níveis de Satisfação por Sobrecarga de Renda (% do Rendimento)",
+                labels={"rent_burden_pt": "Renda como % do Rendimento"},
+            )
+            fig.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig
 
-        # Calculate average satisfaction by rent burden
-        renters_df["satisfaction_score"] = renters_df["satisfaction_level"].map(
-            satisfaction_scores
+        st.plotly_chart(
+            cached_figure("tab3", "rent_burden_satisfaction", version, build_rent_burden_satisfaction, satisfaction_filter),
         )
+
+        # Calculate average satisfaction by rent burden (satisfaction_score is computed at load)
         avg_satisfaction_by_burden = (
             renters_df.groupby("rent_burden")["satisfaction_score"].mean().reset_index()
         )
@@ -753,6 +731,70 @@ def show_satisfaction_levels_tab(df):
         
         Esta análise suporta a importância de políticas de controlo de rendas e habitação acessível para melhorar a satisfação habitacional geral.
         """)
+
+        # The categories above use the bracket midpoint; the simulation draws incomes within
+        # each bracket and shows how uncertain the high burden share of every level is
+        satisfaction_simulation = cached_rent_burden_simulation(df, version, by="satisfaction_level")
+        high_burden_by_level = satisfaction_simulation[
+            (satisfaction_simulation["category"] == HIGH_BURDEN_LABEL)
+            & satisfaction_simulation["satisfaction_level"].isin(renters_df["satisfaction_level"].unique())
+        ].set_index("satisfaction_level")
+        high_burden_by_level = high_burden_by_level.reindex(
+            [level for level in reversed(satisfaction_pt_labels) if level in high_burden_by_level.index]
+        )
+        high_burden_by_level.index = high_burden_by_level.index.map(satisfaction_pt_labels)
+
+        def build_high_burden_by_satisfaction():
+            fig = go.Figure()
+            fig.add_trace(
+                go.Bar(
+                    x=high_burden_by_level.index,
+                    y=high_burden_by_level["mean_share"],
+                    marker_color=[SATISFACTION_COLORS_PT[level] for level in high_burden_by_level.index],
+                    error_y=dict(
+                        type="data",
+                        symmetric=False,
+                        array=high_burden_by_level["upper"] - high_burden_by_level["mean_share"],
+                        arrayminus=high_burden_by_level["mean_share"] - high_burden_by_level["lower"],
+                        color=TEXT_COLORS[0],
+                    ),
+                    name="Simulação (média e intervalo 90%)",
+                )
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=high_burden_by_level.index,
+                    y=high_burden_by_level["midpoint_share"],
+                    mode="markers",
+                    marker=dict(color=RENT_BURDEN_COLORS[">80% (Very High)"], symbol="diamond", size=10),
+                    name="Ponto médio do escalão",
+                )
+            )
+            fig.update_layout(
+                title="Arrendatários com Sobrecarga >50% por Nível de Satisfação",
+                xaxis_title="Nível de Satisfação",
+                yaxis_title="Percentagem de Arrendatários (%)",
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure(
+                "tab3",
+                "high_burden_by_satisfaction",
+                version,
+                build_high_burden_by_satisfaction,
+                satisfaction_filter,
+            ),
+        )
+        st.markdown("""
+        As barras mostram a percentagem média de arrendatários com sobrecarga acima de 50% em milhares de
+        simulações do rendimento dentro de cada escalão, com o intervalo de 90% das simulações; os losangos
+        mostram o valor obtido com o ponto médio do escalão.
+        """)
     else:
         st.write("Não há dados de arrendamento disponíveis para os níveis de satisfação selecionados.")
 
@@ -776,13 +818,11 @@ def show_satisfaction_levels_tab(df):
         }
 
         # Convert satisfaction levels to numeric scores
-        filtered_df.loc[:, "satisfaction_numeric"] = filtered_df["satisfaction_level"].map(
-            satisfaction_weights
-        )
+        satisfaction_numeric = filtered_df["satisfaction_level"].map(satisfaction_weights)
 
         # Calculate mean satisfaction score by district
         district_satisfaction = (
-            filtered_df.groupby("distrito")["satisfaction_numeric"]
+            satisfaction_numeric.groupby(filtered_df["distrito"])
             .agg(["mean", "count"])
             .reset_index()
         )
@@ -790,34 +830,38 @@ def show_satisfaction_levels_tab(df):
             columns={"mean": "satisfaction_score"}
         )
 
-        # Create visualization
-        fig = px.bar(
-            district_satisfaction,
-            x="distrito",
-            y="satisfaction_score",
-            color="satisfaction_score",
-            color_continuous_scale=COLOR_SCALES["diverging"],
-            title="Pontuação Média de Satisfação por Distrito",
-            labels={
-                "distrito": "Distrito",
-                "satisfaction_score": "Pontuação de Satisfação (-2 a +2)",
-            },
-            hover_data=["count"],  # Include count in hover information
-        )
+        def build_district_satisfaction():
+            # Create visualization
+            fig = px.bar(
+                district_satisfaction,
+                x="distrito",
+                y="satisfaction_score",
+                color="satisfaction_score",
+                color_continuous_scale=COLOR_SCALES["diverging"],
+                title="Pontuação Média de Satisfação por Distrito",
+                labels={
+                    "distrito": "Distrito",
+                    "satisfaction_score": "Pontuação de Satisfação (-2 a +2)",
+                },
+                hover_data=["count"],  # Include count in hover information
+            )
 
-        # Improve the layout
-        fig.update_layout(
-            xaxis_title="Distrito",
-            yaxis_title="Pontuação de Satisfação (-2 a +2)",
-            yaxis=dict(
-                tickmode="linear",
-                tick0=-2,
-                dtick=0.5,
-                range=[-2.1, 2.1],  # Set fixed range for better comparison
-            ),
-        )
+            # Improve the layout
+            fig.update_layout(
+                xaxis_title="Distrito",
+                yaxis_title="Pontuação de Satisfação (-2 a +2)",
+                yaxis=dict(
+                    tickmode="linear",
+                    tick0=-2,
+                    dtick=0.5,
+                    range=[-2.1, 2.1],  # Set fixed range for better comparison
+                ),
+            )
+            return fig
 
-        st.plotly_chart(fig)
+        st.plotly_chart(
+            cached_figure("tab3", "district_satisfaction", version, build_district_satisfaction, satisfaction_filter),
+        )
 
         # Identify districts with highest and lowest satisfaction
         district_satisfaction = district_satisfaction.sort_values(
@@ -885,55 +929,21 @@ def show_satisfaction_levels_tab(df):
 
         # Load the GeoJSON file
         try:
-            with open("distrito_all_s.geojson", "r") as f:
-                portugal_geojson = json.load(f)
-
-            # Ensure district names match between your dataset and GeoJSON
-            # You might need to normalize district names (lowercase, remove accents, etc.)
-            district_satisfaction["distrito_normalized"] = (
-                district_satisfaction["distrito"]
-                .str.lower()
-                .str.normalize("NFKD")
-                .str.encode("ascii", errors="ignore")
-                .str.decode("utf-8")
-            )
+            # Parsed and simplified once per process (read-only, shared between sessions)
+            portugal_geojson = district_geojson()
 
-            # Create a dictionary for mapping district names from your dataset to GeoJSON
-            district_mapping = {
-                "viana do castelo": "viana do castelo",
-                "braga": "braga",
-                "vila real": "vila real",
-                "braganca": "braganca",
-                "aveiro": "aveiro",
-                "coimbra": "coimbra",
-                "leiria": "leiria",
-                "lisboa": "lisboa",
-                "porto": "porto",
-                "setubal": "setubal",
-                "viseu": "viseu",
-                "guarda": "guarda",
-                "santarem": "santarem",
-                "beja": "beja",
-                "castelo branco": "castelo branco",
-                "evora": "evora",
-                "faro": "faro",
-                "portalegre": "portalegre",
-                "ilha da madeira": "madeira",
-                "acores": "acores",
-            }
-
-            # Create a new column with matched district names
-            district_satisfaction["distrito_geojson"] = district_satisfaction[
-                "distrito_normalized"
-            ].map(district_mapping)
+            # Join the scores to the GeoJSON features on their integer district_id
+            districts = district_table()
+            map_satisfaction = satisfaction_numeric.groupby(filtered_df["district_id"]).agg(["mean", "count"])
 
             # Convert data to dictionary for easier access
-            district_satisfaction_dict = district_satisfaction.set_index(
-                "distrito_geojson"
-            )["satisfaction_score"].to_dict()
-            district_count_dict = district_satisfaction.set_index("distrito_geojson")[
-                "count"
-            ].to_dict()
+            district_satisfaction_dict = map_satisfaction["mean"].to_dict()
+            district_count_dict = map_satisfaction["count"].to_dict()
+
+            # Map libraries are only loaded once a map is actually drawn
+            import folium
+            import folium.plugins
+            from streamlit_folium import folium_static
 
             # Create a base map centered on continental Portugal with better styling
             m = folium.Map(
@@ -960,9 +970,9 @@ def show_satisfaction_levels_tab(df):
 
             # Define a better style function with a stronger color scale
             def style_function(feature):
-                district_name = feature["properties"]["Distrito"].lower()
+                district_id = feature["properties"]["district_id"]
                 try:
-                    score = district_satisfaction_dict[district_name]
+                    score = district_satisfaction_dict[district_id]
                     # Calculate color based on score (-2 to +2)
                     if score < -1.5:
                         # Map satisfaction levels to the Portuguese equivalents but use English values for color mapping
@@ -1011,10 +1021,10 @@ def show_satisfaction_levels_tab(df):
 
             # Add custom popups with satisfaction data
             for feature in portugal_geojson["features"]:
-                district_name = feature["properties"]["Distrito"].lower()
-                if district_name in district_satisfaction_dict:
-                    score = district_satisfaction_dict[district_name]
-                    count = district_count_dict[district_name]
+                district_id = feature["properties"]["district_id"]
+                if district_id in district_satisfaction_dict:
+                    score = district_satisfaction_dict[district_id]
+                    count = district_count_dict[district_id]
 
                     # Get coordinates for the popup (center of polygon)
                     coords = feature["geometry"]["coordinates"]
@@ -1041,7 +1051,7 @@ def show_satisfaction_levels_tab(df):
                         fill_opacity=0.7,
                         popup=folium.Popup(
                             html=create_popup_html(
-                                feature["properties"]["Distrito"], score, count
+                                districts.at[district_id, "name"], score, count
                             ),
                             max_width=300,
                         ),
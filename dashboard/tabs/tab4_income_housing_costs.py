@@ -13,12 +13,18 @@ sys.path.append(str(Path(__file__).parent.parent))
 from config import (
     BACKGROUND_COLORS,
     COLOR_SCALES,
+    DENSITY_POINT_THRESHOLD,
     HOUSING_COLORS,
     PRIMARY_COLORS,
     RENT_BURDEN_COLORS,
     SECONDARY_COLORS,
     TEXT_COLORS,
 )
+import charts
+from analytics.affordability import HIGH_BURDEN_LABEL, cached_rent_burden_simulation
+from analytics.box_stats import cached_box_summary
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 
 def show_income_housing_costs_tab(df):
@@ -35,6 +41,7 @@ def show_income_housing_costs_tab(df):
     para destacar os padrões de acessibilidade habitacional em Portugal.
     """
     st.header("Análise de Rendimento vs Custos Habitacionais")
+    version = dataset_version(df)
 
     # Introdução com estilo melhorado
     st.markdown(
@@ -116,42 +123,51 @@ def show_income_housing_costs_tab(df):
 
         # Criar gráfico circular das categorias de sobrecarga de renda
         if not rent_data.empty:
-            rent_burden_counts = rent_data["rent_burden"].value_counts().reset_index()
-            rent_burden_counts.columns = ["Sobrecarga de Renda", "Contagem"]
-
-            # Mapear categorias para português
-            rent_burden_counts["Sobrecarga de Renda"] = rent_burden_counts[
-                "Sobrecarga de Renda"
-            ].map(burden_mapping)
-
-            fig = px.pie(
-                rent_burden_counts,
-                values="Contagem",
-                names="Sobrecarga de Renda",
-                color="Sobrecarga de Renda",
-                color_discrete_map={
-                    "≤30% (Acessível)": RENT_BURDEN_COLORS["≤30% (Affordable)"],
-                    "31-50% (Moderada)": RENT_BURDEN_COLORS["31-50% (Moderate)"],
-                    "51-80% (Alta)": RENT_BURDEN_COLORS["51-80% (High)"],
-                    ">80% (Muito Alta)": RENT_BURDEN_COLORS[">80% (Very High)"],
-                    "Desconhecida": RENT_BURDEN_COLORS["Unknown"],
-                },
-                title="Distribuição de Categorias de Sobrecarga de Renda",
-            )
-            fig.update_layout(
-                plot_bgcolor=BACKGROUND_COLORS[0],
-                paper_bgcolor=BACKGROUND_COLORS[3],
-                font_color=TEXT_COLORS[2],
-                title_font_color=TEXT_COLORS[0],
+            def build_rent_burden_pie():
+                rent_burden_counts = rent_data["rent_burden"].value_counts().reset_index()
+                rent_burden_counts.columns = ["Sobrecarga de Renda", "Contagem"]
+
+                # Mapear categorias para português
+                rent_burden_counts["Sobrecarga de Renda"] = rent_burden_counts[
+                    "Sobrecarga de Renda"
+                ].map(burden_mapping)
+
+                fig = px.pie(
+                    rent_burden_counts,
+                    values="Contagem",
+                    names="Sobrecarga de Renda",
+                    color="Sobrecarga de Renda",
+                    color_discrete_map={
+                        "≤30% (Acessível)": RENT_BURDEN_COLORS["≤30% (Affordable)"],
+                        "31-50% (Moderada)": RENT_BURDEN_COLORS["31-50% (Moderate)"],
+                        "51-80% (Alta)": RENT_BURDEN_COLORS["51-80% (High)"],
+                        ">80% (Muito Alta)": RENT_BURDEN_COLORS[">80% (Very High)"],
+                        "Desconhecida": RENT_BURDEN_COLORS["Unknown"],
+                    },
+                    title="Distribuição de Categorias de Sobrecarga de Renda",
+                )
+                fig.update_layout(
+                    plot_bgcolor=BACKGROUND_COLORS[0],
+                    paper_bgcolor=BACKGROUND_COLORS[3],
+                    font_color=TEXT_COLORS[2],
+                    title_font_color=TEXT_COLORS[0],
+                )
+                return fig
+
+            st.plotly_chart(
+                cached_figure("tab4", "rent_burden_pie", version, build_rent_burden_pie)
             )
-            st.plotly_chart(fig)
 
     with col2:
         # Criar gráfico de dispersão rendimento vs renda
         if not rent_data.empty:
             # Garantir que 'percentagem-renda-paga' é numérico
-            rent_data.loc[:, "percentagem-renda-paga"] = pd.to_numeric(
-                rent_data["percentagem-renda-paga"], errors="coerce"
+            rent_data = rent_data.assign(
+                **{
+                    "percentagem-renda-paga": pd.to_numeric(
+                        rent_data["percentagem-renda-paga"], errors="coerce"
+                    )
+                }
             )
 
             # Mapear sobrecarga para português
@@ -161,27 +177,48 @@ def show_income_housing_costs_tab(df):
             )
 
             rent_data_pt = rent_data_pt.dropna(subset=["percentagem-renda-paga"])
-            fig = px.scatter(
-                rent_data_pt,
-                x="rendimento_numerical",
-                y="valor-mensal-renda",
-                color="sobrecarga_renda",
-                color_discrete_map={
-                    "≤30% (Acessível)": RENT_BURDEN_COLORS["≤30% (Affordable)"],
-                    "31-50% (Moderada)": RENT_BURDEN_COLORS["31-50% (Moderate)"],
-                    "51-80% (Alta)": RENT_BURDEN_COLORS["51-80% (High)"],
-                    ">80% (Muito Alta)": RENT_BURDEN_COLORS[">80% (Very High)"],
-                    "Desconhecida": RENT_BURDEN_COLORS["Unknown"],
-                },
-                size=rent_data_pt["percentagem-renda-paga"].tolist(),
-                hover_data=["distrito", "percentagem-renda-paga"],
-                title="Renda Mensal vs Rendimento",
-                labels={
-                    "rendimento_numerical": "Rendimento Anual (€)",
-                    "valor-mensal-renda": "Renda Mensal (€)",
-                    "sobrecarga_renda": "Sobrecarga de Renda",
-                },
+            density_mode = st.toggle(
+                "Mostrar densidade",
+                value=len(rent_data_pt) > DENSITY_POINT_THRESHOLD,
+                key="tab4_rent_income_density",
+                help="Agrupa os pontos numa grelha 2D no servidor; selecione uma área para ampliar.",
             )
+            if density_mode:
+                x_range, y_range = charts.density_zoom("tab4_rent_income_density_chart")
+                fig = charts.density_heatmap(
+                    rent_data_pt,
+                    x="rendimento_numerical",
+                    y="valor-mensal-renda",
+                    x_range=x_range,
+                    y_range=y_range,
+                    title="Densidade de Renda Mensal vs Rendimento",
+                    labels={
+                        "rendimento_numerical": "Rendimento Anual (€)",
+                        "valor-mensal-renda": "Renda Mensal (€)",
+                    },
+                )
+            else:
+                fig = charts.scatter(
+                    rent_data_pt,
+                    x="rendimento_numerical",
+                    y="valor-mensal-renda",
+                    color="sobrecarga_renda",
+                    color_discrete_map={
+                        "≤30% (Acessível)": RENT_BURDEN_COLORS["≤30% (Affordable)"],
+                        "31-50% (Moderada)": RENT_BURDEN_COLORS["31-50% (Moderate)"],
+                        "51-80% (Alta)": RENT_BURDEN_COLORS["51-80% (High)"],
+                        ">80% (Muito Alta)": RENT_BURDEN_COLORS[">80% (Very High)"],
+                        "Desconhecida": RENT_BURDEN_COLORS["Unknown"],
+                    },
+                    size=rent_data_pt["percentagem-renda-paga"].tolist(),
+                    hover_data=["distrito", "percentagem-renda-paga"],
+                    title="Renda Mensal vs Rendimento",
+                    labels={
+                        "rendimento_numerical": "Rendimento Anual (€)",
+                        "valor-mensal-renda": "Renda Mensal (€)",
+                        "sobrecarga_renda": "Sobrecarga de Renda",
+                    },
+                )
             fig.update_layout(
                 plot_bgcolor=BACKGROUND_COLORS[0],
                 paper_bgcolor=BACKGROUND_COLORS[3],
@@ -195,6 +232,8 @@ def show_income_housing_costs_tab(df):
                 rent_data_pt["rendimento_numerical"].max() or 100000,
                 100,
             )
+            if density_mode and x_range is not None:
+                income_range = np.linspace(x_range[0], x_range[1], 100)
             # 30% do rendimento mensal (rendimento anual / 12 * 0.3)
             recommended_rent = income_range / 12 * 0.3
 
@@ -208,7 +247,84 @@ def show_income_housing_costs_tab(df):
                 )
             )
 
-            st.plotly_chart(fig)
+            if density_mode:
+                fig.update_layout(legend=dict(orientation="h", y=-0.2))
+                charts.show_zoomable_density(fig, "tab4_rent_income_density_chart")
+            else:
+                st.plotly_chart(fig)
+
+    # Simulação de Monte Carlo da sobrecarga de renda
+    if not rent_data.empty:
+        st.markdown("#### Incerteza da Sobrecarga de Renda")
+        st.markdown("""
+        O rendimento é recolhido por escalões, pelo que usar o ponto médio de cada escalão esconde
+        a variação dentro dele. A simulação abaixo sorteia milhares de rendimentos possíveis dentro do
+        escalão de cada inquirido e mostra o intervalo plausível para cada categoria de sobrecarga.
+        """)
+
+        tail_options = {
+            "Pareto (cauda longa)": "pareto",
+            "Uniforme (até 150 000€)": "uniform",
+        }
+        tail_label = st.radio(
+            "Modelo para o escalão mais alto (>80 000€):",
+            list(tail_options.keys()),
+            horizontal=True,
+            key="rent_burden_tail_model",
+        )
+
+        simulation = cached_rent_burden_simulation(
+            df, version, tail=tail_options[tail_label]
+        )
+        simulation = simulation[simulation["category"] != HIGH_BURDEN_LABEL].copy()
+        simulation["sobrecarga_renda"] = simulation["category"].map(burden_mapping)
+
+        def build_burden_uncertainty_chart():
+            fig = go.Figure()
+            fig.add_trace(
+                go.Bar(
+                    x=simulation["sobrecarga_renda"],
+                    y=simulation["mean_share"],
+                    marker_color=[RENT_BURDEN_COLORS[c] for c in simulation["category"]],
+                    error_y=dict(
+                        type="data",
+                        symmetric=False,
+                        array=simulation["upper"] - simulation["mean_share"],
+                        arrayminus=simulation["mean_share"] - simulation["lower"],
+                        color=TEXT_COLORS[0],
+                    ),
+                    name="Simulação (média e intervalo 90%)",
+                )
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=simulation["sobrecarga_renda"],
+                    y=simulation["midpoint_share"],
+                    mode="markers",
+                    marker=dict(color=TEXT_COLORS[0], symbol="diamond", size=10),
+                    name="Ponto médio do escalão",
+                )
+            )
+            fig.update_layout(
+                title="Sobrecarga de Renda: Simulação vs Ponto Médio",
+                xaxis_title="Sobrecarga de Renda",
+                yaxis_title="Percentagem de Arrendatários (%)",
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure(
+                "tab4",
+                "rent_burden_uncertainty",
+                version,
+                build_burden_uncertainty_chart,
+                params={"tail": tail_options[tail_label]},
+            )
+        )
 
     # Comparação rendimento para custo habitacional
     st.subheader("Comparação entre Rendimento e Custo Habitacional")
@@ -224,26 +340,20 @@ def show_income_housing_costs_tab(df):
         "Others": "Outro",
     }
 
-    # Aplicar mapeamento
-    df_pt = df.copy()
-    df_pt["situacao_habitacional"] = df_pt["housing_situation"].map(housing_mapping)
-
-    # Gráfico de caixa de rendimento por situação habitacional
-    fig = px.box(
-        df_pt,
-        x="situacao_habitacional",
-        y="rendimento_numerical",
-        color="situacao_habitacional",
-        color_discrete_map={
+    # Gráfico de caixa de rendimento por situação habitacional (estatísticas pré-calculadas)
+    income_box = cached_box_summary(
+        df, version, "rendimento_numerical", by="housing_situation"
+    ).rename(index=housing_mapping)
+    fig = charts.box_from_summary(
+        income_box,
+        title="Distribuição de Rendimento por Situação Habitacional",
+        x_title="Situação Habitacional",
+        y_title="Rendimento Anual (€)",
+        color_map={
             "Arrendamento": HOUSING_COLORS["Arrendamento"],
             "Casa Própria": HOUSING_COLORS["Casa Própria"],
             "Outro": HOUSING_COLORS["Others"],
         },
-        title="Distribuição de Rendimento por Situação Habitacional",
-        labels={
-            "situacao_habitacional": "Situação Habitacional",
-            "rendimento_numerical": "Rendimento Anual (€)",
-        },
     )
     fig.update_layout(
         plot_bgcolor=BACKGROUND_COLORS[0],
@@ -8,6 +8,9 @@ from pathlib import Path
 # Add the parent directory to system path
 sys.path.append(str(Path(__file__).parent.parent))
 from config import *
+from analytics.reasons import REASON_DIMENSIONS, REASON_LABELS, cached_reason_stats
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 def show_education_employment_tab(df):
     """
@@ -25,6 +28,7 @@ def show_education_employment_tab(df):
     """
     
     st.header("Análise de Educação e Emprego: Impacto nas Condições Habitacionais")
+    version = dataset_version(df)
     
     # Introdução com estilo melhorado
     st.markdown("""
@@ -114,47 +118,53 @@ def show_education_employment_tab(df):
         filtered_df['education_level_pt'] = filtered_df['education_level'].map(education_mapping)
         filtered_df['housing_situation_pt'] = filtered_df['housing_situation'].map(housing_mapping)
         
-        # Criar uma tabela cruzada para nível educacional vs situação habitacional
-        education_housing_cross = pd.crosstab(
-            filtered_df['education_level_pt'], 
-            filtered_df['housing_situation_pt'],
-            normalize='index'
-        ) * 100
-        
-        # Criar um gráfico de barras empilhadas
-        fig = px.bar(
-            education_housing_cross.reset_index().melt(
-                id_vars='education_level_pt',
-                var_name='housing_situation_pt',
-                value_name='percentage'
-            ),
-            x='education_level_pt',
-            y='percentage',
-            color='housing_situation_pt',
-            title="Situação Habitacional por Nível Educacional (%)",
-            labels={
-                'education_level_pt': 'Nível Educacional',
-                'percentage': 'Percentagem (%)',
-                'housing_situation_pt': 'Situação Habitacional'
-            },
-            category_orders={
-                'education_level_pt': ['Básico', 'Secundário', 'Profissional', 'Licenciatura', 'Mestrado', 'Doutoramento']
-            },
-            color_discrete_map={
-                'Arrendamento': HOUSING_COLORS['Arrendamento'],
-                'Propriedade': HOUSING_COLORS['Casa Própria'], 
-                'A viver com outros': HOUSING_COLORS['Others']
-            }
-        )
-        fig.update_layout(
-            height=400,
-            legend_title_text='Situação Habitacional',
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_housing_by_education():
+            # Criar uma tabela cruzada para nível educacional vs situação habitacional
+            education_housing_cross = pd.crosstab(
+                filtered_df['education_level_pt'], 
+                filtered_df['housing_situation_pt'],
+                normalize='index'
+            ) * 100
+        
+            # Criar um gráfico de barras empilhadas
+            fig = px.bar(
+                education_housing_cross.reset_index().melt(
+                    id_vars='education_level_pt',
+                    var_name='housing_situation_pt',
+                    value_name='percentage'
+                ),
+                x='education_level_pt',
+                y='percentage',
+                color='housing_situation_pt',
+                title="Situação Habitacional por Nível Educacional (%)",
+                labels={
+                    'education_level_pt': 'Nível Educacional',
+                    'percentage': 'Percentagem (%)',
+                    'housing_situation_pt': 'Situação Habitacional'
+                },
+                category_orders={
+                    'education_level_pt': ['Básico', 'Secundário', 'Profissional', 'Licenciatura', 'Mestrado', 'Doutoramento']
+                },
+                color_discrete_map={
+                    'Arrendamento': HOUSING_COLORS['Arrendamento'],
+                    'Propriedade': HOUSING_COLORS['Casa Própria'], 
+                    'A viver com outros': HOUSING_COLORS['Others']
+                }
+            )
+            fig.update_layout(
+                height=400,
+                legend_title_text='Situação Habitacional',
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab5", "housing_by_education", version, build_housing_by_education),
+            use_container_width=True,
         )
-        st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("""
         Este gráfico mostra como as situações habitacionais variam entre diferentes níveis educacionais.
@@ -164,44 +174,50 @@ def show_education_employment_tab(df):
     with col2:
         # Rendimento médio por nível educacional
 
-        # Filtrar linhas com valores em falta
-        filtered_df = df.dropna(subset=['education_level', 'rendimento_numerical'])
-        filtered_df['education_level_pt'] = filtered_df['education_level'].map(education_mapping)
-        
-        # Agrupar por nível educacional e calcular rendimento médio
-        education_income = filtered_df.groupby('education_level_pt')['rendimento_numerical'].mean().reset_index()
-        
-        # Ordenar por uma ordem específica
-        order = ['Básico', 'Secundário', 'Profissional', 'Licenciatura', 'Mestrado', 'Doutoramento']
-        education_income['education_level_pt'] = pd.Categorical(
-            education_income['education_level_pt'], 
-            categories=order, 
-            ordered=True
-        )
-        education_income = education_income.sort_values('education_level_pt')
-        
-        # Criar um gráfico de barras
-        fig = px.bar(
-            education_income,
-            x='education_level_pt',
-            y='rendimento_numerical',
-            title="Rendimento Médio Anual por Nível Educacional (€)",
-            labels={
-                'education_level_pt': 'Nível Educacional',
-                'rendimento_numerical': 'Rendimento Médio Anual (€)'
-            },
-            color='education_level_pt',
-            color_discrete_sequence=PRIMARY_COLORS
-        )
-        fig.update_layout(
-            height=400,
-            showlegend=False,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_income_by_education():
+            # Filtrar linhas com valores em falta
+            filtered_df = df.dropna(subset=['education_level', 'rendimento_numerical'])
+            filtered_df['education_level_pt'] = filtered_df['education_level'].map(education_mapping)
+        
+            # Agrupar por nível educacional e calcular rendimento médio
+            education_income = filtered_df.groupby('education_level_pt')['rendimento_numerical'].mean().reset_index()
+        
+            # Ordenar por uma ordem específica
+            order = ['Básico', 'Secundário', 'Profissional', 'Licenciatura', 'Mestrado', 'Doutoramento']
+            education_income['education_level_pt'] = pd.Categorical(
+                education_income['education_level_pt'], 
+                categories=order, 
+                ordered=True
+            )
+            education_income = education_income.sort_values('education_level_pt')
+        
+            # Criar um gráfico de barras
+            fig = px.bar(
+                education_income,
+                x='education_level_pt',
+                y='rendimento_numerical',
+                title="Rendimento Médio Anual por Nível Educacional (€)",
+                labels={
+                    'education_level_pt': 'Nível Educacional',
+                    'rendimento_numerical': 'Rendimento Médio Anual (€)'
+                },
+                color='education_level_pt',
+                color_discrete_sequence=PRIMARY_COLORS
+            )
+            fig.update_layout(
+                height=400,
+                showlegend=False,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab5", "income_by_education", version, build_income_by_education),
+            use_container_width=True,
         )
-        st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("""
         Este gráfico apresenta o rendimento médio anual em diferentes níveis educacionais,
@@ -246,47 +262,53 @@ def show_education_employment_tab(df):
         filtered_df['employment_status_pt'] = filtered_df['employment_status'].map(employment_mapping)
         filtered_df['housing_situation_pt'] = filtered_df['housing_situation'].map(housing_mapping)
         
-        # Criar uma tabela cruzada para situação profissional vs situação habitacional
-        employment_housing_cross = pd.crosstab(
-            filtered_df['employment_status_pt'], 
-            filtered_df['housing_situation_pt'],
-            normalize='index'
-        ) * 100
-        
-        # Criar um gráfico de barras empilhadas
-        fig = px.bar(
-            employment_housing_cross.reset_index().melt(
-                id_vars='employment_status_pt',
-                var_name='housing_situation_pt',
-                value_name='percentage'
-            ),
-            x='employment_status_pt',
-            y='percentage',
-            color='housing_situation_pt',
-            title="Situação Habitacional por Situação Profissional (%)",
-            labels={
-                'employment_status_pt': 'Situação Profissional',
-                'percentage': 'Percentagem (%)',
-                'housing_situation_pt': 'Situação Habitacional'
-            },
-            category_orders={
-                'employment_status_pt': ['Tempo Inteiro', 'Tempo Parcial', 'Trabalhador Independente', 'Desempregado', 'Estudante', 'Reformado']
-            },
-            color_discrete_map={
-                'Arrendamento': HOUSING_COLORS['Arrendamento'],
-                'Propriedade': HOUSING_COLORS['Casa Própria'], 
-                'A viver com outros': HOUSING_COLORS['Others']
-            }
-        )
-        fig.update_layout(
-            height=400,
-            legend_title_text='Situação Habitacional',
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_housing_by_employment():
+            # Criar uma tabela cruzada para situação profissional vs situação habitacional
+            employment_housing_cross = pd.crosstab(
+                filtered_df['employment_status_pt'], 
+                filtered_df['housing_situation_pt'],
+                normalize='index'
+            ) * 100
+        
+            # Criar um gráfico de barras empilhadas
+            fig = px.bar(
+                employment_housing_cross.reset_index().melt(
+                    id_vars='employment_status_pt',
+                    var_name='housing_situation_pt',
+                    value_name='percentage'
+                ),
+                x='employment_status_pt',
+                y='percentage',
+                color='housing_situation_pt',
+                title="Situação Habitacional por Situação Profissional (%)",
+                labels={
+                    'employment_status_pt': 'Situação Profissional',
+                    'percentage': 'Percentagem (%)',
+                    'housing_situation_pt': 'Situação Habitacional'
+                },
+                category_orders={
+                    'employment_status_pt': ['Tempo Inteiro', 'Tempo Parcial', 'Trabalhador Independente', 'Desempregado', 'Estudante', 'Reformado']
+                },
+                color_discrete_map={
+                    'Arrendamento': HOUSING_COLORS['Arrendamento'],
+                    'Propriedade': HOUSING_COLORS['Casa Própria'], 
+                    'A viver com outros': HOUSING_COLORS['Others']
+                }
+            )
+            fig.update_layout(
+                height=400,
+                legend_title_text='Situação Habitacional',
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab5", "housing_by_employment", version, build_housing_by_employment),
+            use_container_width=True,
         )
-        st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("""
         Esta visualização mostra a relação entre situação profissional e situações habitacionais.
@@ -310,50 +332,56 @@ def show_education_employment_tab(df):
         
         renters_df['rent_burden_pt'] = renters_df['rent_burden'].map(burden_mapping)
         
-        # Criar uma tabela cruzada
-        rent_burden_employment_cross = pd.crosstab(
-            renters_df['employment_status_pt'], 
-            renters_df['rent_burden_pt'],
-            normalize='index'
-        ) * 100
-        
-        # Criar gráfico de barras empilhadas
-        fig = px.bar(
-            rent_burden_employment_cross.reset_index().melt(
-                id_vars='employment_status_pt',
-                var_name='rent_burden_pt',
-                value_name='percentage'
-            ),
-            x='employment_status_pt',
-            y='percentage',
-            color='rent_burden_pt',
-            title="Sobrecarga de Renda por Situação Profissional (%)",
-            labels={
-                'employment_status_pt': 'Situação Profissional',
-                'percentage': 'Percentagem (%)',
-                'rent_burden_pt': 'Sobrecarga de Renda'
-            },
-            category_orders={
-                'employment_status_pt': ['Tempo Inteiro', 'Tempo Parcial', 'Trabalhador Independente', 'Desempregado', 'Estudante', 'Reformado'],
-                'rent_burden_pt': ['≤30% (Acessível)', '31-50% (Moderada)', '51-80% (Alta)', '>80% (Muito Alta)', 'Desconhecida']
-            },
-            color_discrete_map={
-                '≤30% (Acessível)': RENT_BURDEN_COLORS['≤30% (Affordable)'],
-                '31-50% (Moderada)': RENT_BURDEN_COLORS['31-50% (Moderate)'],
-                '51-80% (Alta)': RENT_BURDEN_COLORS['51-80% (High)'],
-                '>80% (Muito Alta)': RENT_BURDEN_COLORS['>80% (Very High)'],
-                'Desconhecida': RENT_BURDEN_COLORS['Unknown']
-            }
-        )
-        fig.update_layout(
-            height=400,
-            legend_title_text='Sobrecarga de Renda',
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_rent_burden_by_employment():
+            # Criar uma tabela cruzada
+            rent_burden_employment_cross = pd.crosstab(
+                renters_df['employment_status_pt'], 
+                renters_df['rent_burden_pt'],
+                normalize='index'
+            ) * 100
+        
+            # Criar gráfico de barras empilhadas
+            fig = px.bar(
+                rent_burden_employment_cross.reset_index().melt(
+                    id_vars='employment_status_pt',
+                    var_name='rent_burden_pt',
+                    value_name='percentage'
+                ),
+                x='employment_status_pt',
+                y='percentage',
+                color='rent_burden_pt',
+                title="Sobrecarga de Renda por Situação Profissional (%)",
+                labels={
+                    'employment_status_pt': 'Situação Profissional',
+                    'percentage': 'Percentagem (%)',
+                    'rent_burden_pt': 'Sobrecarga de Renda'
+                },
+                category_orders={
+                    'employment_status_pt': ['Tempo Inteiro', 'Tempo Parcial', 'Trabalhador Independente', 'Desempregado', 'Estudante', 'Reformado'],
+                    'rent_burden_pt': ['≤30% (Acessível)', '31-50% (Moderada)', '51-80% (Alta)', '>80% (Muito Alta)', 'Desconhecida']
+                },
+                color_discrete_map={
+                    '≤30% (Acessível)': RENT_BURDEN_COLORS['≤30% (Affordable)'],
+                    '31-50% (Moderada)': RENT_BURDEN_COLORS['31-50% (Moderate)'],
+                    '51-80% (Alta)': RENT_BURDEN_COLORS['51-80% (High)'],
+                    '>80% (Muito Alta)': RENT_BURDEN_COLORS['>80% (Very High)'],
+                    'Desconhecida': RENT_BURDEN_COLORS['Unknown']
+                }
+            )
+            fig.update_layout(
+                height=400,
+                legend_title_text='Sobrecarga de Renda',
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab5", "rent_burden_by_employment", version, build_rent_burden_by_employment),
+            use_container_width=True,
         )
-        st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("""
         Esta visualização mostra a distribuição das categorias de sobrecarga de renda entre diferentes situações profissionais.
@@ -388,43 +416,49 @@ def show_education_employment_tab(df):
         
         filtered_df['satisfaction_level_pt'] = filtered_df['satisfaction_level'].map(satisfaction_mapping)
         
-        # Criar uma tabela cruzada
-        education_satisfaction_cross = pd.crosstab(
-            filtered_df['education_level_pt'], 
-            filtered_df['satisfaction_level_pt'],
-            normalize='index'
-        ) * 100
-        
         # Definir a ordem dos níveis de satisfação
         satisfaction_order = ['Muito Insatisfeito', 'Insatisfeito', 'Neutro', 'Satisfeito', 'Muito Satisfeito']
         
-        # Certificar que todas as colunas estão presentes
-        for level in satisfaction_order:
-            if level not in education_satisfaction_cross.columns:
-                education_satisfaction_cross[level] = 0
-        
-        # Reordenar as colunas
-        education_satisfaction_cross = education_satisfaction_cross[satisfaction_order]
-        
-        # Criar um mapa de calor
-        fig = px.imshow(
-            education_satisfaction_cross,
-            text_auto='.1f',
-            aspect="auto",
-            title="Satisfação Habitacional por Nível Educacional (%)",
-            labels=dict(x="Nível de Satisfação", y="Nível Educacional", color="Percentagem (%)"),
-            x=satisfaction_order,
-            y=education_satisfaction_cross.index,
-            color_continuous_scale=COLOR_SCALES['sequential']
-        )
-        fig.update_layout(
-            height=400,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_satisfaction_by_education():
+            # Criar uma tabela cruzada
+            education_satisfaction_cross = pd.crosstab(
+                filtered_df['education_level_pt'], 
+                filtered_df['satisfaction_level_pt'],
+                normalize='index'
+            ) * 100
+        
+            # Certificar que todas as colunas estão presentes
+            for level in satisfaction_order:
+                if level not in education_satisfaction_cross.columns:
+                    education_satisfaction_cross[level] = 0
+        
+            # Reordenar as colunas
+            education_satisfaction_cross = education_satisfaction_cross[satisfaction_order]
+        
+            # Criar um mapa de calor
+            fig = px.imshow(
+                education_satisfaction_cross,
+                text_auto='.1f',
+                aspect="auto",
+                title="Satisfação Habitacional por Nível Educacional (%)",
+                labels=dict(x="Nível de Satisfação", y="Nível Educacional", color="Percentagem (%)"),
+                x=satisfaction_order,
+                y=education_satisfaction_cross.index,
+                color_continuous_scale=COLOR_SCALES['sequential']
+            )
+            fig.update_layout(
+                height=400,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab5", "satisfaction_by_education", version, build_satisfaction_by_education),
+            use_container_width=True,
         )
-        st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Satisfação habitacional por situação profissional
@@ -433,40 +467,46 @@ def show_education_employment_tab(df):
         filtered_df['employment_status_pt'] = filtered_df['employment_status'].map(employment_mapping)
         filtered_df['satisfaction_level_pt'] = filtered_df['satisfaction_level'].map(satisfaction_mapping)
         
-        # Criar uma tabela cruzada
-        employment_satisfaction_cross = pd.crosstab(
-            filtered_df['employment_status_pt'], 
-            filtered_df['satisfaction_level_pt'],
-            normalize='index'
-        ) * 100
-        
-        # Certificar que todas as colunas estão presentes
-        for level in satisfaction_order:
-            if level not in employment_satisfaction_cross.columns:
-                employment_satisfaction_cross[level] = 0
-        
-        # Reordenar as colunas
-        employment_satisfaction_cross = employment_satisfaction_cross[satisfaction_order]
-        
-        # Criar um mapa de calor
-        fig = px.imshow(
-            employment_satisfaction_cross,
-            text_auto='.1f',
-            aspect="auto",
-            title="Satisfação Habitacional por Situação Profissional (%)",
-            labels=dict(x="Nível de Satisfação", y="Situação Profissional", color="Percentagem (%)"),
-            x=satisfaction_order,
-            y=employment_satisfaction_cross.index,
-            color_continuous_scale=COLOR_SCALES['sequential']
-        )
-        fig.update_layout(
-            height=400,
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_satisfaction_by_employment():
+            # Criar uma tabela cruzada
+            employment_satisfaction_cross = pd.crosstab(
+                filtered_df['employment_status_pt'], 
+                filtered_df['satisfaction_level_pt'],
+                normalize='index'
+            ) * 100
+        
+            # Certificar que todas as colunas estão presentes
+            for level in satisfaction_order:
+                if level not in employment_satisfaction_cross.columns:
+                    employment_satisfaction_cross[level] = 0
+        
+            # Reordenar as colunas
+            employment_satisfaction_cross = employment_satisfaction_cross[satisfaction_order]
+        
+            # Criar um mapa de calor
+            fig = px.imshow(
+                employment_satisfaction_cross,
+                text_auto='.1f',
+                aspect="auto",
+                title="Satisfação Habitacional por Situação Profissional (%)",
+                labels=dict(x="Nível de Satisfação", y="Situação Profissional", color="Percentagem (%)"),
+                x=satisfaction_order,
+                y=employment_satisfaction_cross.index,
+                color_continuous_scale=COLOR_SCALES['sequential']
+            )
+            fig.update_layout(
+                height=400,
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig
+
+        st.plotly_chart(
+            cached_figure("tab5", "satisfaction_by_employment", version, build_satisfaction_by_employment),
+            use_container_width=True,
         )
-        st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("""
     Estes mapas de calor mostram a distribuição dos níveis de satisfação habitacional entre diferentes níveis educacionais e situações profissionais.
@@ -474,88 +514,88 @@ def show_education_employment_tab(df):
     """)
     
     # SECÇÃO 4: RAZÕES DE INSATISFAÇÃO
-    st.subheader("Razões de Insatisfação Habitacional por Nível Educacional")
-    
-    st.markdown("""
-    Esta secção analisa as principais razões de insatisfação habitacional entre diferentes grupos educacionais,
-    ajudando a identificar desafios específicos enfrentados por pessoas com diferentes níveis de formação.
-    """)
-    
-    # Obter a lista de razões de insatisfação a partir dos nomes das colunas
-    reason_columns = [col for col in df.columns if col.startswith('reason_')]
-    
-    # Traduzir razões para português
-    reason_translation = {
-        'reason_pago-demasiado': 'Pago Demasiado',
-        'reason_falta-espaco': 'Falta de Espaço',
-        'reason_habitacao-mau-estado': 'Habitação em Mau Estado',
-        'reason_vivo-longe': 'Vivo Longe do Trabalho',
-        'reason_quero-independecia': 'Quero Independência',
-        'reason_dificuldades-financeiras': 'Dificuldades Financeiras',
-        'reason_financeiramente-dependente': 'Dependência Financeira',
-        'reason_vivo-longe-de-transportes': 'Longe de Transportes',
-        'reason_vivo-zona-insegura': 'Zona Insegura',
-        'reason_partilho-casa-com-desconhecidos': 'Partilho Casa com Desconhecidos'
-    }
+    # O título e a introdução dependem da dimensão escolhida abaixo, mas aparecem antes dela
+    reason_intro = st.container()
     
-    # Criar um dataframe com níveis educacionais e razões de insatisfação
-    dissatisfaction_by_education = pd.DataFrame()
+    # Prevalência das razões entre os inquiridos insatisfeitos, calculada de uma só vez
+    # para todas as dimensões demográficas
+    reason_stats = cached_reason_stats(
+        df, version, ("Dissatisfied", "Very Dissatisfied")
+    )
     
-    # Filtrar para inquiridos insatisfeitos
-    dissatisfied_df = df[df['satisfaction_level'].isin(['Dissatisfied', 'Very Dissatisfied'])]
-    dissatisfied_df['education_level_pt'] = dissatisfied_df['education_level'].map(education_mapping)
+    reason_dimension = st.selectbox(
+        "Analisar por",
+        list(REASON_DIMENSIONS),
+        format_func=REASON_DIMENSIONS.get,
+        key="tab5_reason_dimension",
+    )
+    dimension_label = REASON_DIMENSIONS[reason_dimension]
     
-    # Calcular a percentagem de cada razão por nível educacional
-    for reason in reason_columns:
-        # Obter o nome de exibição para a razão
-        reason_display = reason_translation.get(reason, reason.replace('reason_', '').replace('-', ' ').title())
-        
-        # Agrupar por nível educacional e calcular a percentagem com esta razão
-        reason_by_education = dissatisfied_df.groupby('education_level_pt')[reason].mean() * 100
-        dissatisfaction_by_education[reason_display] = reason_by_education
+    with reason_intro:
+        st.subheader(f"Razões de Insatisfação Habitacional por {dimension_label}")
+        st.markdown(f"""
+        Esta secção analisa as principais razões de insatisfação habitacional por {dimension_label.lower()},
+        ajudando a identificar desafios específicos enfrentados por cada grupo.
+        """)
     
-    # Redefinir índice para tornar o nível educacional uma coluna
-    dissatisfaction_by_education = dissatisfaction_by_education.reset_index()
+    # Traduzir os valores das dimensões que têm tradução neste separador
+    value_mappings = {
+        'education_level': education_mapping,
+        'employment_status': employment_mapping,
+        'housing_situation': housing_mapping,
+    }
+    dissatisfaction_by_group = reason_stats.prevalence[reason_dimension].rename(columns=REASON_LABELS)
+    dissatisfaction_by_group.index = dissatisfaction_by_group.index.map(
+        lambda value: value_mappings.get(reason_dimension, {}).get(value, value)
+    )
+    dissatisfaction_by_group.index.name = 'grupo'
     
     # Transformar o dataframe para plotagem
-    dissatisfaction_melted = dissatisfaction_by_education.melt(
-        id_vars='education_level_pt',
+    dissatisfaction_melted = dissatisfaction_by_group.reset_index().melt(
+        id_vars='grupo',
         var_name='Razão',
         value_name='Percentagem'
     )
     
     # Definir ordem dos níveis educacionais
-    education_order = ['Básico', 'Secundário', 'Profissional', 'Licenciatura', 'Mestrado', 'Doutoramento']
-    dissatisfaction_melted['education_level_pt'] = pd.Categorical(
-        dissatisfaction_melted['education_level_pt'],
-        categories=education_order,
-        ordered=True
-    )
+    if reason_dimension == 'education_level':
+        education_order = ['Básico', 'Secundário', 'Profissional', 'Licenciatura', 'Mestrado', 'Doutoramento']
+        dissatisfaction_melted['grupo'] = pd.Categorical(
+            dissatisfaction_melted['grupo'],
+            categories=education_order,
+            ordered=True
+        )
     
-    # Criar um gráfico de barras agrupadas
-    fig = px.bar(
-        dissatisfaction_melted,
-        x='education_level_pt',
-        y='Percentagem',
-        color='Razão',
-        title="Razões de Insatisfação Habitacional por Nível Educacional",
-        labels={
-            'education_level_pt': 'Nível Educacional',
-            'Percentagem': 'Percentagem (%)',
-            'Razão': 'Motivo de Insatisfação'
-        },
-        barmode='group',
-        color_discrete_sequence=CHART_COLORS
-    )
-    fig.update_layout(
-        height=500,
-        legend_title_text='Razão',
-        plot_bgcolor=BACKGROUND_COLORS[0],
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0]
+    def build_reasons_by_dimension():
+        # Criar um gráfico de barras agrupadas
+        fig = px.bar(
+            dissatisfaction_melted,
+            x='grupo',
+            y='Percentagem',
+            color='Razão',
+            title=f"Razões de Insatisfação Habitacional por {dimension_label}",
+            labels={
+                'grupo': dimension_label,
+                'Percentagem': 'Percentagem (%)',
+                'Razão': 'Motivo de Insatisfação'
+            },
+            barmode='group',
+            color_discrete_sequence=CHART_COLORS
+        )
+        fig.update_layout(
+            height=500,
+            legend_title_text='Razão',
+            plot_bgcolor=BACKGROUND_COLORS[0],
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0]
+        )
+        return fig
+
+    st.plotly_chart(
+        cached_figure("tab5", "reasons_by_dimension", version, build_reasons_by_dimension, {"dimension": reason_dimension}),
+        use_container_width=True,
     )
-    st.plotly_chart(fig, use_container_width=True)
     
     # Obter as razões mais comuns
     top_reasons = dissatisfaction_melted.groupby('Razão')['Percentagem'].mean().sort_values(ascending=False).head(3).index.tolist()
@@ -564,9 +604,14 @@ def show_education_employment_tab(df):
     **Insights Principais:**
     
     - As três razões mais comuns para insatisfação habitacional são: {", ".join(top_reasons)}
-    - Inquiridos com níveis educacionais mais altos (Licenciatura, Mestrado, Doutoramento) tendem a reportar insatisfação devido a custos elevados e problemas de localização
-    - Inquiridos com níveis educacionais mais baixos reportam mais frequentemente problemas relacionados com o estado físico da habitação e dificuldades financeiras
-    - A falta de espaço é uma preocupação transversal a todos os níveis educacionais, sugerindo um problema generalizado nas opções habitacionais disponíveis
+    """)
     
-    Estes insights indicam que diferentes grupos educacionais enfrentam desafios habitacionais distintos, o que sugere a necessidade de abordagens diversificadas nas políticas habitacionais.
-    """)
\ No newline at end of file
+    # As restantes observações dizem respeito aos níveis educacionais
+    if reason_dimension == 'education_level':
+        st.markdown("""
+        - Inquiridos com níveis educacionais mais altos (Licenciatura, Mestrado, Doutoramento) tendem a reportar insatisfação devido a custos elevados e problemas de localização
+        - Inquiridos com níveis educacionais mais baixos reportam mais frequentemente problemas relacionados com o estado físico da habitação e dificuldades financeiras
+        - A falta de espaço é uma preocupação transversal a todos os níveis educacionais, sugerindo um problema generalizado nas opções habitacionais disponíveis
+        
+        Estes insights indicam que diferentes grupos educacionais enfrentam desafios habitacionais distintos, o que sugere a necessidade de abordagens diversificadas nas políticas habitacionais.
+        """)
\ No newline at end of file
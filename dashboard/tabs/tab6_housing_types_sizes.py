@@ -1,6 +1,5 @@
 #tab6_housing_types_sizes.py
 import pandas as pd
-import numpy as np
 import streamlit as st
 import plotly.express as px
 import sys
@@ -9,6 +8,12 @@ from pathlib import Path
 # Add the parent directory to system path
 sys.path.append(str(Path(__file__).parent.parent))
 from config import *
+from analytics.adequacy import HOUSEHOLD_SIZE_ORDER, cached_adequacy_by_group
+from analytics.box_stats import cached_box_summary
+from analytics.quantiles import sketch_cube
+from charts import box_from_summary
+from data.versioning import dataset_version
+from figure_cache import cached_figure
 
 def show_housing_types_sizes_tab(df):
     """
@@ -23,6 +28,7 @@ def show_housing_types_sizes_tab(df):
     6. Providing actionable insights and recommendations
     """
     st.header("Tipos e Tamanhos de Habitação: As Casas Portuguesas Satisfazem as Necessidades?")
+    version = dataset_version(df)
     
     # Start with a compelling problem statement
     st.markdown("""
@@ -42,18 +48,9 @@ def show_housing_types_sizes_tab(df):
     avg_area = df[df['area_numerical'].notna()]['area_numerical'].mean()
     apartment_pct = (df['house_type'] == 'Apartment').sum() / df['house_type'].count() * 100
     
-    # Calculate household size
-    df['household_size'] = df['num-pessoas-nao-dependentes'].fillna(0) + df['num-pessoas-dependentes'].fillna(0)
+    # Household size and space per person are computed at load time (analytics.adequacy)
     avg_household_size = df[df['household_size'] > 0]['household_size'].mean()
     
-    # Calculate space per person (approximation)
-    df['approx_space_per_person'] = df.apply(
-        lambda row: row['area_numerical'] / row['household_size'] 
-        if pd.notna(row['area_numerical']) and pd.notna(row['household_size']) and row['household_size'] > 0 
-        else np.nan, 
-        axis=1
-    )
-    
     # Calculate satisfaction with size
     size_satisfaction = df.dropna(subset=['area_numerical', 'satisfaction_level']).copy()
     size_satisfaction['satisfied_with_size'] = size_satisfaction['satisfaction_level'].isin(['Satisfied', 'Very Satisfied'])
@@ -91,81 +88,29 @@ def show_housing_types_sizes_tab(df):
         )
 
     with col4:
-        # Create a total household size column
-        df['household_size_grouped'] = df['household_size'].apply(
-            lambda x: '6+' if pd.notna(x) and x >= 6 else (str(int(x)) if pd.notna(x) and x > 0 else np.nan)
-        )
-        
         # Count household sizes
         household_counts = df['household_size_grouped'].value_counts().reset_index()
         household_counts.columns = ['Tamanho do Agregado', 'Contagem']
         
-        # Filter for records with area data
-        household_area_data = df[df['area_numerical'].notna() & df['household_size_grouped'].notna()].copy()
-
-        # Order household sizes
-        size_order = ['1', '2', '3', '4', '5', '6+']
-        household_area_data['household_size_grouped'] = pd.Categorical(
+        # Average area and area per person by household size, from the load-time adequacy columns
+        size_order = HOUSEHOLD_SIZE_ORDER
+        household_area_data = df[df['area_numerical'].notna() & df['household_size_grouped'].notna()]
+        household_groups = pd.Categorical(
             household_area_data['household_size_grouped'],
             categories=size_order,
             ordered=True
         )
-
-        # Calculate average area by household size
-        avg_area_by_household = household_area_data.groupby('household_size_grouped')['area_numerical'].mean().reset_index()
-        avg_area_by_household = avg_area_by_household.sort_values('household_size_grouped')
-
-        # Calculate statistics for insights
-        area_per_person = household_area_data.copy()
-        # Convert categorical to numeric for division operation and handle NaN values
-        area_per_person['household_size_numeric'] = area_per_person['household_size_grouped'].astype(str).apply(
-            lambda x: 6 if x == '6+' else (int(x) if x != 'nan' else np.nan)
-        )
-
-        # Only calculate area_per_person for rows with valid household size
-        area_per_person['area_per_person'] = area_per_person.apply(
-            lambda row: row['area_numerical'] / row['household_size_numeric'] 
-            if pd.notna(row['household_size_numeric']) and row['household_size_numeric'] > 0 else np.nan, 
-            axis=1
-        )
-
-        # Calculate percentage of households with less than 15m² per person
-        area_per_person_metrics = household_area_data.copy()
+        household_size_stats = household_area_data[['area_numerical', 'space_per_person']].groupby(
+            household_groups, observed=True
+        ).mean()
+        household_size_stats.index.name = 'household_size_grouped'
+        household_size_stats = household_size_stats.reset_index().rename(columns={'space_per_person': 'area_per_person'})
+        avg_area_by_household = household_size_stats[['household_size_grouped', 'area_numerical']]
+        avg_area_per_person = household_size_stats[['household_size_grouped', 'area_per_person']]
         
-        # Convert categorical to numeric for division operation and handle NaN values
-        area_per_person_metrics['household_size_numeric'] = area_per_person_metrics['household_size_grouped'].astype(str).apply(
-            lambda x: 6 if x == '6+' else (int(x) if x != 'nan' else np.nan)
-        )
-        
-        # Only calculate area_per_person for rows with valid household size
-        area_per_person_metrics['area_per_person'] = area_per_person_metrics.apply(
-            lambda row: row['area_numerical'] / row['household_size_numeric'] 
-            if pd.notna(row['household_size_numeric']) and row['household_size_numeric'] > 0 else np.nan, 
-            axis=1
-        )
-         # Calculate average area per person by household size
-        avg_area_per_person = area_per_person.groupby('household_size_grouped')['area_per_person'].mean().reset_index()
-    
-        # Calculate components for the score
-        # 1. Adequate space per person (minimum 15m²)
-        area_adequacy = (area_per_person_metrics['area_per_person'] >= 15).mean() * 100
-        
-        # 2. Bedroom adequacy (rough estimate: at least n-1 bedrooms for n people, where n>1)
-        bedroom_adequacy_data = df.dropna(subset=['household_size', 'bedroom_count']).copy()
-        bedroom_adequacy_data['bedrooms_numeric'] = bedroom_adequacy_data['bedroom_count'].map({'0': 0, '1': 1, '2': 2, '3': 3, '4+': 4})
-        bedroom_adequacy_data['adequate_bedrooms'] = bedroom_adequacy_data.apply(
-            lambda row: True if pd.isna(row['household_size']) or pd.isna(row['bedrooms_numeric']) else (
-                True if row['household_size'] <= 1 else row['bedrooms_numeric'] >= row['household_size'] - 1
-            ),
-            axis=1
-        )
-        bedroom_adequacy = bedroom_adequacy_data['adequate_bedrooms'].mean() * 100
-        
-        # Calculate composite score (weighted average)
-        housing_adequacy_score = (area_adequacy * 0.5 + bedroom_adequacy * 0.5) / 100
-        
-        # Scale to 0-100
-        housing_adequacy_score = min(max(housing_adequacy_score * 100, 0), 100)
+        # Composite score: 50% adequate space (>=15m² per person) + 50% adequate bedrooms
+        adequacy_total = cached_adequacy_by_group(df, version).iloc[0]
+        housing_adequacy_score = adequacy_total['adequacy_index']
         
         # Determine color
         if housing_adequacy_score >= 80:
@@ -233,7 +178,12 @@ def show_housing_types_sizes_tab(df):
     )
     
     # Calculate statistics for insights
-    satisfaction_area_stats = satisfaction_area_data.groupby('satisfaction_level')['area_numerical'].agg(['mean', 'median', 'count']).reset_index()
+    satisfaction_area_stats = satisfaction_area_data.groupby('satisfaction_level')['area_numerical'].agg(['mean', 'count']).reset_index()
+    # Medians from the quantile sketches kept per satisfaction level
+    area_medians = sketch_cube(
+        df, version, 'area_numerical', ('satisfaction_level',)
+    ).quantiles([0.5], by='satisfaction_level')[0.5].rename(index=satisfaction_translation)
+    satisfaction_area_stats['median'] = satisfaction_area_stats['satisfaction_level'].astype(object).map(area_medians).astype(float)
     
     # Explicitly handle potential KeyError by checking if values exist
     very_satisfied_area = 0
@@ -257,44 +207,57 @@ def show_housing_types_sizes_tab(df):
         'Muito Insatisfeito': SATISFACTION_COLORS['Very Dissatisfied']
     }
     
-    fig_satisfaction_area = px.box(
-        satisfaction_area_data,
-        x='satisfaction_level',
-        y='area_numerical',
-        color='satisfaction_level',
-        title="Tamanho da Habitação por Nível de Satisfação",
-        labels={'area_numerical': 'Área (m²)', 'satisfaction_level': 'Nível de Satisfação'},
-        category_orders={'satisfaction_level': satisfaction_order},
-        color_discrete_map=satisfaction_colors_pt
-    )
-    fig_satisfaction_area.update_layout(
-        plot_bgcolor=BACKGROUND_COLORS[0],
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0]
+    satisfaction_area_box = cached_box_summary(
+        df, version, 'area_numerical', by='satisfaction_level'
+    ).rename(index=satisfaction_translation)
+    def build_area_by_satisfaction():
+        fig_satisfaction_area = box_from_summary(
+            satisfaction_area_box,
+            title="Tamanho da Habitação por Nível de Satisfação",
+            x_title='Nível de Satisfação',
+            y_title='Área (m²)',
+            category_order=satisfaction_order,
+            color_map=satisfaction_colors_pt
+        )
+        fig_satisfaction_area.update_layout(
+            plot_bgcolor=BACKGROUND_COLORS[0],
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0]
+        )
+        return fig_satisfaction_area
+
+    st.plotly_chart(
+        cached_figure("tab6", "area_by_satisfaction", version, build_area_by_satisfaction),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_satisfaction_area, use_container_width=True)
     
     # Create a chart showing relationship between satisfaction level and housing size
     avg_area_by_satisfaction = satisfaction_area_stats.copy()
     avg_area_by_satisfaction = avg_area_by_satisfaction.sort_values('satisfaction_level')
     
-    fig_avg_satisfaction = px.line(
-        avg_area_by_satisfaction,
-        x='satisfaction_level',
-        y='mean',
-        markers=True,
-        title="Tamanho Médio da Habitação por Nível de Satisfação",
-        labels={'mean': 'Área Média (m²)', 'satisfaction_level': 'Nível de Satisfação'},
-        color_discrete_sequence=[PRIMARY_COLORS[0]]
-    )
-    fig_avg_satisfaction.update_layout(
-        plot_bgcolor=BACKGROUND_COLORS[0],
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0]
+    def build_satisfaction_by_area():
+        fig_avg_satisfaction = px.line(
+            avg_area_by_satisfaction,
+            x='satisfaction_level',
+            y='mean',
+            markers=True,
+            title="Tamanho Médio da Habitação por Nível de Satisfação",
+            labels={'mean': 'Área Média (m²)', 'satisfaction_level': 'Nível de Satisfação'},
+            color_discrete_sequence=[PRIMARY_COLORS[0]]
+        )
+        fig_avg_satisfaction.update_layout(
+            plot_bgcolor=BACKGROUND_COLORS[0],
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0]
+        )
+        return fig_avg_satisfaction
+
+    st.plotly_chart(
+        cached_figure("tab6", "satisfaction_by_area", version, build_satisfaction_by_area),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_avg_satisfaction, use_container_width=True)
     
     # Add insights about size and satisfaction
     st.markdown(f"""
@@ -337,23 +300,29 @@ def show_housing_types_sizes_tab(df):
         total_households = household_counts['Contagem'].sum()
         household_counts['Percentage'] = (household_counts['Contagem'] / total_households * 100).round(1)
         
-        # Create pie chart of household sizes
-        fig_household = px.pie(
-            household_counts,
-            values='Contagem',
-            names='Tamanho do Agregado',
-            title="Distribuição por Tamanho do Agregado",
-            color='Tamanho do Agregado',
-            color_discrete_sequence=COLOR_SCALES['sequential']
-        )
-        fig_household.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_household_sizes():
+            # Create pie chart of household sizes
+            fig_household = px.pie(
+                household_counts,
+                values='Contagem',
+                names='Tamanho do Agregado',
+                title="Distribuição por Tamanho do Agregado",
+                color='Tamanho do Agregado',
+                color_discrete_sequence=COLOR_SCALES['sequential']
+            )
+            fig_household.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            fig_household.update_traces(textposition='inside', textinfo='percent+label')
+            return fig_household
+
+        st.plotly_chart(
+            cached_figure("tab6", "household_sizes", version, build_household_sizes),
+            use_container_width=True,
         )
-        fig_household.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_household, use_container_width=True)
         
         # Calculate key stats for insights
         small_households_pct = household_counts[household_counts['Tamanho do Agregado'].isin(['1', '2'])]['Percentage'].sum()
@@ -361,8 +330,8 @@ def show_housing_types_sizes_tab(df):
         
     with col2:
         # Group households by status (with children vs without)
-        df['has_dependents'] = df['num-pessoas-dependentes'] > 0
-        household_status = df.groupby('has_dependents').size().reset_index()
+        has_dependents = (df['num-pessoas-dependentes'] > 0).rename('has_dependents')
+        household_status = df.groupby(has_dependents).size().reset_index()
         household_status.columns = ['Tem Crianças', 'Contagem']
         household_status['Tem Crianças'] = household_status['Tem Crianças'].map({True: 'Agregados com crianças', False: 'Agregados sem crianças'})
         
@@ -370,22 +339,28 @@ def show_housing_types_sizes_tab(df):
         total = household_status['Contagem'].sum()
         household_status['Percentage'] = (household_status['Contagem'] / total * 100).round(1)
         
-        # Create pie chart of household composition
-        fig_composition = px.pie(
-            household_status,
-            values='Contagem',
-            names='Tem Crianças',
-            title="Agregados Com e Sem Crianças",
-            color_discrete_sequence=[PRIMARY_COLORS[1], SECONDARY_COLORS[1]]
-        )
-        fig_composition.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_household_composition():
+            # Create pie chart of household composition
+            fig_composition = px.pie(
+                household_status,
+                values='Contagem',
+                names='Tem Crianças',
+                title="Agregados Com e Sem Crianças",
+                color_discrete_sequence=[PRIMARY_COLORS[1], SECONDARY_COLORS[1]]
+            )
+            fig_composition.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            fig_composition.update_traces(textposition='inside', textinfo='percent+label')
+            return fig_composition
+
+        st.plotly_chart(
+            cached_figure("tab6", "household_composition", version, build_household_composition),
+            use_container_width=True,
         )
-        fig_composition.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_composition, use_container_width=True)
         
         # Get percentages for insights
         with_children_pct = household_status[household_status['Tem Crianças'] == 'Agregados com crianças']['Percentage'].values[0] if len(household_status[household_status['Tem Crianças'] == 'Agregados com crianças']) > 0 else 0
@@ -430,22 +405,28 @@ def show_housing_types_sizes_tab(df):
         apartment_pct = house_type_counts[house_type_counts['Tipo de Habitação'] == 'Apartamento']['Percentage'].values[0] if 'Apartamento' in house_type_counts['Tipo de Habitação'].values else 0
         house_pct = house_type_counts[house_type_counts['Tipo de Habitação'] == 'Moradia']['Percentage'].values[0] if 'Moradia' in house_type_counts['Tipo de Habitação'].values else 0
         
-        # Create pie chart for housing types
-        fig_house_type = px.pie(
-            house_type_counts, 
-            values='Contagem', 
-            names='Tipo de Habitação',
-            color_discrete_sequence=PRIMARY_COLORS,
-            title="Distribuição de Tipos de Habitação"
-        )
-        fig_house_type.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+        def build_house_types():
+            # Create pie chart for housing types
+            fig_house_type = px.pie(
+                house_type_counts, 
+                values='Contagem', 
+                names='Tipo de Habitação',
+                color_discrete_sequence=PRIMARY_COLORS,
+                title="Distribuição de Tipos de Habitação"
+            )
+            fig_house_type.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            fig_house_type.update_traces(textposition='inside', textinfo='percent+label')
+            return fig_house_type
+
+        st.plotly_chart(
+            cached_figure("tab6", "house_types", version, build_house_types),
+            use_container_width=True,
         )
-        fig_house_type.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_house_type, use_container_width=True)
     
     with col2:
         # Count bedroom types
@@ -480,23 +461,26 @@ def show_housing_types_sizes_tab(df):
         small_units_pct = bedroom_counts[bedroom_counts['Tipologia'].isin(['T0', 'T1'])]['Percentage'].sum()
         large_units_pct = bedroom_counts[bedroom_counts['Tipologia'].isin(['T3', 'T4+'])]['Percentage'].sum()
         
-        # Create bar chart for bedroom distribution
-        fig_bedrooms = px.bar(
-            bedroom_counts,
-            x='Tipologia',
-            y='Contagem',
-            color='Tipologia',
-            title="Distribuição de Tipologias",
-            text=bedroom_counts['Percentage'].apply(lambda x: f"{x}%"),
-            color_discrete_sequence=SECONDARY_COLORS
-        )
-        fig_bedrooms.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
-        )
-        st.plotly_chart(fig_bedrooms, use_container_width=True)
+        def build_bedrooms():
+            # Create bar chart for bedroom distribution
+            fig_bedrooms = px.bar(
+                bedroom_counts,
+                x='Tipologia',
+                y='Contagem',
+                color='Tipologia',
+                title="Distribuição de Tipologias",
+                text=bedroom_counts['Percentage'].apply(lambda x: f"{x}%"),
+                color_discrete_sequence=SECONDARY_COLORS
+            )
+            fig_bedrooms.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig_bedrooms
+
+        st.plotly_chart(cached_figure("tab6", "bedrooms", version, build_bedrooms), use_container_width=True)
     
     # Now show housing area distribution
     # Create area bins and labels for better visualization
@@ -530,23 +514,29 @@ def show_housing_types_sizes_tab(df):
     medium_area_pct = area_counts[area_counts['Área (m²)'].isin(['101-150', '151-200'])]['Percentage'].sum()
     large_area_pct = area_counts[area_counts['Área (m²)'].isin(['201-250', '251-300', '301-350', '351-400', '400+'])]['Percentage'].sum()
     
-    # Create histogram for area distribution
-    fig_area = px.bar(
-        area_counts,
-        x='Área (m²)',
-        y='Contagem',
-        color='Área (m²)',
-        title="Distribuição de Tamanho da Habitação (m²)",
-        text=area_counts['Percentage'].apply(lambda x: f"{x}%"),
-        color_discrete_sequence=CHART_COLORS
-    )
-    fig_area.update_layout(
-        plot_bgcolor=BACKGROUND_COLORS[0],
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0]
+    def build_area_distribution():
+        # Create histogram for area distribution
+        fig_area = px.bar(
+            area_counts,
+            x='Área (m²)',
+            y='Contagem',
+            color='Área (m²)',
+            title="Distribuição de Tamanho da Habitação (m²)",
+            text=area_counts['Percentage'].apply(lambda x: f"{x}%"),
+            color_discrete_sequence=CHART_COLORS
+        )
+        fig_area.update_layout(
+            plot_bgcolor=BACKGROUND_COLORS[0],
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0]
+        )
+        return fig_area
+
+    st.plotly_chart(
+        cached_figure("tab6", "area_distribution", version, build_area_distribution),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_area, use_container_width=True)
     
     # Add insights about housing stock
     st.markdown(f"""
@@ -597,24 +587,30 @@ def show_housing_types_sizes_tab(df):
     bedroom_mapping = {'0': 'T0', '1': 'T1', '2': 'T2', '3': 'T3', '4+': 'T4+'}
     housing_bedroom_melted['bedroom_count'] = housing_bedroom_melted['bedroom_count'].map(bedroom_mapping)
     
-    # Create the grouped bar chart
-    fig_housing_bedroom = px.bar(
-        housing_bedroom_melted,
-        x='house_type',
-        y='count',
-        color='bedroom_count',
-        title="Tipos de Habitação por Tipologia",
-        barmode='group',
-        labels={'house_type': 'Tipo de Habitação', 'count': 'Contagem', 'bedroom_count': 'Tipologia'},
-        color_discrete_sequence=ACCENT_COLORS
-    )
-    fig_housing_bedroom.update_layout(
-        plot_bgcolor=BACKGROUND_COLORS[0],
-        paper_bgcolor=BACKGROUND_COLORS[3],
-        font_color=TEXT_COLORS[2],
-        title_font_color=TEXT_COLORS[0]
+    def build_bedrooms_by_situation():
+        # Create the grouped bar chart
+        fig_housing_bedroom = px.bar(
+            housing_bedroom_melted,
+            x='house_type',
+            y='count',
+            color='bedroom_count',
+            title="Tipos de Habitação por Tipologia",
+            barmode='group',
+            labels={'house_type': 'Tipo de Habitação', 'count': 'Contagem', 'bedroom_count': 'Tipologia'},
+            color_discrete_sequence=ACCENT_COLORS
+        )
+        fig_housing_bedroom.update_layout(
+            plot_bgcolor=BACKGROUND_COLORS[0],
+            paper_bgcolor=BACKGROUND_COLORS[3],
+            font_color=TEXT_COLORS[2],
+            title_font_color=TEXT_COLORS[0]
+        )
+        return fig_housing_bedroom
+
+    st.plotly_chart(
+        cached_figure("tab6", "bedrooms_by_situation", version, build_bedrooms_by_situation),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_housing_bedroom, use_container_width=True)
     
     
     # Calculate most common configurations
@@ -638,57 +634,120 @@ def show_housing_types_sizes_tab(df):
     col1, col2 = st.columns(2)
     
     with col1:
-        # Create bar chart of average area by household size
-        fig_household_area = px.bar(
-            avg_area_by_household,
-            x='household_size_grouped',
-            y='area_numerical',
-            color='household_size_grouped',
-            title="Tamanho Total da Habitação por Tamanho do Agregado",
-            labels={'area_numerical': 'Área Média (m²)', 'household_size_grouped': 'Tamanho do Agregado'},
-            color_discrete_sequence=COLOR_SCALES['sequential']
-        )
-        fig_household_area.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
-            showlegend=False  # Hide legend since colors are just for visual grouping
+        def build_area_by_household():
+            # Create bar chart of average area by household size
+            fig_household_area = px.bar(
+                avg_area_by_household,
+                x='household_size_grouped',
+                y='area_numerical',
+                color='household_size_grouped',
+                title="Tamanho Total da Habitação por Tamanho do Agregado",
+                labels={'area_numerical': 'Área Média (m²)', 'household_size_grouped': 'Tamanho do Agregado'},
+                color_discrete_sequence=COLOR_SCALES['sequential']
+            )
+            fig_household_area.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+                showlegend=False  # Hide legend since colors are just for visual grouping
+            )
+            return fig_household_area
+
+        st.plotly_chart(
+            cached_figure("tab6", "area_by_household", version, build_area_by_household),
+            use_container_width=True,
         )
-        st.plotly_chart(fig_household_area, use_container_width=True)
     
     with col2:
-        # Create a chart showing area per person
-        fig_area_per_person = px.line(
-            avg_area_per_person,
-            x='household_size_grouped',
-            y='area_per_person',
-            markers=True,
-            title="Espaço Habitacional por Pessoa por Tamanho do Agregado",
-            labels={'area_per_person': 'Área por Pessoa (m²)', 'household_size_grouped': 'Tamanho do Agregado'},
-            color_discrete_sequence=[SECONDARY_COLORS[0]]
+        def build_area_per_person():
+            # Create a chart showing area per person
+            fig_area_per_person = px.line(
+                avg_area_per_person,
+                x='household_size_grouped',
+                y='area_per_person',
+                markers=True,
+                title="Espaço Habitacional por Pessoa por Tamanho do Agregado",
+                labels={'area_per_person': 'Área por Pessoa (m²)', 'household_size_grouped': 'Tamanho do Agregado'},
+                color_discrete_sequence=[SECONDARY_COLORS[0]]
+            )
+            # Add a reference line for recommended minimum space per person (15 m²)
+            fig_area_per_person.add_hline(
+                y=15,
+                line_dash="dash",
+                line_color="red",
+                annotation_text="Mínimo recomendado (15 m²/pessoa)",
+                annotation_position="bottom right"
+            )
+            fig_area_per_person.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0]
+            )
+            return fig_area_per_person
+
+        st.plotly_chart(
+            cached_figure("tab6", "area_per_person", version, build_area_per_person),
+            use_container_width=True,
+        )
+    
+    # Calculate overcrowding
+    overcrowded_pct = 100 - adequacy_total['adequate_space']
+    
+    metric_col1, metric_col2 = st.columns(2)
+    with metric_col1:
+        st.metric(
+            label="Taxa de Sobrelotação",
+            value=f"{overcrowded_pct:.1f}%",
+            help="Percentagem de agregados com menos de 15m² por pessoa, um limiar comum para espaço habitacional adequado"
         )
-        # Add a reference line for recommended minimum space per person (15 m²)
-        fig_area_per_person.add_hline(
-            y=15,
-            line_dash="dash",
-            line_color="red",
-            annotation_text="Mínimo recomendado (15 m²/pessoa)",
-            annotation_position="bottom right"
+    with metric_col2:
+        st.metric(
+            label="Sobrelotação (critério UE)",
+            value=f"{adequacy_total['overcrowded_eu']:.1f}%",
+            help="Percentagem de agregados com menos quartos do que o critério do Eurostat exige: um quarto por casal, por outro adulto e por cada duas crianças (aproximação com base no número de pessoas dependentes e não dependentes)"
         )
-        fig_area_per_person.update_layout(
+    
+    # Adequacy index by district or income bracket, from the per-respondent index
+    adequacy_dimensions = {'distrito': 'Distrito', 'rendimento_clean': 'Escalão de Rendimento'}
+    adequacy_dimension = st.selectbox(
+        "Índice de Adequação Habitacional por",
+        list(adequacy_dimensions),
+        format_func=adequacy_dimensions.get,
+        key="tab6_adequacy_dimension",
+    )
+    adequacy_groups = cached_adequacy_by_group(df, version, adequacy_dimension).reset_index()
+    adequacy_groups = adequacy_groups.sort_values('adequacy_index', ascending=False)
+    
+    def build_adequacy():
+        fig_adequacy = px.bar(
+            adequacy_groups,
+            x=adequacy_dimension,
+            y='adequacy_index',
+            color='adequacy_index',
+            color_continuous_scale=COLOR_SCALES['sequential'],
+            hover_data={'count': True, 'adequate_space': ':.1f', 'adequate_bedrooms': ':.1f', 'overcrowded_eu': ':.1f'},
+            title=f"Índice de Adequação Habitacional por {adequacy_dimensions[adequacy_dimension]}",
+            labels={
+                adequacy_dimension: adequacy_dimensions[adequacy_dimension],
+                'adequacy_index': 'Índice (0-100)',
+                'count': 'Respostas',
+                'adequate_space': 'Espaço adequado (%)',
+                'adequate_bedrooms': 'Quartos adequados (%)',
+                'overcrowded_eu': 'Sobrelotação UE (%)',
+            },
+        )
+        fig_adequacy.update_layout(
             plot_bgcolor=BACKGROUND_COLORS[0],
             paper_bgcolor=BACKGROUND_COLORS[3],
             font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0]
+            title_font_color=TEXT_COLORS[0],
+            yaxis_range=[0, 100],
         )
-        st.plotly_chart(fig_area_per_person, use_container_width=True)
-    
-    # Calculate overcrowding
-    overcrowded_pct = (area_per_person_metrics['area_per_person'] < 15).sum() / area_per_person_metrics['area_per_person'].count() * 100
-    
-    st.metric(
-        label="Taxa de Sobrelotação",
-        value=f"{overcrowded_pct:.1f}%",
-        help="Percentagem de agregados com menos de 15m² por pessoa, um limiar comum para espaço habitacional adequado"
-    )
\ No newline at end of file
+        return fig_adequacy
+
+    st.plotly_chart(
+        cached_figure("tab6", "adequacy", version, build_adequacy, {"dimension": adequacy_dimension}),
+        use_container_width=True,
+    )
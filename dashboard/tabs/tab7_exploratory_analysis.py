@@ -2,8 +2,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import numpy as np
-from scipy import stats
 
 def show_exploratory_analysis_tab(df):
     # Import necessary style configurations
@@ -14,8 +12,19 @@ def show_exploratory_analysis_tab(df):
         SECONDARY_COLORS,
         ACCENT_COLORS,
         TEXT_COLORS,
-        CHART_COLORS
+        CHART_COLORS,
+        DENSITY_POINT_THRESHOLD,
     )
+    import charts
+    from data_grid import cached_filtered_positions, show_data_grid, show_export_controls
+    from analytics.box_stats import cached_box_summary
+    from analytics.correlation import cached_correlation_stats, top_pairs
+    from analytics.timeseries import ROLLING_WINDOW, cached_period_aggregates, trend_fit
+    from analytics.quantiles import sketch_cube
+    from data.engine import query_engine
+    from data.schema import dataset_schema
+    from data.versioning import dataset_version
+    from figure_cache import cached_figure
     st.header("Análise Exploratória de Dados")
 
     # Explain what is the purpose of this tab
@@ -166,34 +175,50 @@ def show_exploratory_analysis_tab(df):
             selected_education = reverse_education_mapping.get(selected_education_pt, selected_education_pt) if selected_education_pt != "Todos" else "Todos"
 
     # Apply filters to the dataframe
-    filtered_df = df.copy()
+    active_filters = []
 
     if "housing_situation" in df.columns and selected_housing != "Todos":
-        filtered_df = filtered_df[filtered_df["housing_situation"] == selected_housing]
+        active_filters.append(("housing_situation", selected_housing))
 
     if "distrito" in df.columns and selected_district != "Todos":
-        filtered_df = filtered_df[filtered_df["distrito"] == selected_district]
+        active_filters.append(("distrito", selected_district))
 
     if "rendimento_clean" in df.columns and selected_income != "Todos":
-        filtered_df = filtered_df[filtered_df["rendimento_clean"] == selected_income]
+        active_filters.append(("rendimento_clean", selected_income))
 
     if "satisfaction_level" in df.columns and selected_satisfaction != "Todos":
-        filtered_df = filtered_df[
-            filtered_df["satisfaction_level"] == selected_satisfaction
-        ]
+        active_filters.append(("satisfaction_level", selected_satisfaction))
 
     if "house_type" in df.columns and selected_house_type != "Todos":
-        filtered_df = filtered_df[filtered_df["house_type"] == selected_house_type]
+        active_filters.append(("house_type", selected_house_type))
 
     if "education_level" in df.columns and selected_education != "Todos":
-        filtered_df = filtered_df[filtered_df["education_level"] == selected_education]
+        active_filters.append(("education_level", selected_education))
+
+    # Filter state used as cache key for precomputed statistics
+    active_filters = tuple(active_filters)
+    filter_columns = tuple(
+        col
+        for col in ["housing_situation", "distrito", "rendimento_clean", "satisfaction_level", "house_type", "education_level"]
+        if col in df.columns
+    )
+    version = dataset_version(df)
+    schema = dataset_schema(df, version)
+
+    # The filtered rows, selected by positions shared between sessions (the full data is not copied)
+    if active_filters:
+        filtered_df = df.iloc[cached_filtered_positions(df, version, active_filters)]
+    else:
+        filtered_df = df
 
     # Show filtered data count
     st.write(f"A mostrar {len(filtered_df)} de {len(df)} registos")
 
-    # Show dataframe with filtered data
-    with st.expander("Ver Dados", expanded=False):
-        st.dataframe(filtered_df, use_container_width=True)
+    # Paginated view of the filtered data, rendered only while expanded
+    show_data_grid(df, version, active_filters, schema, key="tab7_data_grid")
+
+    # Export of the filtered data, generated only when the download is requested
+    show_export_controls(df, version, active_filters, key="tab7_export", file_stem="habitacao_filtrado")
 
     # Auto chart generation section
     st.subheader("Geração Automática de Gráficos")
@@ -208,18 +233,9 @@ def show_exploratory_analysis_tab(df):
             ["Gráfico de Barras", "Histograma", "Gráfico de Dispersão", "Gráfico de Caixa", "Gráfico Circular"],
         )
 
-        # Get numeric and categorical columns for axis selection
-        numeric_cols = filtered_df.select_dtypes(include=["number"]).columns.tolist()
-        categorical_cols = filtered_df.select_dtypes(
-            include=["object", "category"]
-        ).columns.tolist()
-
-        # Remove complex list columns
-        categorical_cols = [
-            col
-            for col in categorical_cols
-            if not any(filtered_df[col].astype(str).str.contains("\[", na=False))
-        ]
+        # Axis options come from the dataset schema, built once per dataset version
+        numeric_cols = schema.numeric_columns()
+        categorical_cols = schema.categorical_columns()
 
         # Add cleaned columns that might be useful
         for col in [
@@ -237,115 +253,163 @@ def show_exploratory_analysis_tab(df):
     with chart_col2:
         # Dynamic options based on chart type
         if chart_type == "Gráfico de Barras":
-            x_axis = st.selectbox("Eixo X (Categoria)", categorical_cols)
+            x_axis = st.selectbox("Eixo X (Categoria)", categorical_cols, format_func=schema.label)
             agg_option = st.selectbox("Agregação", ["Contagem", "Média", "Soma", "Mediana"])
 
             if agg_option != "Contagem":
-                y_axis = st.selectbox("Eixo Y (Numérico)", numeric_cols)
+                y_axis = st.selectbox("Eixo Y (Numérico)", numeric_cols, format_func=schema.label)
             else:
                 y_axis = None
 
         elif chart_type == "Histograma":
-            x_axis = st.selectbox("Eixo X (Numérico)", numeric_cols)
+            x_axis = st.selectbox("Eixo X (Numérico)", numeric_cols, format_func=schema.label)
             bins = st.slider("Número de Intervalos", min_value=5, max_value=50, value=20)
             y_axis = None
 
         elif chart_type == "Gráfico de Dispersão":
-            x_axis = st.selectbox("Eixo X (Numérico)", numeric_cols)
-            y_axis = st.selectbox("Eixo Y (Numérico)", numeric_cols)
-            color_option = st.selectbox("Cor Por", ["Nenhum"] + categorical_cols)
+            x_axis = st.selectbox("Eixo X (Numérico)", numeric_cols, format_func=schema.label)
+            y_axis = st.selectbox("Eixo Y (Numérico)", numeric_cols, format_func=schema.label)
+            color_option = st.selectbox("Cor Por", ["Nenhum"] + categorical_cols, format_func=schema.label)
             if color_option == "Nenhum":
                 color_option = None
+            scatter_mode = st.radio(
+                "Modo de Visualização",
+                ["Pontos", "Densidade"],
+                index=1 if len(filtered_df) > DENSITY_POINT_THRESHOLD else 0,
+                horizontal=True,
+                help="A densidade agrupa os pontos numa grelha 2D no servidor; selecione uma área para ampliar.",
+            )
 
         elif chart_type == "Gráfico de Caixa":
-            x_axis = st.selectbox("Eixo X (Categoria)", categorical_cols)
-            y_axis = st.selectbox("Eixo Y (Numérico)", numeric_cols)
+            x_axis = st.selectbox("Eixo X (Categoria)", categorical_cols, format_func=schema.label)
+            y_axis = st.selectbox("Eixo Y (Numérico)", numeric_cols, format_func=schema.label)
 
         else:  # Pie Chart
-            x_axis = st.selectbox("Categoria", categorical_cols)
+            x_axis = st.selectbox("Categoria", categorical_cols, format_func=schema.label)
             y_axis = None
 
     # Generate the chart
     if len(filtered_df) > 0:
         st.subheader("Gráfico Gerado")
 
+        # Widget values the generated chart depends on (figure cache key)
+        chart_params = {"type": chart_type, "x": x_axis, "y": y_axis, "filters": active_filters}
+
         if chart_type == "Gráfico de Barras":
-            if agg_option == "Contagem":
-                # Fix for the bar chart - Create proper dataframe for value counts
-                value_counts = filtered_df[x_axis].value_counts().reset_index()
-                value_counts.columns = [x_axis, "count"]  # Properly rename columns
-
-                fig = px.bar(
-                    value_counts,
-                    x=x_axis,  # Use the actual column name, not 'index'
-                    y="count",
-                    title=f"Contagem de {x_axis}",
-                    labels={x_axis: x_axis, "count": "Contagem"},
-                    color_discrete_sequence=PRIMARY_COLORS,
+            chart_params["agg"] = agg_option
+            if agg_option == "Mediana":
+                # Approximate medians from the per-cell quantile sketches
+                bar_sketches = sketch_cube(
+                    df, version, y_axis, filter_columns + (x_axis,)
                 )
-            else:
-                agg_func = {"média": np.mean, "soma": np.sum, "mediana": np.median}[
-                    agg_option.lower()
-                ]
                 agg_data = (
-                    filtered_df.groupby(x_axis)[y_axis].agg(agg_func).reset_index()
+                    bar_sketches.quantiles([0.5], filters=active_filters, by=x_axis)[0.5]
+                    .rename(y_axis)
+                    .reset_index()
                 )
-                fig = px.bar(
-                    agg_data,
+            elif agg_option != "Contagem":
+                agg_func = {"média": "mean", "soma": "sum"}[agg_option.lower()]
+                agg_data = query_engine(df, version).group_aggregate(
+                    x_axis, y_axis, agg_func, filters=active_filters
+                )
+        elif chart_type == "Histograma":
+            chart_params["bins"] = bins
+        elif chart_type == "Gráfico de Dispersão":
+            chart_params.update(color=color_option, mode=scatter_mode)
+            if scatter_mode == "Densidade":
+                density_key = f"tab7_density_{x_axis}_{y_axis}"
+                x_range, y_range = charts.density_zoom(density_key)
+                chart_params["zoom"] = (x_range, y_range)
+
+        def build_generated_chart():
+            if chart_type == "Gráfico de Barras":
+                if agg_option == "Contagem":
+                    # Counts per category, from the query engine
+                    value_counts = query_engine(df, version).group_aggregate(x_axis, filters=active_filters)
+
+                    fig = px.bar(
+                        value_counts,
+                        x=x_axis,  # Use the actual column name, not 'index'
+                        y="count",
+                        title=f"Contagem de {x_axis}",
+                        labels={x_axis: x_axis, "count": "Contagem"},
+                        color_discrete_sequence=PRIMARY_COLORS,
+                    )
+                else:
+                    fig = px.bar(
+                        agg_data,
+                        x=x_axis,
+                        y=y_axis,
+                        title=f"{agg_option} de {y_axis} por {x_axis}",
+                        color_discrete_sequence=PRIMARY_COLORS,
+                    )
+
+            elif chart_type == "Histograma":
+                fig = px.histogram(
+                    filtered_df, 
+                    x=x_axis, 
+                    nbins=bins, 
+                    title=f"Distribuição de {x_axis}",
+                    color_discrete_sequence=SECONDARY_COLORS,
+                )
+
+            elif chart_type == "Gráfico de Dispersão" and scatter_mode == "Densidade":
+                fig = charts.density_heatmap(
+                    filtered_df,
                     x=x_axis,
                     y=y_axis,
-                    title=f"{agg_option} de {y_axis} por {x_axis}",
-                    color_discrete_sequence=PRIMARY_COLORS,
+                    x_range=x_range,
+                    y_range=y_range,
+                    title=f"Densidade de {y_axis} vs {x_axis}",
                 )
 
-        elif chart_type == "Histograma":
-            fig = px.histogram(
-                filtered_df, 
-                x=x_axis, 
-                nbins=bins, 
-                title=f"Distribuição de {x_axis}",
-                color_discrete_sequence=SECONDARY_COLORS,
-            )
+            elif chart_type == "Gráfico de Dispersão":
+                fig = charts.scatter(
+                    filtered_df,
+                    x=x_axis,
+                    y=y_axis,
+                    color=color_option,
+                    title=f"{y_axis} vs {x_axis}",
+                    color_discrete_sequence=CHART_COLORS if color_option else PRIMARY_COLORS,
+                )
 
-        elif chart_type == "Gráfico de Dispersão":
-            fig = px.scatter(
-                filtered_df,
-                x=x_axis,
-                y=y_axis,
-                color=color_option,
-                title=f"{y_axis} vs {x_axis}",
-                color_discrete_sequence=CHART_COLORS if color_option else PRIMARY_COLORS,
-            )
+            elif chart_type == "Gráfico de Caixa":
+                box_stats = cached_box_summary(
+                    df, version, y_axis, by=x_axis, filters=active_filters
+                )
+                fig = charts.box_from_summary(
+                    box_stats,
+                    title=f"Distribuição de {y_axis} por {x_axis}",
+                    x_title=x_axis,
+                    y_title=y_axis,
+                    color_sequence=ACCENT_COLORS,
+                )
 
-        elif chart_type == "Gráfico de Caixa":
-            fig = px.box(
-                filtered_df,
-                x=x_axis,
-                y=y_axis,
-                title=f"Distribuição de {y_axis} por {x_axis}",
-                color_discrete_sequence=ACCENT_COLORS,
-            )
+            else:  # Pie Chart
+                value_counts = filtered_df[x_axis].value_counts()
+                fig = px.pie(
+                    names=value_counts.index,
+                    values=value_counts.values,
+                    title=f"Distribuição de {x_axis}",
+                    color_discrete_sequence=COLOR_SCALES["qualitative"],
+                )
 
-        else:  # Pie Chart
-            value_counts = filtered_df[x_axis].value_counts()
-            fig = px.pie(
-                names=value_counts.index,
-                values=value_counts.values,
-                title=f"Distribuição de {x_axis}",
-                color_discrete_sequence=COLOR_SCALES["qualitative"],
+            # Apply common chart styling
+            fig.update_layout(
+                plot_bgcolor=BACKGROUND_COLORS[0],
+                paper_bgcolor=BACKGROUND_COLORS[3],
+                font_color=TEXT_COLORS[2],
+                title_font_color=TEXT_COLORS[0],
+                legend_title_font_color=TEXT_COLORS[1],
             )
-
-        # Apply common chart styling
-        fig.update_layout(
-            plot_bgcolor=BACKGROUND_COLORS[0],
-            paper_bgcolor=BACKGROUND_COLORS[3],
-            font_color=TEXT_COLORS[2],
-            title_font_color=TEXT_COLORS[0],
-            legend_title_font_color=TEXT_COLORS[1],
-        )
+            return fig
 
         # Show the generated chart
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_figure("tab7", "generated_chart", version, build_generated_chart, chart_params)
+        if chart_type == "Gráfico de Dispersão" and scatter_mode == "Densidade":
+            charts.show_zoomable_density(fig, density_key)
+        else:
+            st.plotly_chart(fig, use_container_width=True)
 
         # Add chart description
         with st.expander("Insights do Gráfico", expanded=False):
@@ -362,7 +426,8 @@ def show_exploratory_analysis_tab(df):
                         f"- Número de valores únicos de {x_axis}: {filtered_df[x_axis].nunique()}"
                     )
                 else:
-                    agg_data = filtered_df.groupby(x_axis)[y_axis].agg(agg_func)
+                    # Reuse the aggregation computed for the chart
+                    agg_data = agg_data.set_index(x_axis)[y_axis]
                     max_category = agg_data.idxmax()
                     min_category = agg_data.idxmin()
                     st.write(
@@ -433,47 +498,53 @@ def show_exploratory_analysis_tab(df):
                 default=numeric_cols[:5] if len(numeric_cols) > 5 else numeric_cols,
             )
 
+            corr_method = st.radio(
+                "Método",
+                ["Pearson", "Spearman"],
+                horizontal=True,
+                help="Spearman usa as ordens (ranks) dos valores e capta relações monótonas não lineares.",
+            )
+
             if corr_cols and len(corr_cols) > 1:
-                corr_matrix = filtered_df[corr_cols].corr()
-
-                # Create a heatmap for the correlation matrix
-                fig = px.imshow(
-                    corr_matrix,
-                    text_auto=True,
-                    color_continuous_scale="RdBu_r",
-                    title="Matriz de Correlação",
-                )
-                fig.update_layout(
-                    plot_bgcolor=BACKGROUND_COLORS[0],
-                    paper_bgcolor=BACKGROUND_COLORS[3],
-                    font_color=TEXT_COLORS[2],
-                    title_font_color=TEXT_COLORS[0],
+                # Sufficient statistics for all numeric columns, cached per filter state
+                corr_stats = cached_correlation_stats(
+                    df, version, tuple(numeric_cols), active_filters, corr_method.lower()
                 )
-                st.plotly_chart(fig, use_container_width=True)
-
-                # Find the strongest correlations
-                corr_pairs = []
-                for i in range(len(corr_cols)):
-                    for j in range(i + 1, len(corr_cols)):
-                        corr_value = corr_matrix.iloc[i, j]
-                        corr_pairs.append((corr_cols[i], corr_cols[j], corr_value))
+                corr_matrix = corr_stats.matrix(corr_cols)
+
+                def build_correlation_matrix():
+                    # Create a heatmap for the correlation matrix
+                    fig = px.imshow(
+                        corr_matrix,
+                        text_auto=True,
+                        color_continuous_scale="RdBu_r",
+                        title=f"Matriz de Correlação ({corr_method})",
+                    )
+                    fig.update_layout(
+                        plot_bgcolor=BACKGROUND_COLORS[0],
+                        paper_bgcolor=BACKGROUND_COLORS[3],
+                        font_color=TEXT_COLORS[2],
+                        title_font_color=TEXT_COLORS[0],
+                    )
+                    return fig
 
-                # Sort by absolute correlation value and show the top 5
-                corr_pairs.sort(key=lambda x: abs(x[2]), reverse=True)
+                # Widget values the matrix depends on (figure cache key)
+                corr_params = {"columns": corr_cols, "method": corr_method, "filters": active_filters}
+                st.plotly_chart(
+                    cached_figure("tab7", "correlation_matrix", version, build_correlation_matrix, corr_params),
+                    use_container_width=True,
+                )
 
+                # Find the 5 strongest correlations
                 st.write("Correlações mais fortes:")
-                for col1, col2, corr in corr_pairs[:5]:
+                for col1, col2, corr in top_pairs(corr_matrix, 5):
                     st.write(f"- {col1} e {col2}: {corr:.2f}")
 
     # Trend Analysis Section
     st.subheader("Análise de Tendências")
 
-    # Identify potential time-based columns
-    time_columns = []
-    for col in df.columns:
-        if any(time_term in col.lower() for time_term in ['ano', 'year', 'date', 'time', 'period']):
-            if col in filtered_df.columns:
-                time_columns.append(col)
+    # Time-based columns, detected by name in the dataset schema
+    time_columns = schema.time_columns()
 
     # Check if we have any time-based columns
     if not time_columns:
@@ -491,6 +562,9 @@ def show_exploratory_analysis_tab(df):
             "Tipo de Análise",
             ["Série Temporal", "Comparação Ano a Ano", "Distribuição ao Longo do Tempo"]
         )
+
+        # Widget values the trend charts depend on (figure cache key)
+        trend_params = {"time": time_col, "variable": trend_var, "filters": active_filters}
         
         # Prepare data for analysis
         if time_col in filtered_df.columns and trend_var in filtered_df.columns:
@@ -506,41 +580,62 @@ def show_exploratory_analysis_tab(df):
                     if analysis_type == "Série Temporal":
                         if pd.api.types.is_numeric_dtype(filtered_df[trend_var]):
                             # For numeric variables, calculate average per time period
-                            agg_data = trend_data.groupby(time_col)[trend_var].agg(['mean', 'median', 'count']).reset_index()
-                            
-                            # Create time series plot
-                            fig = px.line(
-                                agg_data,
-                                x=time_col,
-                                y='mean',
-                                title=f"Média de {trend_var} ao Longo do Tempo",
-                                labels={time_col: time_col, 'mean': f'Média de {trend_var}'},
-                                color_discrete_sequence=[PRIMARY_COLORS[0]],
+                            agg_data = cached_period_aggregates(
+                                df, version, time_col, trend_var, active_filters
                             )
-                            # Add confidence interval
-                            fig.add_scatter(
-                                x=agg_data[time_col],
-                                y=agg_data['median'],
-                                mode='lines',
-                                line=dict(dash='dash', color=SECONDARY_COLORS[0]),
-                                name='Mediana'
+                            # Medians come from the per-cell quantile sketches, merged for the active filters
+                            trend_sketches = sketch_cube(
+                                df, version, trend_var, filter_columns + (time_col,)
                             )
-                            fig.update_layout(
-                                plot_bgcolor=BACKGROUND_COLORS[0],
-                                paper_bgcolor=BACKGROUND_COLORS[3],
-                                font_color=TEXT_COLORS[2],
-                                title_font_color=TEXT_COLORS[0],
+                            trend_medians = trend_sketches.quantiles(
+                                [0.5], filters=active_filters, by=time_col
+                            )[0.5]
+                            agg_data['median'] = agg_data[time_col].map(trend_medians)
+                            
+                            def build_trend_series():
+                                # Create time series plot
+                                fig = px.line(
+                                    agg_data,
+                                    x=time_col,
+                                    y='mean',
+                                    title=f"Média de {trend_var} ao Longo do Tempo",
+                                    labels={time_col: time_col, 'mean': f'Média de {trend_var}'},
+                                    color_discrete_sequence=[PRIMARY_COLORS[0]],
+                                )
+                                # Add confidence interval
+                                fig.add_scatter(
+                                    x=agg_data[time_col],
+                                    y=agg_data['median'],
+                                    mode='lines',
+                                    line=dict(dash='dash', color=SECONDARY_COLORS[0]),
+                                    name='Mediana'
+                                )
+                                fig.add_scatter(
+                                    x=agg_data[time_col],
+                                    y=agg_data['rolling_mean'],
+                                    mode='lines',
+                                    line=dict(dash='dot', color=PRIMARY_COLORS[2]),
+                                    name=f'Média Móvel ({ROLLING_WINDOW} períodos)'
+                                )
+                                fig.update_layout(
+                                    plot_bgcolor=BACKGROUND_COLORS[0],
+                                    paper_bgcolor=BACKGROUND_COLORS[3],
+                                    font_color=TEXT_COLORS[2],
+                                    title_font_color=TEXT_COLORS[0],
+                                )
+                                return fig
+
+                            st.plotly_chart(
+                                cached_figure("tab7", "trend_series", version, build_trend_series, trend_params),
+                                use_container_width=True,
                             )
-                            st.plotly_chart(fig, use_container_width=True)
                             
                             # Show data points count
                             st.write(f"Total de pontos de dados: {len(trend_data)}")
                             
                             # Show key statistics
-                            earliest = trend_data[time_col].min()
-                            latest = trend_data[time_col].max()
-                            earliest_avg = trend_data[trend_data[time_col] == earliest][trend_var].mean()
-                            latest_avg = trend_data[trend_data[time_col] == latest][trend_var].mean()
+                            earliest, latest = agg_data[time_col].iloc[0], agg_data[time_col].iloc[-1]
+                            earliest_avg, latest_avg = agg_data['mean'].iloc[0], agg_data['mean'].iloc[-1]
                             
                             # Calculate overall change
                             change = latest_avg - earliest_avg
@@ -549,12 +644,10 @@ def show_exploratory_analysis_tab(df):
                             st.write(f"De {earliest} até {latest}, {trend_var} mudou em {change:.2f} ({percent_change:.1f}%)")
                             
                             # Trend analysis
-                            if len(agg_data) > 1:
+                            fit = trend_fit(agg_data, time_col)
+                            if fit is not None:
                                 # Simple linear regression to determine trend
-                                
-                                x = agg_data[time_col].values
-                                y = agg_data['mean'].values
-                                slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+                                slope, r_value = fit.slope, fit.rvalue
                                 
                                 trend_direction = "ascendente" if slope > 0 else "descendente"
                                 trend_strength = "forte" if abs(r_value) > 0.7 else "moderada" if abs(r_value) > 0.3 else "fraca"
@@ -564,78 +657,80 @@ def show_exploratory_analysis_tab(df):
                             # For categorical variables, show distribution over time
                             st.info(f"A variável selecionada '{trend_var}' é categórica. A mostrar distribuição ao longo do tempo.")
                             
-                            # Create a crosstab of time vs. category
-                            crosstab = pd.crosstab(trend_data[time_col], trend_data[trend_var], normalize='index')
-                            crosstab_long = crosstab.reset_index().melt(id_vars=[time_col])
+                            def build_trend_categories():
+                                # Share of every category per time period, counted by the query engine
+                                counts = query_engine(df, version).crosstab(time_col, trend_var, filters=active_filters)
+                                crosstab = counts.div(counts.sum(axis=1), axis=0)
+                                crosstab_long = crosstab.reset_index().melt(id_vars=[time_col], var_name='variable')
                             
-                            fig = px.area(
-                                crosstab_long,
-                                x=time_col,
-                                y='value',
-                                color='variable',
-                                title=f"Distribuição de {trend_var} ao Longo do Tempo",
-                                labels={'value': 'Percentagem', 'variable': trend_var},
-                                color_discrete_sequence=COLOR_SCALES['sequential'],
-                            )
-                            fig.update_layout(
-                                plot_bgcolor=BACKGROUND_COLORS[0],
-                                paper_bgcolor=BACKGROUND_COLORS[3],
-                                font_color=TEXT_COLORS[2],
-                                title_font_color=TEXT_COLORS[0],
+                                fig = px.area(
+                                    crosstab_long,
+                                    x=time_col,
+                                    y='value',
+                                    color='variable',
+                                    title=f"Distribuição de {trend_var} ao Longo do Tempo",
+                                    labels={'value': 'Percentagem', 'variable': trend_var},
+                                    color_discrete_sequence=COLOR_SCALES['sequential'],
+                                )
+                                fig.update_layout(
+                                    plot_bgcolor=BACKGROUND_COLORS[0],
+                                    paper_bgcolor=BACKGROUND_COLORS[3],
+                                    font_color=TEXT_COLORS[2],
+                                    title_font_color=TEXT_COLORS[0],
+                                )
+                                return fig
+
+                            st.plotly_chart(
+                                cached_figure("tab7", "trend_categories", version, build_trend_categories, trend_params),
+                                use_container_width=True,
                             )
-                            st.plotly_chart(fig, use_container_width=True)
                     
                     elif analysis_type == "Comparação Ano a Ano":
                         if pd.api.types.is_numeric_dtype(filtered_df[trend_var]):
-                            # Get unique years/time periods
-                            time_periods = sorted(filtered_df[time_col].unique())
+                            # Per-period means and changes in one grouped pass
+                            period_data = cached_period_aggregates(
+                                df, version, time_col, trend_var, active_filters
+                            )
+                            time_periods = period_data[time_col].tolist()
                             
                             if len(time_periods) > 1:
                                 # Calculate year-over-year change
-                                yoy_data = []
-                                for i in range(1, len(time_periods)):
-                                    current_period = time_periods[i]
-                                    previous_period = time_periods[i-1]
-                                    
-                                    current_avg = filtered_df[filtered_df[time_col] == current_period][trend_var].mean()
-                                    previous_avg = filtered_df[filtered_df[time_col] == previous_period][trend_var].mean()
-                                    
-                                    change = current_avg - previous_avg
-                                    pct_change = (change / previous_avg) * 100 if previous_avg != 0 else 0
-                                    
-                                    yoy_data.append({
-                                        'Period': f"{previous_period} para {current_period}",
-                                        'Change': change,
-                                        'Percent_Change': pct_change
-                                    })
+                                yoy_df = period_data.iloc[1:]
+                                yoy_df = pd.DataFrame({
+                                    'Period': yoy_df['previous_period'].astype(str) + " para " + yoy_df[time_col].astype(str),
+                                    'Change': yoy_df['change'],
+                                    'Percent_Change': yoy_df['pct_change'],
+                                })
                                 
-                                # Create dataframe for visualization
-                                yoy_df = pd.DataFrame(yoy_data)
+                                def build_trend_year_over_year():
+                                    # Create bar chart of changes
+                                    fig = px.bar(
+                                        yoy_df,
+                                        x='Period',
+                                        y='Percent_Change',
+                                        title=f"Mudança Ano a Ano em {trend_var}",
+                                        labels={'Percent_Change': 'Mudança Percentual (%)'},
+                                        color_discrete_sequence=[PRIMARY_COLORS[0], PRIMARY_COLORS[1]],
+                                    )
                                 
-                                # Create bar chart of changes
-                                fig = px.bar(
-                                    yoy_df,
-                                    x='Period',
-                                    y='Percent_Change',
-                                    title=f"Mudança Ano a Ano em {trend_var}",
-                                    labels={'Percent_Change': 'Mudança Percentual (%)'},
-                                    color_discrete_sequence=[PRIMARY_COLORS[0], PRIMARY_COLORS[1]],
-                                )
-                                
-                                # Add color based on positive/negative change
-                                fig.update_traces(marker_color=yoy_df['Percent_Change'].apply(
-                                    lambda x: SECONDARY_COLORS[0] if x > 0 else TEXT_COLORS[3]
-                                ))
+                                    # Add color based on positive/negative change
+                                    fig.update_traces(marker_color=yoy_df['Percent_Change'].apply(
+                                        lambda x: SECONDARY_COLORS[0] if x > 0 else TEXT_COLORS[3]
+                                    ))
                                 
-                                fig.update_layout(
-                                    plot_bgcolor=BACKGROUND_COLORS[0],
-                                    paper_bgcolor=BACKGROUND_COLORS[3],
-                                    font_color=TEXT_COLORS[2],
-                                    title_font_color=TEXT_COLORS[0],
+                                    fig.update_layout(
+                                        plot_bgcolor=BACKGROUND_COLORS[0],
+                                        paper_bgcolor=BACKGROUND_COLORS[3],
+                                        font_color=TEXT_COLORS[2],
+                                        title_font_color=TEXT_COLORS[0],
+                                    )
+                                    return fig
+
+                                st.plotly_chart(
+                                    cached_figure("tab7", "trend_year_over_year", version, build_trend_year_over_year, trend_params),
+                                    use_container_width=True,
                                 )
                                 
-                                st.plotly_chart(fig, use_container_width=True)
-                                
                                 # Show statistics
                                 avg_change = yoy_df['Percent_Change'].mean()
                                 max_change = yoy_df.loc[yoy_df['Percent_Change'].idxmax()]
@@ -651,22 +746,34 @@ def show_exploratory_analysis_tab(df):
                     
                     elif analysis_type == "Distribuição ao Longo do Tempo":
                         # Create a box plot showing distribution of the variable over time
-                        fig = px.box(
-                            trend_data,
-                            x=time_col,
-                            y=trend_var if pd.api.types.is_numeric_dtype(filtered_df[trend_var]) else None,
-                            color=time_col,
-                            title=f"Distribuição de {trend_var} ao Longo do Tempo",
-                            notched=True,
-                            color_discrete_sequence=COLOR_SCALES['sequential'],
-                        )
-                        fig.update_layout(
-                            plot_bgcolor=BACKGROUND_COLORS[0],
-                            paper_bgcolor=BACKGROUND_COLORS[3],
-                            font_color=TEXT_COLORS[2],
-                            title_font_color=TEXT_COLORS[0],
+                        if pd.api.types.is_numeric_dtype(filtered_df[trend_var]):
+                            box_stats = cached_box_summary(
+                                df, version, trend_var, by=time_col, filters=active_filters
+                            )
+                        else:
+                            box_stats = cached_box_summary(
+                                df, version, time_col, filters=active_filters
+                            )
+                        def build_trend_distribution():
+                            fig = charts.box_from_summary(
+                                box_stats,
+                                title=f"Distribuição de {trend_var} ao Longo do Tempo",
+                                x_title=time_col,
+                                notched=True,
+                                color_sequence=COLOR_SCALES['sequential'],
+                            )
+                            fig.update_layout(
+                                plot_bgcolor=BACKGROUND_COLORS[0],
+                                paper_bgcolor=BACKGROUND_COLORS[3],
+                                font_color=TEXT_COLORS[2],
+                                title_font_color=TEXT_COLORS[0],
+                            )
+                            return fig
+
+                        st.plotly_chart(
+                            cached_figure("tab7", "trend_distribution", version, build_trend_distribution, trend_params),
+                            use_container_width=True,
                         )
-                        st.plotly_chart(fig, use_container_width=True)
                         
                         # Distribution statistics
                         with st.expander("Estatísticas de Distribuição", expanded=False):
@@ -678,21 +785,27 @@ def show_exploratory_analysis_tab(df):
                                 # Variance over time
                                 variance_over_time = trend_data.groupby(time_col)[trend_var].var().reset_index()
                                 
-                                fig_var = px.line(
-                                    variance_over_time,
-                                    x=time_col,
-                                    y=trend_var,
-                                    title=f"Variância em {trend_var} ao Longo do Tempo",
-                                    markers=True,
-                                    color_discrete_sequence=[SECONDARY_COLORS[0]],
-                                )
-                                fig_var.update_layout(
-                                    plot_bgcolor=BACKGROUND_COLORS[0],
-                                    paper_bgcolor=BACKGROUND_COLORS[3],
-                                    font_color=TEXT_COLORS[2],
-                                    title_font_color=TEXT_COLORS[0],
+                                def build_trend_variance():
+                                    fig_var = px.line(
+                                        variance_over_time,
+                                        x=time_col,
+                                        y=trend_var,
+                                        title=f"Variância em {trend_var} ao Longo do Tempo",
+                                        markers=True,
+                                        color_discrete_sequence=[SECONDARY_COLORS[0]],
+                                    )
+                                    fig_var.update_layout(
+                                        plot_bgcolor=BACKGROUND_COLORS[0],
+                                        paper_bgcolor=BACKGROUND_COLORS[3],
+                                        font_color=TEXT_COLORS[2],
+                                        title_font_color=TEXT_COLORS[0],
+                                    )
+                                    return fig_var
+
+                                st.plotly_chart(
+                                    cached_figure("tab7", "trend_variance", version, build_trend_variance, trend_params),
+                                    use_container_width=True,
                                 )
-                                st.plotly_chart(fig_var, use_container_width=True)
                                 
                                 # Check if variance is increasing or decreasing
                                 if len(variance_over_time) > 1:
@@ -705,7 +818,7 @@ def show_exploratory_analysis_tab(df):
                                         st.write(f"A variabilidade em {trend_var} diminuiu ao longo do tempo.")
                             else:
                                 # For categorical variables, show frequency distribution
-                                freq_dist = pd.crosstab(trend_data[time_col], trend_data[trend_var])
+                                freq_dist = query_engine(df, version).crosstab(time_col, trend_var, filters=active_filters)
                                 st.dataframe(freq_dist, use_container_width=True)
                 else:
                     st.warning("As colunas selecionadas não contêm dados válidos para análise de tendências.")
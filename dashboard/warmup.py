@@ -0,0 +1,139 @@
+# warmup.py
+"""
+Build and verify every dataset-dependent cache before the dashboard serves traffic.
+
+Run it from the folder the app is started from (the one holding data.csv and the
+GeoJSON), as a build step of the deployment:
+
+    python dashboard/warmup.py [--data data.csv] [--cache-dir .cache] [--prune]
+
+It fills the artifact store with:
+- the processed dataset, as columnar (Parquet) files partitioned by district
+- the DuckDB database of the survey, when the DuckDB query engine is configured
+- the simplified district geometry
+- the aggregate tables and figures every tab builds with its default widget values,
+  by rendering each tab once headless
+
+It then writes a manifest per version and verifies every artifact against it. The
+exit status is 1 when a tab fails to render or an artifact does not verify.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from config import DASHBOARD_TABS
+from data.artifacts import ARTIFACT_DIR, ArtifactStore, set_artifact_store
+from data.engine import QUERY_ENGINE, duckdb_available, write_database
+from data.geo import GEOJSON_FILE, read_district_geojson
+from data.loader import (
+    MISSING_PARTITION,
+    PARTITION_COLUMN,
+    build_dataset,
+    data_path,
+    load_dataset,
+    read_processed,
+    stored_districts,
+)
+from data.versioning import file_version
+
+APP_FILE = Path(__file__).resolve().parent / "app.py"
+# Seconds a single tab may take to render
+TAB_TIMEOUT = 600
+
+
+def render_tabs(data_file):
+    """
+    Render every tab once with its default widget values.
+
+    Returns:
+    list: (tab label, error messages) for the tabs that raised an exception
+    """
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["HABITACAO_DATA_FILE"] = str(data_file)
+    failures = []
+    for label, _, _ in DASHBOARD_TABS:
+        start = time.perf_counter()
+        app = AppTest.from_file(str(APP_FILE), default_timeout=TAB_TIMEOUT)
+        app.session_state["main_tabs"] = label
+        app.run()
+        errors = [str(exception.value) for exception in app.exception]
+        if errors:
+            failures.append((label, errors))
+        print(f"  {label}: {time.perf_counter() - start:.1f} s{' (failed)' if errors else ''}")
+    return failures
+
+
+def verify_dataset(store, data_file, version):
+    """Check that the stored dataset, and each district partition, read back identical to a fresh build of the CSV."""
+    stored = read_processed(store, version)
+    if stored is None:
+        return [f"{version}: processed dataset missing"]
+    expected = build_dataset(data_file)
+    if not stored.equals(expected):
+        return [f"{version}: processed dataset differs from the processed CSV"]
+    problems = []
+    for district in stored_districts(store, version) or []:
+        part = read_processed(store, version, districts=[district])
+        rows = expected[PARTITION_COLUMN].isna() if district == MISSING_PARTITION else expected[PARTITION_COLUMN] == district
+        if not part.equals(expected[rows]):
+            problems.append(f"{version}: partition {district!r} differs from the processed CSV")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=data_path(), help="Survey CSV to build the caches for")
+    parser.add_argument("--cache-dir", default=ARTIFACT_DIR, help="Artifact store folder")
+    parser.add_argument("--prune", action="store_true", help="Delete the artifacts of other versions")
+    args = parser.parse_args()
+
+    data_file = Path(args.data).resolve()
+    store = ArtifactStore(args.cache_dir, writable=True)
+    set_artifact_store(store)
+    dataset_version = file_version(data_file)
+    geometry_version = file_version(GEOJSON_FILE)
+    print(f"Artifact store: {store.root.resolve()}")
+
+    start = time.perf_counter()
+    dataset = load_dataset(data_file)
+    print(f"Processed dataset {dataset.version}: {len(dataset.df)} rows, {time.perf_counter() - start:.1f} s")
+
+    if QUERY_ENGINE == "duckdb" and duckdb_available():
+        start = time.perf_counter()
+        write_database(dataset.df, store, dataset.version)
+        print(f"DuckDB database: {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    read_district_geojson(GEOJSON_FILE)
+    print(f"District geometry {geometry_version}: {time.perf_counter() - start:.1f} s")
+
+    print("Aggregates and default figures:")
+    failures = render_tabs(data_file)
+
+    problems = [f"{label}: {error}" for label, errors in failures for error in errors]
+    problems += verify_dataset(store, data_file, dataset_version)
+    for version in (dataset_version, geometry_version):
+        manifest = store.write_manifest(version)
+        problems += store.verify(version)
+        total = sum(entry["bytes"] for entry in manifest["files"].values())
+        print(f"Version {version}: {len(manifest['files'])} artifacts, {total / 1024:.0f} KiB")
+
+    if args.prune:
+        for version in store.prune({dataset_version, geometry_version}):
+            print(f"Removed version {version}")
+
+    if problems:
+        print("Warm-up failed:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("Warm-up complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+# test_affordability.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from analytics.affordability import simulate_rent_burden
+
+
+def _renters():
+    return pd.DataFrame(
+        {
+            "housing_situation": ["Arrendamento"] * 6 + ["Casa Própria"],
+            "distrito": ["Porto", "Porto", "Porto", "Lisboa", "Lisboa", "Lisboa", "Porto"],
+            # Bracketed answers parse; "sem-rendimento" and unknown answers have no burden
+            "rendimento-anual": [
+                "['12001-20000']", "7001-12000", "sem-rendimento", ">80001", "['<7001']", "???", "20001-35000",
+            ],
+            "valor-mensal-renda": [500, 400, 300, 900, np.nan, 600, np.nan],
+        }
+    )
+
+
+def test_midpoint_and_simulated_shares_have_the_same_denominator():
+    summary = simulate_rent_burden(_renters(), n_draws=200, by="distrito")
+    categories = summary[summary["category"] != ">50% (High + Very High)"]
+    totals = categories.groupby("distrito")[["midpoint_share", "mean_share"]].sum()
+
+    # Every renter counted in a share has a known bracket and rent, so both add up to 100%
+    assert np.allclose(totals["midpoint_share"], 100)
+    assert np.allclose(totals["mean_share"], 100)
@@ -0,0 +1,49 @@
+# test_correlation.py
+import sys
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from analytics.correlation import CorrelationStats, top_pairs
+
+
+def _measurements():
+    rng = np.random.default_rng(11)
+    n = 300
+    base = rng.normal(size=n)
+    df = pd.DataFrame(
+        {
+            "area": base * 30 + 90,
+            "renda": base * 200 + rng.normal(scale=150, size=n) + 600,
+            "rendimento": rng.lognormal(10, 0.5, n),
+            "idade": rng.integers(18, 80, n).astype(float),
+            "divisoes": -base + rng.normal(size=n),
+        }
+    )
+    # A different missing pattern per column, so every pair is complete on other rows
+    for step, column in zip((3, 5, 7, 11), ("area", "renda", "rendimento", "divisoes")):
+        df.loc[df.index[step - 1 :: step], column] = np.nan
+    return df
+
+
+def test_matrix_matches_dataframe_corr():
+    df = _measurements()
+    stats = CorrelationStats(df, df.columns)
+    pd.testing.assert_frame_equal(stats.matrix(df.columns), df.corr(), rtol=1e-10)
+
+    # Submatrices in any column order come from the same statistics
+    subset = ["divisoes", "area", "idade"]
+    pd.testing.assert_frame_equal(stats.matrix(subset), df[subset].corr(), rtol=1e-10)
+
+
+def test_top_pairs_match_brute_force():
+    corr = _measurements().corr()
+    pairs = [(a, b, corr.loc[a, b]) for a, b in combinations(corr.columns, 2)]
+    expected = sorted(pairs, key=lambda pair: -abs(pair[2]))
+
+    for k in (1, 3, len(pairs), len(pairs) + 2):
+        assert top_pairs(corr, k) == expected[:k]
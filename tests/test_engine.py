@@ -0,0 +1,84 @@
+# test_engine.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from data.engine import DuckDBEngine, PandasEngine, PolarsEngine
+
+BRACKETS = ["sem-rendimento", "<7001", "7001-12000", "12001-20000", ">80001"]
+
+
+def _survey():
+    rng = np.random.default_rng(7)
+    n = 60
+    rent = rng.uniform(200, 1200, n)
+    rent[::7] = np.nan
+    return pd.DataFrame(
+        {
+            "distrito": rng.choice(["Porto", "Lisboa", "Braga", "Évora", "Faro"], n),
+            "housing_situation": rng.choice(["Arrendamento", "Casa Própria", "Others", None], n),
+            # Category order differs from the alphabetical order of the brackets
+            "income_category": pd.Categorical(rng.choice(BRACKETS, n), categories=BRACKETS, ordered=True),
+            "valor-mensal-renda": rent,
+        }
+    )
+
+
+@pytest.fixture(params=["polars", "duckdb"])
+def engine_pair(request):
+    pytest.importorskip(request.param)
+    df = _survey()
+    engine = PolarsEngine(df, "engine-test") if request.param == "polars" else DuckDBEngine(df)
+    return PandasEngine(df, "engine-test"), engine
+
+
+@pytest.mark.parametrize("by", ["distrito", "income_category", "housing_situation"])
+def test_counts_match_pandas_order(engine_pair, by):
+    reference, engine = engine_pair
+    expected = reference.group_aggregate(by)
+    pd.testing.assert_frame_equal(engine.group_aggregate(by), expected, check_dtype=False)
+
+    # Ties are broken by group order, so the result does not depend on the engine
+    assert expected.equals(expected.sort_values(["count", by], ascending=[False, True]).reset_index(drop=True))
+
+
+@pytest.mark.parametrize("agg", ["mean", "sum", "median", "min", "max"])
+def test_aggregates_keep_category_order(engine_pair, agg):
+    reference, engine = engine_pair
+    expected = reference.group_aggregate("income_category", "valor-mensal-renda", agg)
+    result = engine.group_aggregate("income_category", "valor-mensal-renda", agg)
+    assert list(expected["income_category"]) == [b for b in BRACKETS if b in set(expected["income_category"])]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "index, columns, filters",
+    [
+        ("distrito", "income_category", ()),
+        ("income_category", "housing_situation", ()),
+        ("housing_situation", "distrito", (("income_category", "<7001"),)),
+    ],
+)
+def test_crosstab_matches_pandas(engine_pair, index, columns, filters):
+    reference, engine = engine_pair
+    expected = reference.crosstab(index, columns, filters=filters)
+    pd.testing.assert_frame_equal(engine.crosstab(index, columns, filters=filters), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize(
+    "filters", [(), (("distrito", "Porto"),), (("distrito", "Lisboa"), ("housing_situation", "Others"))]
+)
+def test_filtered_positions_match_pandas(engine_pair, filters, ascending):
+    reference, engine = engine_pair
+    np.testing.assert_array_equal(engine.filtered_positions(filters), reference.filtered_positions(filters))
+    # Missing rents sort last in both directions, and ties keep their row order
+    np.testing.assert_array_equal(
+        engine.filtered_positions(filters, sort_by="valor-mensal-renda", ascending=ascending),
+        reference.filtered_positions(filters, sort_by="valor-mensal-renda", ascending=ascending),
+    )
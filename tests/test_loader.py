@@ -0,0 +1,36 @@
+# test_loader.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from data.artifacts import ArtifactStore
+from data.loader import PARTITION_COLUMN, process_data, read_processed, stored_districts, write_processed
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data.csv"
+VERSION = "test-version"
+
+
+def _stored(tmp_path):
+    df = process_data(pd.read_csv(DATA_FILE))
+    store = ArtifactStore(tmp_path, writable=True)
+    write_processed(df, store, VERSION)
+    return df, store
+
+
+def test_full_read_round_trip(tmp_path):
+    df, store = _stored(tmp_path)
+    pd.testing.assert_frame_equal(read_processed(store, VERSION), df)
+
+
+def test_single_district_read(tmp_path):
+    df, store = _stored(tmp_path)
+    district = df[PARTITION_COLUMN].value_counts().index[0]
+    assert district in stored_districts(store, VERSION)
+
+    # The district's rows only, in their original order and positions
+    expected = df[df[PARTITION_COLUMN] == district]
+    pd.testing.assert_frame_equal(read_processed(store, VERSION, [district]), expected)
+    assert read_processed(store, VERSION, ["Atlântida"]) is None
@@ -0,0 +1,34 @@
+# test_polars_loader.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+pytest.importorskip("polars")
+
+from data.loader import process_data
+from data.polars_loader import process_csv
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data.csv"
+
+
+def test_process_csv_matches_process_data():
+    expected = process_data(pd.read_csv(DATA_FILE))
+    pd.testing.assert_frame_equal(process_csv(DATA_FILE), expected)
+
+
+def test_pandas_missing_value_strings_are_null(tmp_path):
+    # Answers pandas reads as missing by default must not reach the cleaning as text
+    raw = pd.read_csv(DATA_FILE, keep_default_na=False)
+    raw.loc[[0, 1, 2, 3], "educacao"] = ["NA", "N/A", "null", "NaN"]
+    raw.loc[[4, 5], "rendimento-anual"] = ["NA", ""]
+    path = tmp_path / "data.csv"
+    raw.to_csv(path, index=False)
+
+    expected = process_data(pd.read_csv(path))
+    result = process_csv(path)
+    assert result["educacao"].iloc[:4].isna().all()
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,35 @@
+# test_quantiles.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from analytics.quantiles import QuantileSketchCube
+
+BRACKETS = ["sem-rendimento", "<7001", "7001-12000", "12001-20000", ">80001"]
+
+
+def test_grouped_quantiles_keep_category_order():
+    rng = np.random.default_rng(3)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "distrito": rng.choice(["Porto", "Lisboa", "Braga"], n),
+            "income_category": pd.Categorical(rng.choice(BRACKETS, n), categories=BRACKETS, ordered=True),
+            "valor-mensal-renda": rng.uniform(200, 1200, n),
+        }
+    )
+    cube = QuantileSketchCube("valor-mensal-renda", ("distrito", "income_category")).append(df)
+
+    by_bracket = cube.quantiles([0.5], by="income_category")
+    assert list(by_bracket.index) == BRACKETS
+    assert by_bracket.index.name == "income_category"
+
+    # Non-categorical dimensions stay sorted, and filters leave only the observed groups
+    assert list(cube.quantiles([0.5], by="distrito").index) == ["Braga", "Lisboa", "Porto"]
+    porto = df[df["distrito"] == "Porto"]
+    expected = [b for b in BRACKETS if b in set(porto["income_category"])]
+    assert list(cube.quantiles([0.5], filters=(("distrito", "Porto"),), by="income_category").index) == expected